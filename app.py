@@ -1,139 +1,214 @@
+import functools
+import json
+import math
+import time
+import uuid
+
 import streamlit as st
 import streamlit.components.v1 as components
 import pandas as pd
-import numpy as np
-import plotly.graph_objects as go
+import plotly.io as pio
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.state.common import compute_widget_id
+
+from charts import (
+    GOAL_METRIC_LABELS,
+    INPUT_LABELS,
+    METRIC_LABELS,
+    backlog_figure,
+    baseline_vs_expansion_figure,
+    capacity_revenue_figure,
+    compare_figure,
+    crossover_figure,
+    cumulative_fan_figure,
+    goal_seek_figure,
+    heatmap_figure,
+    margin_fan_figure,
+    optimizer_figure,
+    required_volume_figure,
+    revenue_mix_figure,
+    tornado_figure,
+)
+from projection import INPUT_KEYS
+from projection.cache import (
+    COMPARE_CACHE,
+    EXPORT_CACHE,
+    FIGURE_CACHE,
+    MONTE_CARLO_CACHE,
+    OPTIMIZER_CACHE,
+    SWEEP_CACHE,
+)
+from projection.compare import compare_key, compare_scenarios, preset_comparison, stored_comparison
+from projection.export import FORMAT_LABELS, MIME_TYPES, available_formats, export_bytes, frame_chunks, sweep_chunks
+from projection.goalseek import GOAL_METRICS, goal_seek
+from projection.jobs import POLL_INTERVAL, JobCancelled, job_runner
+from projection.montecarlo import DISTRIBUTION_KINDS, band_distribution, iter_simulate_paths
+from projection.optimize import PLAN_KEYS, iter_optimize_growth_plan
+from projection.periods import DEFAULT_CURVES, RECOGNITION_SHAPES, RESOLUTIONS
+from projection.presets import CAPACITY_DEFAULTS, PRESETS
+from projection.profiling import profiler_from_env
+from projection.result import ScenarioResult
+from projection.sensitivity import TORNADO_METRICS, tornado
+from projection.store import open_store, param_hash
+from projection.sweep import SWEEP_KEYS, iter_sweep_progress
 
 # IMPORTANT: Must be first Streamlit call and only once
 st.set_page_config(page_title="Bensonwood Revenue Forecast", layout="wide")
 
-# --------------------------
-# Preset Scenarios
-# --------------------------
-PRESETS = {
-    "Balanced Growth": dict(
-        years=10,
-        benchmark_op_margin=15,
-        tier3_revenue=21.8,
-        tier3_gm=25,
-        tier3_projects=20,
-        tier2_price=0.95,
-        tier2_gm=20,
-        tier2_projects0=15,
-        tier2_growth=12,
-        tier1_price=0.55,
-        tier1_gm=14,
-        tier1_projects0=25,
-        tier1_growth=15,
-        fixed_overhead=7.5,
-        voh_t3=40.0,
-        voh_t2=25.0,
-        voh_t1=20.0,
-    ),
-    "Premium Tilt (Tier 2-led)": dict(
-        years=10,
-        benchmark_op_margin=15,
-        tier3_revenue=21.8,
-        tier3_gm=25,
-        tier3_projects=20,
-        tier2_price=1.15,
-        tier2_gm=23,
-        tier2_projects0=18,
-        tier2_growth=18,
-        tier1_price=0.55,
-        tier1_gm=13,
-        tier1_projects0=15,
-        tier1_growth=8,
-        fixed_overhead=7.5,
-        voh_t3=40.0,
-        voh_t2=27.0,
-        voh_t1=20.0,
-    ),
-    "Tier 1 Blitz (Volume Risk)": dict(
-        years=10,
-        benchmark_op_margin=15,
-        tier3_revenue=21.8,
-        tier3_gm=25,
-        tier3_projects=20,
-        tier2_price=0.95,
-        tier2_gm=19,
-        tier2_projects0=10,
-        tier2_growth=8,
-        tier1_price=0.50,
-        tier1_gm=11,
-        tier1_projects0=35,
-        tier1_growth=28,
-        fixed_overhead=7.5,
-        voh_t3=40.0,
-        voh_t2=25.0,
-        voh_t1=22.0,
-    ),
-    "Efficiency First (Lower OH)": dict(
-        years=10,
-        benchmark_op_margin=15,
-        tier3_revenue=21.8,
-        tier3_gm=25,
-        tier3_projects=20,
-        tier2_price=0.95,
-        tier2_gm=21,
-        tier2_projects0=16,
-        tier2_growth=14,
-        tier1_price=0.55,
-        tier1_gm=14,
-        tier1_projects0=22,
-        tier1_growth=14,
-        fixed_overhead=6.5,
-        voh_t3=35.0,
-        voh_t2=20.0,
-        voh_t1=16.0,
-    ),
-    "Margin Rescue (Reprice/GM)": dict(
-        years=10,
-        benchmark_op_margin=16,
-        tier3_revenue=21.8,
-        tier3_gm=27,
-        tier3_projects=20,
-        tier2_price=1.05,
-        tier2_gm=25,
-        tier2_projects0=15,
-        tier2_growth=14,
-        tier1_price=0.60,
-        tier1_gm=17,
-        tier1_projects0=22,
-        tier1_growth=14,
-        fixed_overhead=7.5,
-        voh_t3=40.0,
-        voh_t2=25.0,
-        voh_t1=20.0,
-    ),
-    "Capacity-Constrained": dict(
-        years=10,
-        benchmark_op_margin=15,
-        tier3_revenue=21.8,
-        tier3_gm=25,
-        tier3_projects=20,
-        tier2_price=0.95,
-        tier2_gm=21,
-        tier2_projects0=16,
-        tier2_growth=12,
-        tier1_price=0.55,
-        tier1_gm=14,
-        tier1_projects0=18,
-        tier1_growth=8,
-        fixed_overhead=7.5,
-        voh_t3=40.0,
-        voh_t2=25.0,
-        voh_t1=20.0,
-    ),
-}
+# Phase timings for this rerun; a no-op unless FORECAST_PROFILE is set.
+profiler = profiler_from_env()
+# The chart area is a fragment that also reruns on its own, so it is timed on
+# a profiler of its own, replaced at the start of each chart_area run.
+chart_profiler = profiler
+
+# Saved scenarios live in one SQLite file shared by every session (FORECAST_STORE).
+store = open_store()
+
+# Heavy analyses run on a shared worker pool (FORECAST_JOB_WORKERS, FORECAST_JOB_EXECUTOR).
+jobs = job_runner()
 
 
 def apply_preset(preset_key: str) -> None:
-    vals = PRESETS[preset_key]
+    vals = {**CAPACITY_DEFAULTS, **PRESETS[preset_key]}
     for k, v in vals.items():
         st.session_state[k] = v
 
 
+def apply_plan(plan: dict) -> None:
+    for k, v in plan.items():
+        st.session_state[k] = v
+    # Called from the chart fragment, whose own rerun would leave the
+    # sidebar and insights stale; chart_area turns this into a full rerun.
+    st.session_state["rerun_page"] = True
+
+
+def save_scenario(values: dict) -> None:
+    name = st.session_state.get("save_name", "").strip() or f"Saved {len(store.names()) + 1}"
+    store.save({name: values})
+    st.session_state["compare_saved"] = [name] + [n for n in st.session_state.get("compare_saved", []) if n != name]
+
+
+def load_scenario() -> None:
+    name = st.session_state.get("load_name")
+    loaded = store.load([name]).get(name)
+    if loaded is not None:
+        # Stored values are floats; match each widget's int/float type as the presets do.
+        widget_types = {k: type(v) for k, v in next(iter(PRESETS.values())).items()}
+        apply_plan({k: widget_types[k](v) for k, v in loaded["params"].items()})
+
+
+# st.plotly_chart's defaults, as sent with every chart.
+PLOTLY_CONFIG = json.dumps({"showLink": False, "linkText": False})
+
+
+def plotly_spec(fig) -> str:
+    """``fig`` serialized exactly as st.plotly_chart serializes it."""
+    return pio.to_json(fig, validate=False)
+
+
+def send_plotly_spec(spec: str, slot=st) -> None:
+    """``slot.plotly_chart(fig, use_container_width=True)`` for ``spec = plotly_spec(fig)``.
+
+    st.plotly_chart only takes figures, and copies and re-encodes them on
+    every call; this sends the cached JSON as is. It fills in the same
+    PlotlyChart message (and widget id) as streamlit 1.37's plotly_chart, so
+    it is tied to the version pinned in requirements.txt.
+    """
+    ctx = get_script_run_ctx()
+    proto = PlotlyChartProto(spec=spec, config=PLOTLY_CONFIG, use_container_width=True, theme="streamlit")
+    proto.id = compute_widget_id(
+        "plotly_chart",
+        user_key=None,
+        key=None,
+        plotly_spec=spec,
+        plotly_config=PLOTLY_CONFIG,
+        selection_mode=("points", "box", "lasso"),
+        is_selection_activated=False,
+        theme="streamlit",
+        form_id="",
+        use_container_width=True,
+        page=ctx.active_script_hash if ctx else None,
+    )
+    slot.plotly_chart.__self__._enqueue("plotly_chart", proto)
+
+
+def show_figure(build, *args, key=None, slot=st):
+    """Build and serialize (or reuse) a figure and send it, timing the two separately.
+
+    With a ``key`` the serialized figure is shared through FIGURE_CACHE under
+    the builder's name; the key must cover everything ``args`` are derived from.
+    """
+    with chart_profiler.phase("figure"):
+        if key is None:
+            spec = plotly_spec(build(*args))
+        else:
+            spec = FIGURE_CACHE.get_or_compute((build.__name__,) + key, lambda: plotly_spec(build(*args)))
+    with chart_profiler.phase("plotly_chart"):
+        send_plotly_spec(spec, slot)
+
+
+def show_profile(prof, title: str, computed: list, **context) -> None:
+    """Log ``prof`` (with FORECAST_PROFILE_LOG) and show its phases in a collapsed table."""
+    prof.write_log(computed=computed, **context)
+    total_ms = prof.total_seconds() * 1000
+    profile = pd.DataFrame(prof.records())
+    profile["ms"] = profile.pop("seconds") * 1000
+    other_ms = total_ms - profile["ms"].sum()
+    profile = pd.concat([profile, pd.DataFrame([{"phase": "(untracked)", "ms": other_ms, "calls": 1}])])
+    profile["share_%"] = 100 * profile["ms"] / total_ms
+    with st.expander(f"{title} — {total_ms:.0f} ms", expanded=False):
+        st.dataframe(profile.set_index("phase").round(2), use_container_width=True)
+        st.caption(f"Computed this run: {', '.join(computed) or 'nothing new'}")
+        if prof.log_path:
+            st.caption(f"Appending each run to {prof.log_path}")
+
+
+def session_id() -> str:
+    """This browser session's id, for its entries in shared caches and job slots."""
+    return st.session_state.setdefault("session_id", uuid.uuid4().hex)
+
+
+def job_owner(slot: str) -> tuple:
+    """Owner id for this session's job in ``slot``; a new job there replaces the old one."""
+    return (session_id(), slot)
+
+
+def await_job(submit, label: str, show_partial=None):
+    """Run ``submit()``'s background job with a progress bar, showing partial results as they come.
+
+    The wait is only sleeps, so a widget change interrupts it at once; the
+    next run's submit then cancels the job if nothing else wants it.
+
+    Returns the result, or None once the page has said why there is none. A
+    job cancelled under this run (every owner moved on before it finished) is
+    submitted again once; an analysis that raises is reported with st.error.
+    """
+    for _ in range(2):
+        job = submit()
+        if not job.done:
+            bar = st.empty()
+            shown = None
+            while not job.done:
+                bar.progress(job.progress, text=f"{label}… {job.progress:.0%}")
+                partial = job.partial
+                if show_partial is not None and partial is not None and partial is not shown:
+                    show_partial(partial)
+                    shown = partial
+                with chart_profiler.phase("analysis"):
+                    time.sleep(POLL_INTERVAL)
+            bar.empty()
+        try:
+            return job.wait()
+        except JobCancelled:
+            continue
+        except Exception as exc:
+            st.error(f"{label} stopped with an error: {exc}")
+            return None
+    st.info(f"{label} was cancelled. Change a setting or switch tabs to run it again.")
+    return None
+
+
 # --- Theme + Branding ---
 st.markdown(
     """
@@ -286,198 +361,191 @@ st.markdown("Model the revenue, profit, and overhead implications of holding Cus
 # --------------------------
 # Sidebar: Inputs (Tier model)
 # --------------------------
+profiler.start("sidebar")
 st.sidebar.header("Scenario Inputs")
 
-years = st.sidebar.slider(
+# Resolution sits outside the form: the timing inputs below are disabled at
+# annual resolution, and widgets in a form only see its last submitted values.
+resolution = st.sidebar.selectbox(
+    "Resolution (Revenue Mix chart)",
+    list(RESOLUTIONS),
+    format_func=str.capitalize,
+    key="resolution",
+    help="Annual shows each project's revenue in its start year. Quarterly / monthly spread revenue and per-project overhead over the build. Applies immediately."
+)
+
+# Inputs are batched in a form: edits (typing, dragging) only rerun the page
+# once Apply is pressed, instead of once per keystroke or slider step.
+inputs_form = st.sidebar.form("scenario_inputs", border=False)
+inputs_form.form_submit_button("Apply changes", type="primary", use_container_width=True)
+inputs_form.caption("Edits take effect when you press Apply.")
+
+years = inputs_form.slider(
     "Planning Horizon (Years)",
     5, 15, 10, 1,
     key="years",
     help="Number of years to model."
 )
 
-benchmark_op_margin = st.sidebar.slider(
+benchmark_op_margin = inputs_form.slider(
     "Benchmark Operating Margin %",
     5, 25, 15, 1,
     key="benchmark_op_margin",
     help="Target operating margin (after overhead). Used for the benchmark line and alerts."
 )
 
-st.sidebar.markdown("---")
-st.sidebar.subheader("Tier 3 (Custom) — Held Constant")
+inputs_form.markdown("---")
+inputs_form.subheader("Tier 3 (Custom) — Held Constant")
 
-tier3_revenue = st.sidebar.number_input(
+tier3_revenue = inputs_form.number_input(
     "Tier 3 Annual Revenue ($M)",
     1.0, 200.0, 21.8, 0.1,
     key="tier3_revenue",
     help="Annual revenue from Custom / Tier 3 work. Held constant across the horizon."
 )
-tier3_gm = st.sidebar.slider(
+tier3_gm = inputs_form.slider(
     "Tier 3 Gross Margin %",
     10, 40, 25, 1,
     key="tier3_gm",
     help="Gross margin on Tier 3 revenue (before overhead)."
 )
-tier3_projects = st.sidebar.number_input(
+tier3_projects = inputs_form.number_input(
     "Tier 3 Projects (fixed)",
     1, 200, 20, 1,
     key="tier3_projects",
     help="Tier 3 project count. Held constant (used for operational load + variable overhead)."
 )
 
-st.sidebar.markdown("---")
-st.sidebar.subheader("Tier 2 (Product — higher-touch)")
+inputs_form.markdown("---")
+inputs_form.subheader("Tier 2 (Product — higher-touch)")
 
-tier2_price = st.sidebar.number_input(
+tier2_price = inputs_form.number_input(
     "Tier 2 Avg Revenue per Project ($M)",
     0.10, 10.00, 0.95, 0.05,
     key="tier2_price",
     help="Average recognized revenue per Tier 2 project."
 )
-tier2_gm = st.sidebar.slider(
+tier2_gm = inputs_form.slider(
     "Tier 2 Gross Margin %",
     5, 35, 20, 1,
     key="tier2_gm",
     help="Gross margin on Tier 2 revenue (before overhead)."
 )
-tier2_projects0 = st.sidebar.number_input(
+tier2_projects0 = inputs_form.number_input(
     "Tier 2 Starting Projects (Year 1)",
     0, 500, 15, 1,
     key="tier2_projects0",
     help="Tier 2 project volume in Year 1."
 )
-tier2_growth = st.sidebar.slider(
+tier2_growth = inputs_form.slider(
     "Tier 2 Project Growth % / Year",
     0, 40, 10, 1,
     key="tier2_growth",
     help="Annual growth rate in Tier 2 projects."
 )
 
-st.sidebar.markdown("---")
-st.sidebar.subheader("Tier 1 (Product — most standardized)")
+inputs_form.markdown("---")
+inputs_form.subheader("Tier 1 (Product — most standardized)")
 
-tier1_price = st.sidebar.number_input(
+tier1_price = inputs_form.number_input(
     "Tier 1 Avg Revenue per Project ($M)",
     0.05, 10.00, 0.55, 0.05,
     key="tier1_price",
     help="Average recognized revenue per Tier 1 project."
 )
-tier1_gm = st.sidebar.slider(
+tier1_gm = inputs_form.slider(
     "Tier 1 Gross Margin %",
     1, 30, 14, 1,
     key="tier1_gm",
     help="Gross margin on Tier 1 revenue (before overhead)."
 )
-tier1_projects0 = st.sidebar.number_input(
+tier1_projects0 = inputs_form.number_input(
     "Tier 1 Starting Projects (Year 1)",
     0, 500, 25, 1,
     key="tier1_projects0",
     help="Tier 1 project volume in Year 1."
 )
-tier1_growth = st.sidebar.slider(
+tier1_growth = inputs_form.slider(
     "Tier 1 Project Growth % / Year",
     0, 60, 18, 1,
     key="tier1_growth",
     help="Annual growth rate in Tier 1 projects."
 )
 
-st.sidebar.markdown("---")
-st.sidebar.subheader("Overhead Model")
+inputs_form.markdown("---")
+inputs_form.subheader("Overhead Model")
 
-fixed_overhead = st.sidebar.number_input(
+fixed_overhead = inputs_form.number_input(
     "Fixed Overhead ($M / year)",
     0.0, 50.0, 7.5, 0.1,
     key="fixed_overhead",
     help="Annual fixed overhead (G&A / leadership / facilities / support). Subtracted from gross profit."
 )
 
-st.sidebar.markdown("**Variable Overhead (per project)**")
-voh_t3 = st.sidebar.number_input(
+inputs_form.markdown("**Variable Overhead (per project)**")
+voh_t3 = inputs_form.number_input(
     "Tier 3 Variable OH ($k / project)",
     0.0, 500.0, 40.0, 5.0,
     key="voh_t3",
     help="Overhead/cost burden per Tier 3 project."
 )
-voh_t2 = st.sidebar.number_input(
+voh_t2 = inputs_form.number_input(
     "Tier 2 Variable OH ($k / project)",
     0.0, 500.0, 25.0, 5.0,
     key="voh_t2",
     help="Overhead/cost burden per Tier 2 project."
 )
-voh_t1 = st.sidebar.number_input(
+voh_t1 = inputs_form.number_input(
     "Tier 1 Variable OH ($k / project)",
     0.0, 500.0, 20.0, 5.0,
     key="voh_t1",
     help="Overhead/cost burden per Tier 1 project."
 )
 
-# --------------------------
-# Model
-# --------------------------
-def project_portfolio(
-    years_: int,
-    t3_rev_m: float,
-    t3_gm_pct: float,
-    t3_projects_fixed: int,
-    t2_price_m: float,
-    t2_gm_pct: float,
-    t2_projects_start: int,
-    t2_growth_pct: float,
-    t1_price_m: float,
-    t1_gm_pct: float,
-    t1_projects_start: int,
-    t1_growth_pct: float,
-    fixed_oh_m: float,
-    voh_t3_k: float,
-    voh_t2_k: float,
-    voh_t1_k: float,
-):
-    df = pd.DataFrame(index=range(1, years_ + 1))
-
-    # Projects
-    df["T3_Projects"] = int(t3_projects_fixed)
-    df["T2_Projects"] = np.round(t2_projects_start * ((1 + t2_growth_pct / 100) ** (df.index - 1))).astype(int)
-    df["T1_Projects"] = np.round(t1_projects_start * ((1 + t1_growth_pct / 100) ** (df.index - 1))).astype(int)
-    df["TotalProjects"] = df["T1_Projects"] + df["T2_Projects"] + df["T3_Projects"]
-
-    # Revenue
-    df["T3_Revenue"] = float(t3_rev_m)
-    df["T2_Revenue"] = df["T2_Projects"] * float(t2_price_m)
-    df["T1_Revenue"] = df["T1_Projects"] * float(t1_price_m)
-    df["TotalRevenue"] = df["T1_Revenue"] + df["T2_Revenue"] + df["T3_Revenue"]
-
-    # Mix (revenue share)
-    df["T3_Share"] = (df["T3_Revenue"] / df["TotalRevenue"]) * 100
-    df["T2_Share"] = (df["T2_Revenue"] / df["TotalRevenue"]) * 100
-    df["T1_Share"] = (df["T1_Revenue"] / df["TotalRevenue"]) * 100
-
-    # Gross profit
-    df["T3_GrossProfit"] = df["T3_Revenue"] * (t3_gm_pct / 100)
-    df["T2_GrossProfit"] = df["T2_Revenue"] * (t2_gm_pct / 100)
-    df["T1_GrossProfit"] = df["T1_Revenue"] * (t1_gm_pct / 100)
-    df["GrossProfit"] = df["T1_GrossProfit"] + df["T2_GrossProfit"] + df["T3_GrossProfit"]
-
-    # Overhead
-    df["FixedOverhead"] = float(fixed_oh_m)
-    df["VarOverhead"] = (
-        df["T3_Projects"] * (voh_t3_k / 1000.0)
-        + df["T2_Projects"] * (voh_t2_k / 1000.0)
-        + df["T1_Projects"] * (voh_t1_k / 1000.0)
-    )
-    df["TotalOverhead"] = df["FixedOverhead"] + df["VarOverhead"]
-
-    # Operating profit & margin
-    df["OperatingProfit"] = df["GrossProfit"] - df["TotalOverhead"]
-    df["OperatingMargin"] = np.where(df["TotalRevenue"] > 0, (df["OperatingProfit"] / df["TotalRevenue"]) * 100, np.nan)
+inputs_form.markdown("---")
+inputs_form.subheader("Timing (Revenue Mix chart)")
 
-    # Efficiency metrics
-    df["ProfitPerProject_k"] = np.where(df["TotalProjects"] > 0, (df["OperatingProfit"] / df["TotalProjects"]) * 1000, np.nan)
-    df["OverheadPerProject_k"] = np.where(df["TotalProjects"] > 0, (df["TotalOverhead"] / df["TotalProjects"]) * 1000, np.nan)
+recognition_shape = inputs_form.selectbox(
+    "Recognition Curve",
+    RECOGNITION_SHAPES,
+    format_func={"uniform": "Straight-line", "s_curve": "S-curve"}.get,
+    key="recognition_shape",
+    disabled=resolution == "annual",
+    help="How revenue is recognized over a project's build: evenly, or slow-fast-slow."
+)
+build_months = {}
+for tier, label in (("tier3", "Tier 3"), ("tier2", "Tier 2"), ("tier1", "Tier 1")):
+    build_months[tier] = inputs_form.number_input(
+        f"{label} Build Duration (months)",
+        0, 36, DEFAULT_CURVES[tier][1], 1,
+        key=f"{tier}_build_months",
+        disabled=resolution == "annual",
+        help="Months from project start to completion; 0 recognizes it all in the start period."
+    )
 
-    return df
+inputs_form.markdown("---")
+inputs_form.subheader("Capacity (Capacity & Backlog chart)")
 
+capacity = {}
+for tier, label in (("tier3", "Tier 3"), ("tier2", "Tier 2"), ("tier1", "Tier 1")):
+    capacity[tier] = inputs_form.number_input(
+        f"{label} Capacity (projects / year)",
+        0, 500, CAPACITY_DEFAULTS[f"cap_{tier}"], 1,
+        key=f"cap_{tier}",
+        help="Projects the shop and crews can start per year; demand beyond it waits in a backlog. 0 means no limit."
+    )
+backlog_decay = inputs_form.slider(
+    "Backlog Cancellation % / Year",
+    0, 100, CAPACITY_DEFAULTS["backlog_decay"], 1,
+    key="backlog_decay",
+    help="Share of waiting projects that cancel or go elsewhere each year."
+)
+profiler.stop()
 
-scenario = project_portfolio(
-    years,
+# --------------------------
+# Model
+# --------------------------
+scenario_inputs = (
     tier3_revenue,
     tier3_gm,
     tier3_projects,
@@ -494,102 +562,64 @@ scenario = project_portfolio(
     voh_t2,
     voh_t1,
 )
-
-# Baseline: Tier 3 constant, Tier 1 and Tier 2 stay flat (no growth)
-baseline = project_portfolio(
+# Derived frames and metrics are computed on first access, so each rerun
+# only pays for what the selected chart and the insights panel read. The
+# frames come from caches shared across sessions: never mutate them in place.
+# The session's last scenario and baseline stay as model graphs in the shared
+# GRAPH_CACHE, so a changed input recomputes only the series that depend on it.
+result = ScenarioResult(
     years,
-    tier3_revenue,
-    tier3_gm,
-    tier3_projects,
-    tier2_price,
-    tier2_gm,
-    tier2_projects0,
-    0,
-    tier1_price,
-    tier1_gm,
-    tier1_projects0,
-    0,
-    fixed_overhead,
-    voh_t3,
-    voh_t2,
-    voh_t1,
-)
-
-scenario["CumulativeOperatingProfit"] = scenario["OperatingProfit"].cumsum()
-baseline["CumulativeOperatingProfit"] = baseline["OperatingProfit"].cumsum()
-
-below_benchmark = scenario[scenario["OperatingMargin"] < benchmark_op_margin]
-crossover_candidates = scenario[scenario["CumulativeOperatingProfit"] >= baseline["CumulativeOperatingProfit"]]
-crossover_year = int(crossover_candidates.index[0]) if not crossover_candidates.empty else None
-
-scenario["ProductRevenue"] = scenario["T1_Revenue"] + scenario["T2_Revenue"]
-
-# Required product revenue to hit benchmark (scale Tier 1+2 together in-place)
-def required_scale_to_hit_benchmark(row, bm_pct):
-    bm = bm_pct / 100.0
-    A = float(row["T3_Revenue"])
-    B = float(row["T3_GrossProfit"] - row["FixedOverhead"] - (row["T3_Projects"] * (voh_t3 / 1000.0)))
-
-    R = float(row["T1_Revenue"] + row["T2_Revenue"])
-    GP = float(row["T1_GrossProfit"] + row["T2_GrossProfit"])
-    VOH = float((row["T1_Projects"] * (voh_t1 / 1000.0)) + (row["T2_Projects"] * (voh_t2 / 1000.0)))
-
-    denom = (GP - VOH) - bm * R
-    numer = bm * A - B
-
-    if abs(denom) < 1e-9:
-        return np.nan
-
-    k = numer / denom
-    return max(0.0, k)
-
-
-scenario["RequiredScaleK"] = scenario.apply(lambda r: required_scale_to_hit_benchmark(r, benchmark_op_margin), axis=1)
-scenario["RequiredProductRevenueAtBenchmark"] = np.where(
-    scenario["RequiredScaleK"].isna(),
-    np.nan,
-    scenario["ProductRevenue"] * scenario["RequiredScaleK"]
+    scenario_inputs,
+    benchmark_op_margin,
+    profiler=profiler,
+    session=session_id(),
 )
-scenario["AdditionalProductRevenueNeeded"] = (scenario["RequiredProductRevenueAtBenchmark"] - scenario["ProductRevenue"]).clip(lower=0)
-
-# --------------------------
-# Plot styling helper
-# --------------------------
-def apply_bensonwood_figure_style(fig):
-    fig.update_layout(
-        template="plotly_white",
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="#162321",
-        font=dict(family="Montserrat, sans-serif", color="#e7efec"),
-        colorway=["#2f5a51", "#b88152", "#7f9b90", "#1f3a36"],
-        legend=dict(
-            bgcolor="rgba(22,35,33,0.85)",
-            bordercolor="#2d4540",
-            borderwidth=1,
-            orientation="h",
-            yanchor="top",
-            y=-0.18,
-            xanchor="center",
-            x=0.5,
-        ),
-        margin=dict(b=120),
-    )
-    fig.update_xaxes(gridcolor="#2d4540", zerolinecolor="#2d4540")
-    fig.update_yaxes(gridcolor="#2d4540", zerolinecolor="#2d4540")
 
+# Presets never change, so the first rerun in the server process evaluates
+# them all in one batch and every session reuses that (see compare mode).
+preset_comparison()
 
 # --------------------------
 # Layout
 # --------------------------
-col1, col2, col3 = st.columns([1, 2, 1])
+chart_col, col3 = st.columns([3, 1])
 
+# The Monte Carlo fans get their own tab, placed right after Revenue Mix,
+# rather than sitting on it: a simulation (~0.25 s at 100k paths, seconds at
+# 1M) would then run on every Revenue Mix rerun, the page's default view, and
+# its settings would crowd that chart.
 chart_options = [
     "Revenue Mix & Operating Margin",
+    "Margin Uncertainty",
     "Required Product Volume",
     "Baseline vs Expansion",
     "Cumulative Profit Crossover",
+    "Capacity & Backlog",
+    "Sensitivity",
+    "Parameter Heatmap",
+    "Growth Plan Optimizer",
+    "Goal Seek",
 ]
-selected_chart = col2.radio("Chart Tabs", chart_options, horizontal=True, label_visibility="collapsed")
+
+# Tabs that overlay scenarios in compare mode: (series, title, y-axis label).
+compare_views = {
+    "Revenue Mix & Operating Margin": ("OperatingMargin", "Operating Margin by Scenario", "Operating Margin (%)"),
+    "Required Product Volume": (
+        "RequiredProductRevenueAtBenchmark",
+        "Required Tier 1 + Tier 2 Revenue at Benchmark by Scenario",
+        "Required Product Revenue ($M)",
+    ),
+    "Baseline vs Expansion": (
+        "CumulativeOperatingProfit",
+        "Cumulative Operating Profit by Scenario",
+        "Cumulative Operating Profit ($M)",
+    ),
+    "Cumulative Profit Crossover": (
+        "CumulativeAdvantage",
+        "Cumulative Advantage over Each Scenario's Baseline",
+        "Cumulative Profit Difference ($M)",
+    ),
+}
 
 chart_guides = {
     "Revenue Mix & Operating Margin": """
@@ -602,7 +632,21 @@ This answers: **“If Custom stays flat and Product grows, what happens to our r
 - **Blue dashed line**: benchmark operating margin.
 - **Red dots**: years where operating margin falls below benchmark (“pressure years”).
 
+Switch **Timing → Resolution** to quarterly or monthly to see revenue land over each project's build instead of all in its start year; the other charts stay annual.
+
 Tier 1-heavy growth often raises total projects quickly and can tighten operating margin if Tier 1 has lower GM and/or meaningful per-project overhead.
+""",
+    "Margin Uncertainty": """
+### How to read this chart (plain English)
+
+This answers: **“If growth, margins, prices and overhead don't land exactly where we assumed, how wide is the range of outcomes?”**
+
+- Each input in **Uncertainty settings** gets a ± range around its sidebar value; thousands of paths are simulated.
+- **Shaded band**: the middle 90% of outcomes (P5 to P95). **White line**: the median (P50).
+- **Red bars**: the chance of finishing the year below the benchmark operating margin.
+- The lower chart shows the same band for cumulative operating profit.
+
+A wide band means the plan is sensitive to execution; a high red bar means the benchmark is at risk even if the point forecast looks fine.
 """,
     "Required Product Volume": """
 ### How to read this chart (plain English)
@@ -611,6 +655,7 @@ This answers: **“How much Tier 1 + Tier 2 revenue do we need to hit the benchm
 
 - **Bars**: projected combined Tier 1 + Tier 2 product revenue.
 - **Line**: required product revenue to reach benchmark, given Tier 3 held constant and your overhead assumptions.
+- **Hover the line** for the Tier 1 and Tier 2 project volumes that revenue implies (both tiers scaled together).
 
 If the required line sits above the bars, the levers are:
 higher product gross margin, lower overhead, higher Tier 2 share, or slower Tier 1 ramp.
@@ -636,262 +681,492 @@ The plotted line is:
 
 Above zero means the growth strategy is ahead overall. The marker shows the first year it turns positive (if it does).
 """,
-}
+    "Capacity & Backlog": """
+### How to read this chart (plain English)
+
+This answers: **“What if the shop and crews can't start every project the plan calls for?”**
+
+Set **Capacity** in the sidebar (projects started per year, per tier; 0 means no limit). Demand above capacity waits in a backlog and starts when there is room; **Backlog Cancellation** is the share of waiting work lost each year.
+
+- **Bars**: revenue from the projects actually started. **Blue dashed line**: revenue if capacity were unlimited.
+- **White line**: operating margin with the constraint.
+- The lower chart shows each tier's backlog and how full its capacity is.
+
+A backlog that keeps growing means the plan outruns the shop; the gap between the bars and the dashed line is revenue pushed out or lost.
+""",
+    "Sensitivity": """
+### How to read this chart (plain English)
+
+This answers: **“Which assumptions matter most?”**
+
+Every sidebar input is moved down and up by the same percentage, one at a time, with everything else held at your current values.
 
-with col1:
-    st.markdown("### Chart Guide")
-    st.markdown(chart_guides[selected_chart])
+- **Bars** show how far the chosen metric moves from the current scenario (the center line).
+- **Wood bars**: input lowered. **Green bars**: input raised.
+- Inputs are sorted by total swing, so the top rows are the levers worth debating first.
+
+For crossover year, “no crossover” is plotted as one year past the horizon.
+""",
+    "Parameter Heatmap": """
+### How to read this chart (plain English)
+
+This answers: **“Across a whole range of two assumptions, where does the plan work?”**
+
+Pick any two inputs for the axes; every other input stays at your sidebar value. Each cell is a full model run.
+
+- **Color**: the chosen outcome metric for that pair of values.
+- **White marker**: where your current scenario sits.
+- The grid starts coarse and sharpens over a few passes.
+
+Look for the boundary where the color changes—that is the trade-off line between the two levers.
+""",
+    "Growth Plan Optimizer": """
+### How to read this chart (plain English)
+
+This answers: **“What Tier 1 / Tier 2 growth plan does best without ever dropping below the benchmark margin?”**
+
+The optimizer searches starting project counts and growth rates for Tier 1 and Tier 2 (within the sidebar limits), holding every other input at your current values. It checks well over a hundred thousand plans.
+
+- **White line**: operating margin of the best plan found. **Green line**: your current plan.
+- **Blue dashed line**: benchmark operating margin; the best plan must stay at or above it every year.
+- **Orange markers**: binding years—where the benchmark is what stops the plan from growing further.
+
+If no plan clears the benchmark, the closest one is shown and flagged; the levers then lie outside Tier 1/2 volume (margins, pricing, overhead).
+""",
+    "Goal Seek": """
+### How to read this chart (plain English)
+
+This answers: **“What would one input have to be for a metric to hit a target?”** For example, what Tier 1 gross margin keeps operating margin at 15% every year, or how high fixed overhead can go before margin drops below benchmark.
+
+Pick the input to solve for, the metric, and whether it must stay at least or at most the target; every other input stays at your sidebar value.
+
+- **Shaded band**: the values of that input (within the sidebar limits) that meet the goal in each year. A gap means no value works that year.
+- **White line**: your current value. Inside the band, that year already meets the goal.
+- **Orange dashed lines**: the range that meets the goal in every year at once.
+
+The answer updates with every sidebar change.
+""",
+}
 
 # --------------------------
-# Center Chart
+# Chart area: guide + chart (reruns on its own)
 # --------------------------
-with col2:
-    if selected_chart == "Revenue Mix & Operating Margin":
-        fig = go.Figure()
-
-        fig.add_trace(go.Bar(
-            x=scenario.index,
-            y=scenario["T3_Revenue"],
-            name="Tier 3 (Custom) Revenue",
-            marker_color="#2f5a51",
-            customdata=np.stack([scenario["T3_Share"], scenario["TotalRevenue"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Tier 3 Revenue: $%{y:.2f}M<br>"
-                "Tier 3 Share: %{customdata[0]:.1f}%<br>"
-                "Total Revenue: $%{customdata[1]:.2f}M"
-                "<extra></extra>"
-            )
-        ))
-        fig.add_trace(go.Bar(
-            x=scenario.index,
-            y=scenario["T2_Revenue"],
-            name="Tier 2 Revenue",
-            marker_color="#7f9b90",
-            customdata=np.stack([scenario["T2_Share"], scenario["T2_Projects"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Tier 2 Revenue: $%{y:.2f}M<br>"
-                "Tier 2 Share: %{customdata[0]:.1f}%<br>"
-                "Tier 2 Projects: %{customdata[1]:.0f}"
-                "<extra></extra>"
-            )
-        ))
-        fig.add_trace(go.Bar(
-            x=scenario.index,
-            y=scenario["T1_Revenue"],
-            name="Tier 1 Revenue",
-            marker_color="#b88152",
-            customdata=np.stack([scenario["T1_Share"], scenario["T1_Projects"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Tier 1 Revenue: $%{y:.2f}M<br>"
-                "Tier 1 Share: %{customdata[0]:.1f}%<br>"
-                "Tier 1 Projects: %{customdata[1]:.0f}"
-                "<extra></extra>"
+@st.fragment
+def chart_area() -> None:
+    """Chart tabs with their controls, the chart itself and its guide.
+
+    This is a fragment: switching tabs or touching a chart's own controls
+    reruns only this function, so the model, the sidebar and the insights
+    panel are not rebuilt or resent. Buttons here that change sidebar inputs
+    call apply_plan, which asks for a full rerun on the way back in.
+    """
+    if st.session_state.pop("rerun_page", False):
+        st.rerun()
+
+    # A fragment rerun skips the module-level code, so the page's profiler and
+    # result belong to a run that has already been reported. Each chart area
+    # run times itself instead, on a fresh profiler and a view of the same
+    # scenario (its frames are cache hits), and reports that at the end.
+    global chart_profiler
+    chart_profiler = profiler_from_env()
+    result = ScenarioResult(
+        years,
+        scenario_inputs,
+        benchmark_op_margin,
+        profiler=chart_profiler,
+        session=session_id(),
+    )
+
+    selected_chart = st.radio("Chart Tabs", chart_options, horizontal=True, label_visibility="collapsed", key="chart_tab")
+    compare_mode = st.checkbox(
+        "Compare presets",
+        key="compare_presets",
+        help="Overlay every preset, plus scenarios saved this session, on the annual charts."
+    )
+
+    # The guide sits in an expander rather than a column beside the chart:
+    # the chart's own control rows are columns already, and Streamlit allows
+    # only one level of column nesting inside chart_col.
+    with st.expander("Chart Guide", expanded=False):
+        st.markdown(chart_guides[selected_chart])
+
+    # Heatmap grid offered for download once its last pass is in.
+    export_sweep = None
+
+    if compare_mode:
+        # Presets are evaluated once per server process and saved scenarios
+        # are read back from the store with their results; only the sidebar
+        # scenario is run here.
+        saved_names = store.names()
+        st.session_state["compare_saved"] = [
+            n for n in st.session_state.get("compare_saved", saved_names[:3]) if n in saved_names
+        ]
+        compare_saved = st.multiselect("Saved scenarios to overlay", saved_names, key="compare_saved")
+        current_name = "Current (sidebar)"
+        current_params = {current_name: dict(zip(INPUT_KEYS, scenario_inputs), years=years, benchmark_op_margin=benchmark_op_margin)}
+        loaded = store.load(compare_saved)
+        # A name can be saved again with new values, so saved scenarios are
+        # keyed by their parameter hash as well as the name they are shown under.
+        extras_key = compare_key(current_params) + tuple((name, param_hash(entry["params"])) for name, entry in loaded.items())
+        with chart_profiler.phase("analysis"):
+            comparison = {
+                **preset_comparison(),
+                **stored_comparison(loaded),
+                **COMPARE_CACHE.get_or_compute(compare_key(current_params), lambda: compare_scenarios(current_params)),
+            }
+
+    if compare_mode and selected_chart in compare_views:
+        column, title, y_label = compare_views[selected_chart]
+        show_figure(
+            compare_figure,
+            comparison,
+            column,
+            title,
+            y_label,
+            current_name,
+            benchmark_op_margin if column == "OperatingMargin" else None,
+            key=extras_key + (column, benchmark_op_margin),
+        )
+
+    elif selected_chart == "Revenue Mix & Operating Margin":
+        if resolution == "annual":
+            show_figure(revenue_mix_figure, result.scenario, result.below_benchmark, benchmark_op_margin, key=result.key)
+        else:
+            curves = {tier: (recognition_shape, months) for tier, months in build_months.items()}
+            periods = result.periods(resolution, curves)
+            show_figure(
+                revenue_mix_figure,
+                periods,
+                periods[periods["OperatingMargin"] < benchmark_op_margin],
+                benchmark_op_margin,
+                "Period",
+                key=result.key + (resolution, tuple(sorted(curves.items()))),
             )
-        ))
-
-        fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=scenario["OperatingMargin"],
-            name="Operating Margin %",
-            mode="lines+markers",
-            yaxis="y2",
-            line=dict(width=3, color="#ffffff"),
-            customdata=np.stack([scenario["OperatingProfit"], scenario["TotalOverhead"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Operating Margin: %{y:.2f}%<br>"
-                "Operating Profit: $%{customdata[0]:.2f}M<br>"
-                "Total Overhead: $%{customdata[1]:.2f}M"
-                "<extra></extra>"
+
+    elif selected_chart == "Capacity & Backlog":
+        # Annual resolution recognizes each project in its start year, as the annual model does.
+        months = build_months if resolution != "annual" else dict.fromkeys(build_months, 0)
+        curves = {tier: (recognition_shape, m) for tier, m in months.items()}
+        limits = {tier: (cap or None) for tier, cap in capacity.items()}
+        constrained = result.capacity(resolution, curves, limits, backlog_decay / 100)
+        unconstrained = result.periods(resolution, curves)
+        x_label = "Year" if resolution == "annual" else "Period"
+        cap_key = result.key + (resolution, tuple(sorted(curves.items())), tuple(sorted(limits.items())), backlog_decay)
+        show_figure(capacity_revenue_figure, constrained, unconstrained, x_label, key=cap_key)
+        show_figure(backlog_figure, constrained, x_label, key=cap_key)
+
+        deferred = float(unconstrained["TotalRevenue"].sum() - constrained["TotalRevenue"].sum())
+        ending = constrained.iloc[-1]
+        st.markdown(
+            f"**Revenue deferred or lost over the horizon:** ${deferred:.2f}M. "
+            f"**Ending backlog:** Tier 3 {ending['T3_Backlog']:.1f}, Tier 2 {ending['T2_Backlog']:.1f}, "
+            f"Tier 1 {ending['T1_Backlog']:.1f} projects."
+        )
+
+    elif selected_chart == "Margin Uncertainty":
+        with st.expander("Uncertainty settings", expanded=False):
+            u1, u2 = st.columns(2)
+            mc_kind = u1.selectbox("Distribution shape", DISTRIBUTION_KINDS, key="mc_kind")
+            mc_paths = u2.select_slider(
+                "Simulated paths",
+                [10_000, 50_000, 100_000, 250_000, 1_000_000],
+                100_000,
+                key="mc_paths",
             )
-        ))
-
-        if not below_benchmark.empty:
-            fig.add_trace(go.Scatter(
-                x=below_benchmark.index,
-                y=below_benchmark["OperatingMargin"],
-                name="Below Benchmark",
-                mode="markers",
-                marker=dict(size=10, color="#a33a2a"),
-                yaxis="y2",
-                customdata=np.stack([below_benchmark["OperatingProfit"], below_benchmark["TotalProjects"]], axis=-1),
-                hovertemplate=(
-                    "Year %{x}<br>"
-                    "Operating Margin: %{y:.2f}% (below benchmark)<br>"
-                    "Operating Profit: $%{customdata[0]:.2f}M<br>"
-                    "Total Projects: %{customdata[1]:.0f}"
-                    "<extra></extra>"
-                )
-            ))
-
-        fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=[benchmark_op_margin] * len(scenario.index),
-            name="Benchmark Operating Margin",
-            mode="lines",
-            yaxis="y2",
-            line=dict(dash="dash", color="#87ceeb"),
-            hovertemplate="Benchmark Target: %{y:.2f}%<extra></extra>"
-        ))
-
-        fig.update_layout(
-            title="Tier-Based Revenue Mix & Operating Margin",
-            xaxis_title="Year",
-            yaxis=dict(title="Revenue ($M)"),
-            yaxis2=dict(
-                title="Operating Margin (%)",
-                overlaying="y",
-                side="right",
-                range=[0, 25],
-                showgrid=False
-            ),
-            barmode="stack",
-            height=600
+            mc_growth = u1.number_input("Growth ± (pts)", 0.0, 30.0, 4.0, 0.5, key="mc_growth")
+            mc_gm = u2.number_input("Gross margin ± (pts)", 0.0, 20.0, 2.0, 0.5, key="mc_gm")
+            mc_price = u1.number_input("Price per project ± (%)", 0.0, 50.0, 10.0, 1.0, key="mc_price")
+            mc_voh = u2.number_input("Variable OH ± (%)", 0.0, 100.0, 15.0, 1.0, key="mc_voh")
+
+        inputs_by_key = dict(zip(INPUT_KEYS, scenario_inputs))
+        distributions = {}
+        for k in ("tier2_growth", "tier1_growth"):
+            distributions[k] = band_distribution(mc_kind, inputs_by_key[k], mc_growth, low=0.0)
+        for k in ("tier3_gm", "tier2_gm", "tier1_gm"):
+            distributions[k] = band_distribution(mc_kind, inputs_by_key[k], mc_gm, low=0.0, high=100.0)
+        for k in ("tier2_price", "tier1_price"):
+            distributions[k] = band_distribution(mc_kind, inputs_by_key[k], inputs_by_key[k] * mc_price / 100, low=0.0)
+        for k in ("voh_t3", "voh_t2", "voh_t1"):
+            distributions[k] = band_distribution(mc_kind, inputs_by_key[k], inputs_by_key[k] * mc_voh / 100, low=0.0)
+
+        mc_key = result.key + (mc_paths, tuple(sorted(distributions.items())))
+        submit = functools.partial(
+            jobs.submit,
+            mc_key,
+            iter_simulate_paths,
+            years,
+            inputs_by_key,
+            distributions,
+            benchmark_op_margin,
+            n_paths=mc_paths,
+            seed=42,
+            owner=job_owner("monte_carlo"),
+            cache=MONTE_CARLO_CACHE,
         )
-        apply_bensonwood_figure_style(fig)
-        st.plotly_chart(fig, use_container_width=True)
+        margin_slot, cumulative_slot = st.empty(), st.empty()
+
+        def render_fans(mc, key=None):
+            show_figure(margin_fan_figure, result.scenario.index, mc, benchmark_op_margin, key=key, slot=margin_slot)
+            show_figure(cumulative_fan_figure, result.scenario.index, mc, key=key, slot=cumulative_slot)
+
+        # Interim fans cover the paths run so far.
+        mc = await_job(submit, "Simulating paths", render_fans)
+        if mc is not None:
+            render_fans(mc, key=mc_key)
 
     elif selected_chart == "Required Product Volume":
-        required_fig = go.Figure()
-
-        required_fig.add_trace(go.Bar(
-            x=scenario.index,
-            y=scenario["ProductRevenue"],
-            name="Projected Tier 1 + Tier 2 Revenue",
-            marker_color="#2f5a51",
-            customdata=np.stack(
-                [scenario["RequiredProductRevenueAtBenchmark"], scenario["AdditionalProductRevenueNeeded"]],
-                axis=-1
-            ),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Projected Product Revenue: $%{y:.2f}M<br>"
-                "Required at Benchmark: $%{customdata[0]:.2f}M<br>"
-                "Additional Needed: $%{customdata[1]:.2f}M"
-                "<extra></extra>"
-            )
-        ))
-
-        required_fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=scenario["RequiredProductRevenueAtBenchmark"],
-            name="Required Product Revenue to Hit Benchmark",
-            mode="lines+markers",
-            line=dict(color="#b88152", width=3),
-            customdata=np.stack([scenario["OperatingMargin"], scenario["TotalProjects"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Required Product Revenue: $%{y:.2f}M<br>"
-                "Projected Operating Margin: %{customdata[0]:.2f}%<br>"
-                "Total Projects: %{customdata[1]:.0f}"
-                "<extra></extra>"
+        show_figure(required_volume_figure, result.with_required, key=result.key)
+
+    elif selected_chart == "Baseline vs Expansion":
+        show_figure(baseline_vs_expansion_figure, result.scenario, result.baseline, key=result.key)
+
+    elif selected_chart == "Sensitivity":
+        s1, s2 = st.columns([1, 2])
+        sens_pct = s1.slider("Perturbation ± %", 1, 50, 10, 1, key="sens_pct")
+        sens_metric = s2.radio(
+            "Metric",
+            TORNADO_METRICS,
+            format_func=METRIC_LABELS.get,
+            horizontal=True,
+            key="sens_metric",
+        )
+
+        with chart_profiler.phase("analysis"):
+            sens = tornado(years, dict(zip(INPUT_KEYS, scenario_inputs)), benchmark_op_margin, pct=sens_pct)
+        show_figure(tornado_figure, sens, sens_metric, sens_pct, key=result.key + (sens_pct, sens_metric))
+
+    elif selected_chart == "Parameter Heatmap":
+        h1, h2, h3, h4 = st.columns(4)
+        hm_x = h1.selectbox("X axis", SWEEP_KEYS, SWEEP_KEYS.index("tier1_growth"), format_func=INPUT_LABELS.get, key="hm_x")
+        hm_y = h2.selectbox("Y axis", SWEEP_KEYS, SWEEP_KEYS.index("tier2_growth"), format_func=INPUT_LABELS.get, key="hm_y")
+        hm_metric = h3.selectbox("Color by", list(METRIC_LABELS), 1, format_func=METRIC_LABELS.get, key="hm_metric")
+        hm_size = h4.selectbox("Grid", [51, 101, 201], 2, format_func=lambda n: f"{n} × {n}", key="hm_size")
+
+        if hm_x == hm_y:
+            st.info("Pick two different inputs for the axes.")
+        else:
+            inputs_by_key = dict(zip(INPUT_KEYS, scenario_inputs))
+            current = dict(inputs_by_key, years=years)
+            heatmap_slot = st.empty()
+
+            def render_heatmap(sweep, key=None):
+                show_figure(heatmap_figure, sweep, hm_metric, hm_x, hm_y, current, key=key, slot=heatmap_slot)
+
+            # Grids in the sidebar's own units; each pass is drawn as it
+            # lands and the last is cached whole.
+            hm_key = result.key + (hm_x, hm_y, hm_size)
+            passes = {51: 2, 101: 3, 201: 4}[hm_size]
+            submit = functools.partial(
+                jobs.submit,
+                hm_key,
+                iter_sweep_progress,
+                years,
+                inputs_by_key,
+                benchmark_op_margin,
+                hm_x,
+                hm_y,
+                passes=passes,
+                owner=job_owner("heatmap"),
+                cache=SWEEP_CACHE,
             )
-        ))
+            sweep = await_job(submit, "Evaluating grid", render_heatmap)
+            if sweep is not None:
+                render_heatmap(sweep, key=hm_key + (hm_metric,))
+                export_sweep = (hm_key, sweep, INPUT_LABELS[hm_x], INPUT_LABELS[hm_y])
+
+    elif selected_chart == "Growth Plan Optimizer":
+        o1, o2 = st.columns([2, 1])
+        opt_objective = o1.radio(
+            "Objective",
+            ["max_cumulative_profit", "target_t3_share"],
+            format_func={
+                "max_cumulative_profit": "Maximize cumulative operating profit",
+                "target_t3_share": "Hit a Tier 3 share target",
+            }.get,
+            horizontal=True,
+            key="opt_objective",
+        )
+        opt_target = o2.slider(
+            "Final-year Tier 3 share target %",
+            10, 90, 50, 1,
+            key="opt_target",
+            disabled=opt_objective != "target_t3_share",
+        )
 
-        required_fig.update_layout(
-            title="Required Tier 1 + Tier 2 Revenue to Maintain Benchmark Operating Margin",
-            xaxis_title="Year",
-            yaxis_title="Product Revenue ($M)",
-            height=600
+        inputs_by_key = dict(zip(INPUT_KEYS, scenario_inputs))
+        opt_key = result.key + (opt_objective, opt_target)
+        submit = functools.partial(
+            jobs.submit,
+            opt_key,
+            iter_optimize_growth_plan,
+            years,
+            inputs_by_key,
+            benchmark_op_margin,
+            objective=opt_objective,
+            target_share=opt_target,
+            integer_keys=PLAN_KEYS,
+            owner=job_owner("optimizer"),
+            cache=OPTIMIZER_CACHE,
         )
-        apply_bensonwood_figure_style(required_fig)
-        st.plotly_chart(required_fig, use_container_width=True)
+        warning_slot, opt_slot = st.empty(), st.empty()
 
-    elif selected_chart == "Baseline vs Expansion":
-        comparison_fig = go.Figure()
-
-        comparison_fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=baseline["CumulativeOperatingProfit"],
-            name="Baseline Cumulative Operating Profit",
-            mode="lines+markers",
-            line=dict(width=3, color="#7f9b90"),
-            customdata=np.stack([baseline["OperatingProfit"], baseline["OperatingMargin"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Baseline Cumulative Op Profit: $%{y:.2f}M<br>"
-                "Baseline Annual Op Profit: $%{customdata[0]:.2f}M<br>"
-                "Baseline Op Margin: %{customdata[1]:.2f}%"
-                "<extra></extra>"
+        # Best plan so far while the search runs.
+        opt = await_job(
+            submit,
+            "Searching growth plans",
+            lambda best: show_figure(optimizer_figure, result.scenario, best, benchmark_op_margin, slot=opt_slot),
+        )
+
+        if opt is not None:
+            if not opt["feasible"]:
+                warning_slot.warning(
+                    "No Tier 1/2 growth plan keeps every year at or above the benchmark with the other inputs as set. "
+                    "Showing the plan with the smallest shortfall."
+                )
+
+            show_figure(optimizer_figure, result.scenario, opt, benchmark_op_margin, key=opt_key, slot=opt_slot)
+
+            plan_table = pd.DataFrame(
+                {
+                    "Current": [inputs_by_key[k] for k in PLAN_KEYS],
+                    "Best Plan": [opt["plan"][k] for k in PLAN_KEYS],
+                    "At Search Bound": ["Yes" if k in opt["at_bounds"] else "" for k in PLAN_KEYS],
+                },
+                index=[INPUT_LABELS[k] for k in PLAN_KEYS],
             )
-        ))
-
-        comparison_fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=scenario["CumulativeOperatingProfit"],
-            name="Expansion Cumulative Operating Profit",
-            mode="lines+markers",
-            line=dict(width=3, color="#2f5a51"),
-            customdata=np.stack([scenario["OperatingProfit"], scenario["OperatingMargin"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Expansion Cumulative Op Profit: $%{y:.2f}M<br>"
-                "Expansion Annual Op Profit: $%{customdata[0]:.2f}M<br>"
-                "Expansion Op Margin: %{customdata[1]:.2f}%"
-                "<extra></extra>"
+            st.dataframe(plan_table, use_container_width=True)
+            st.markdown(
+                f"**Best plan:** cumulative operating profit ${opt['cumulative_profit']:.2f}M "
+                f"(current ${float(result.scenario['CumulativeOperatingProfit'].iloc[-1]):.2f}M), "
+                f"final-year Tier 3 share {opt['final_t3_share']:.1f}%."
             )
-        ))
-
-        comparison_fig.update_layout(
-            title="Baseline vs Expansion: Cumulative Operating Profit (After Overhead)",
-            xaxis_title="Year",
-            yaxis_title="Cumulative Operating Profit ($M)",
-            height=600
+            st.button("Apply best plan to sidebar", key="opt_apply", on_click=apply_plan, args=(opt["plan"],))
+
+    elif selected_chart == "Goal Seek":
+        g1, g2, g3, g4 = st.columns([3, 3, 2, 2])
+        gs_key = g1.selectbox("Solve for", INPUT_KEYS, INPUT_KEYS.index("tier1_gm"), format_func=INPUT_LABELS.get, key="gs_key")
+        gs_metric = g2.selectbox("Metric", list(GOAL_METRICS), format_func=GOAL_METRIC_LABELS.get, key="gs_metric")
+        gs_sense = g3.radio("Keep it", [">=", "<="], format_func={">=": "At least", "<=": "At most"}.get, key="gs_sense")
+        gs_target = g4.number_input("Target", value=float(benchmark_op_margin), step=0.5, key="gs_target")
+
+        inputs_by_key = dict(zip(INPUT_KEYS, scenario_inputs))
+        with chart_profiler.phase("analysis"):
+            gs = goal_seek(years, inputs_by_key, gs_key, gs_metric, gs_target, gs_sense)
+        goal = f"{GOAL_METRIC_LABELS[gs_metric]} {'≥' if gs_sense == '>=' else '≤'} {gs_target:g}"
+        show_figure(
+            goal_seek_figure,
+            result.scenario.index,
+            gs,
+            gs_key,
+            inputs_by_key[gs_key],
+            goal,
+            key=result.key + (gs_key, gs_metric, gs_sense, gs_target),
         )
-        apply_bensonwood_figure_style(comparison_fig)
-        st.plotly_chart(comparison_fig, use_container_width=True)
 
-    else:
-        crossover_fig = go.Figure()
-        diff = scenario["CumulativeOperatingProfit"] - baseline["CumulativeOperatingProfit"]
-
-        crossover_fig.add_trace(go.Scatter(
-            x=scenario.index,
-            y=diff,
-            name="Expansion Advantage",
-            mode="lines+markers",
-            line=dict(width=3, color="#2f5a51"),
-            customdata=np.stack([scenario["CumulativeOperatingProfit"], baseline["CumulativeOperatingProfit"]], axis=-1),
-            hovertemplate=(
-                "Year %{x}<br>"
-                "Cumulative Difference: $%{y:.2f}M<br>"
-                "Expansion Cumulative: $%{customdata[0]:.2f}M<br>"
-                "Baseline Cumulative: $%{customdata[1]:.2f}M"
-                "<extra></extra>"
+        label = INPUT_LABELS[gs_key]
+        lower, upper = float(gs["all_years_lower"][0]), float(gs["all_years_upper"][0])
+        if math.isnan(lower):
+            met = [str(year) for year, value in zip(result.scenario.index, gs["lower"][0]) if not math.isnan(value)]
+            st.warning(
+                f"No {label} within the sidebar limits keeps {goal} in every year"
+                + (f"; it can be met in years {', '.join(met)}." if met else ".")
             )
-        ))
+        else:
+            st.markdown(f"**Every year:** {label} between {lower:.2f} and {upper:.2f} (currently {inputs_by_key[gs_key]:g}).")
+            # Nearest value on the sidebar's grid (whole numbers or cents) that still meets the goal.
+            scale = 1 if isinstance(inputs_by_key[gs_key], int) else 100
+            lower, upper = math.ceil(lower * scale - 1e-9) / scale, math.floor(upper * scale + 1e-9) / scale
+            if lower <= upper and not lower <= inputs_by_key[gs_key] <= upper:
+                value = min(max(inputs_by_key[gs_key], lower), upper)
+                value = int(value) if scale == 1 else value
+                st.button(f"Set {label} to {value:g}", key="gs_apply", on_click=apply_plan, args=({gs_key: value},))
+        st.caption(f"Solved {'in closed form' if gs['method'] == 'closed_form' else 'by bisection over every year at once'}.")
 
-        crossover_fig.add_hline(
-            y=0,
-            line_dash="dash",
-            line_color="#7f9b90",
-            annotation_text="Break-even line"
+    else:
+        show_figure(crossover_figure, result.scenario, result.baseline, result.crossover_year, key=result.key)
+
+    if compare_mode:
+        if selected_chart not in compare_views:
+            st.caption("Compare mode overlays scenarios on the first four annual charts; this tab shows the sidebar scenario.")
+        st.markdown("#### Scenario Comparison")
+        compare_table = pd.DataFrame(
+            {
+                "Crossover Year": [entry["summary"]["CrossoverYear"] for entry in comparison.values()],
+                "Min Op Margin %": [entry["summary"]["MinOperatingMargin"] for entry in comparison.values()],
+                "Years Below Benchmark": [int(entry["summary"]["YearsBelowBenchmark"]) for entry in comparison.values()],
+                "End-Year Tier 3 Share %": [entry["summary"]["FinalT3Share"] for entry in comparison.values()],
+                "Cumulative Op Profit ($M)": [entry["summary"]["CumulativeOperatingProfit"] for entry in comparison.values()],
+            },
+            index=list(comparison),
         )
-
-        if crossover_year is not None:
-            crossover_value = float(diff.loc[crossover_year])
-            crossover_fig.add_trace(go.Scatter(
-                x=[crossover_year],
-                y=[crossover_value],
-                mode="markers+text",
-                text=[f"Crossover: Year {crossover_year}"],
-                textposition="top center",
-                marker=dict(size=12, color="#b88152"),
-                name="Crossover Year",
-                hovertemplate="Year %{x}<br>Crossover Difference: $%{y:.2f}M<extra></extra>"
-            ))
-
-        crossover_fig.update_layout(
-            title="Cumulative Operating Profit Advantage (Expansion vs Baseline)",
-            xaxis_title="Year",
-            yaxis_title="Cumulative Profit Difference ($M)",
-            height=600
+        st.dataframe(compare_table.round(2), use_container_width=True)
+        s1, s2 = st.columns([2, 1])
+        s1.text_input("Save the sidebar scenario as", key="save_name", placeholder="e.g. Board plan v2")
+        s2.button("Save scenario", key="save_scenario", on_click=save_scenario, args=(current_params[current_name],))
+        if saved_names:
+            l1, l2 = st.columns([2, 1])
+            l1.selectbox("Saved scenario", saved_names, key="load_name")
+            l2.button("Load into sidebar", key="load_scenario", on_click=load_scenario)
+
+    # Full-precision tables, so nobody has to copy numbers out of tooltips.
+    # Files are written chunk by chunk and cached per result and format.
+    with st.expander("Export results", expanded=False):
+        export_formats = available_formats()
+        e1, e2, e3 = st.columns([1, 1, 1])
+        export_fmt = e1.selectbox("Format", export_formats, format_func=FORMAT_LABELS.get, key="export_fmt")
+        export_tables = {"Scenario": result.scenario, "Baseline": result.baseline}
+        export_key = result.key + (export_fmt,)
+        if compare_mode:
+            export_tables["Comparison"] = compare_table
+            export_key += extras_key
+        with chart_profiler.phase("export"):
+            data = EXPORT_CACHE.get_or_compute(
+                ("tables",) + export_key,
+                lambda: export_bytes(
+                    {
+                        name: frame_chunks(frame, "Scenario" if name == "Comparison" else "Year")
+                        for name, frame in export_tables.items()
+                    },
+                    export_fmt,
+                ),
+            )
+        e2.download_button(
+            "Download tables",
+            data,
+            file_name=f"forecast.{export_fmt}",
+            mime=MIME_TYPES[export_fmt],
+            key="export_tables",
+            help=f"{', '.join(export_tables)}; "
+            + ("one sheet each." if export_fmt == "xlsx" else "stacked, with a table column."),
         )
-        apply_bensonwood_figure_style(crossover_fig)
-        st.plotly_chart(crossover_fig, use_container_width=True)
+        if export_sweep is not None:
+            # A full grid takes seconds to encode (Excel most of all), so it
+            # is only built on request and then kept with the other files.
+            sweep_key, sweep, sweep_x, sweep_y = export_sweep
+            sweep_export_key = ("sweep",) + sweep_key + (export_fmt,)
+            if EXPORT_CACHE.get(sweep_export_key) is None and e3.button("Prepare heatmap grid", key="export_sweep_build"):
+                with chart_profiler.phase("export"):
+                    EXPORT_CACHE.put(
+                        sweep_export_key,
+                        export_bytes({"Heatmap": sweep_chunks(sweep, sweep_x, sweep_y)}, export_fmt),
+                    )
+            data = EXPORT_CACHE.get(sweep_export_key)
+            if data is not None:
+                e3.download_button(
+                    "Download heatmap grid",
+                    data,
+                    file_name=f"heatmap.{export_fmt}",
+                    mime=MIME_TYPES[export_fmt],
+                    key="export_sweep",
+                    help="Every grid cell with all metrics, one row per cell.",
+                )
+
+    if chart_profiler.enabled:
+        show_profile(chart_profiler, "Chart area profile", result.computed(), scope="chart_area", chart=selected_chart, years=years)
+
+
+with chart_col, profiler.phase("chart_area"):
+    chart_area()
 
 # --------------------------
 # Preset button bar (below chart) — FIXED
@@ -914,6 +1189,9 @@ for i, p in enumerate(preset_keys):
 # --------------------------
 with col3:
     st.header("Scenario Insights")
+    scenario = result.scenario
+    below_benchmark = result.below_benchmark
+    crossover_year = result.crossover_year
 
     years_below = ", ".join([f"Year {y}" for y in below_benchmark.index]) if not below_benchmark.empty else "None"
     crossover_text = f"Year {crossover_year}" if crossover_year is not None else "Not within horizon"
@@ -1047,5 +1325,11 @@ with col3:
     </html>
     """
 
-    components.html(insights_html, height=585, scrolling=True)
+    with profiler.phase("insights_html"):
+        components.html(insights_html, height=585, scrolling=True)
 
+# --------------------------
+# Rerun profile (only with FORECAST_PROFILE set)
+# --------------------------
+if profiler.enabled:
+    show_profile(profiler, "Rerun profile", result.computed(), scope="page", chart=st.session_state.get("chart_tab"), years=years)
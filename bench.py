@@ -0,0 +1,406 @@
+"""Benchmarks for the model, the derived metrics, the figures and a full page rerun.
+
+    python bench.py --out bench.json
+    python bench.py --out new.json --compare bench.json
+
+Every case is timed adaptively (repeated until ``--min-time`` has passed,
+within ``--min-repeats`` / ``--max-repeats``) and reported as min and median
+seconds. Results go to JSON together with the library versions and git
+commit, so two runs can be compared; ``--compare`` prints the ratio of
+medians and exits non-zero if any case slowed down by more than
+``--threshold``.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from projection import (
+    GROWTH_KEYS,
+    INPUT_BOUNDS,
+    INPUT_KEYS,
+    INTEGER_KEYS,
+    portfolio_with_cumulative,
+    project_portfolio,
+    project_portfolio_batch,
+    required_scale_to_hit_benchmark,
+)
+from projection.metrics import summarize_batch
+from projection.presets import PRESETS
+
+APP_PATH = Path(__file__).resolve().parent / "app.py"
+
+HORIZONS = (5, 10, 15)
+BATCH_SIZES = (1, 100, 10_000, 100_000, 1_000_000)
+QUICK_BATCH_SIZES = (1, 100, 10_000)
+
+# Batches above this are evaluated in chunks so the 22 (N, years) arrays
+# stay within a few hundred MB; those cases are marked "chunked".
+BATCH_CHUNK = 65_536
+
+DEFAULT_THRESHOLD = 1.25
+
+
+# --------------------------
+# Timing
+# --------------------------
+def measure(fn, min_time=0.5, min_repeats=3, max_repeats=200):
+    """Call ``fn`` repeatedly; return min/median seconds and the repeat count."""
+    fn()  # warm-up: imports, caches, first-touch allocation
+    samples = []
+    start = time.perf_counter()
+    while len(samples) < max_repeats and (
+        len(samples) < min_repeats or time.perf_counter() - start < min_time
+    ):
+        t = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t)
+    return {"min": min(samples), "median": statistics.median(samples), "repeats": len(samples)}
+
+
+# --------------------------
+# Inputs
+# --------------------------
+def preset_inputs(name="Balanced Growth"):
+    preset = PRESETS[name]
+    return preset, tuple(preset[k] for k in INPUT_KEYS)
+
+
+def random_inputs(n, seed=0):
+    """``n`` scenarios drawn uniformly inside the sidebar bounds."""
+    rng = np.random.default_rng(seed)
+    columns = []
+    for k in INPUT_KEYS:
+        lo, hi = INPUT_BOUNDS[k]
+        values = rng.uniform(lo, hi, n)
+        columns.append(np.round(values) if k in INTEGER_KEYS else values)
+    return columns
+
+
+def run_batch(years_, columns, chunk=BATCH_CHUNK):
+    n = len(columns[0])
+    for start in range(0, n, chunk):
+        project_portfolio_batch(years_, *[c[start:start + chunk] for c in columns])
+
+
+# --------------------------
+# Cases
+# --------------------------
+def model_cases(batch_sizes):
+    _, inputs = preset_inputs()
+    for years_ in HORIZONS:
+        yield f"project_portfolio/years={years_}", {"years": years_}, lambda y=years_: project_portfolio(y, *inputs)
+    for n in batch_sizes:
+        columns = random_inputs(n)
+        for years_ in HORIZONS:
+            params = {"years": years_, "n": n, "chunked": n > BATCH_CHUNK}
+            yield f"project_portfolio_batch/n={n}/years={years_}", params, lambda y=years_, c=columns: run_batch(y, c)
+
+
+def graph_cases(batch_sizes):
+    # One input changed on an evaluated graph, early (growth) to late (variable
+    # OH) in the dependency chain; compare with project_portfolio_batch at 15 years.
+    for n in batch_sizes:
+        columns = dict(zip(INPUT_KEYS, random_inputs(n)))
+        for key in ("tier1_growth", "tier1_gm", "voh_t1"):
+            yield f"model_graph_update/n={n}/{key}", {"years": 15, "n": n, "input": key}, graph_update(columns, key)
+
+
+def graph_update(columns, key):
+    """Rerun of a warm ModelGraph after ``key`` changes (alternating between two values)."""
+    from projection.engine import ModelGraph
+
+    graph = ModelGraph(15, columns)
+    graph.values()
+    values = itertools.cycle([columns[key] + 1, columns[key]])
+
+    def run():
+        graph.update(inputs={key: next(values)})
+        graph.values()
+
+    return run
+
+
+def tier_cases(batch_sizes):
+    # The page's three tiers and the 5-8 line roadmap on one (N, tiers, years) array.
+    from projection.tiers import TierTable, project_tiers
+
+    rng = np.random.default_rng(0)
+    for n in batch_sizes:
+        for lines in (3, 5, 8):
+            table = TierTable(
+                names=[f"Line {i + 1}" for i in range(lines)],
+                price_m=rng.uniform(0.1, 2.0, (n, lines)),
+                gm_pct=rng.uniform(5, 35, (n, lines)),
+                projects0=np.round(rng.uniform(0, 100, (n, lines))),
+                growth_pct=rng.uniform(0, 40, (n, lines)),
+                voh_k=rng.uniform(0, 100, (n, lines)),
+                hold_constant=[True] + [False] * (lines - 1),
+                revenue_m=rng.uniform(1, 50, (n, lines)),
+            )
+            yield f"project_tiers/n={n}/lines={lines}", {"years": 15, "n": n, "lines": lines}, lambda t=table: (
+                project_tiers(15, t, 7.5)
+            )
+
+
+def compact_cases(batch_sizes):
+    # What the summaries, sweeps and Monte Carlo read: margin and profit only.
+    for n in batch_sizes:
+        columns = random_inputs(n)
+        for dtype in ("float64", "float32"):
+            params = {"years": 15, "n": n, "dtype": dtype, "chunked": n > BATCH_CHUNK}
+            yield f"project_portfolio_compact/n={n}/{dtype}", params, lambda c=columns, d=dtype: run_compact(c, d)
+
+
+def run_compact(columns, dtype, chunk=BATCH_CHUNK):
+    from projection.compact import project_portfolio_compact
+
+    n = len(columns[0])
+    for start in range(0, n, chunk):
+        batch = project_portfolio_compact(15, *[c[start:start + chunk] for c in columns], dtype=dtype)
+        batch["OperatingMargin"], batch["OperatingProfit"]
+
+
+def period_cases(batch_sizes):
+    from projection.periods import DEFAULT_CURVES, project_portfolio_periods
+
+    # Two-year builds give 24 monthly taps, past the direct/FFT crossover.
+    long_builds = {tier: ("s_curve", 24) for tier in DEFAULT_CURVES}
+    for n in batch_sizes[:3]:
+        columns = random_inputs(n)
+        for method in ("direct", "fft"):
+            params = {"years": 15, "n": n, "resolution": "monthly", "taps": 24, "method": method}
+            yield f"project_portfolio_periods/n={n}/{method}", params, lambda c=columns, m=method: (
+                project_portfolio_periods(15, *c, resolution="monthly", curves=long_builds, method=m)
+            )
+
+
+def capacity_cases(batch_sizes):
+    from projection.capacity import project_portfolio_capacity
+
+    # Tight enough that every tier queues for most of the horizon.
+    limits = {"tier3": 15, "tier2": 20, "tier1": 25}
+    for n in batch_sizes[:3]:
+        columns = random_inputs(n)
+        params = {"years": 15, "n": n, "resolution": "monthly"}
+        yield f"project_portfolio_capacity/n={n}", params, lambda c=columns: (
+            project_portfolio_capacity(15, *c, capacity=limits, decay=0.1, resolution="monthly")
+        )
+
+
+def derived_cases():
+    preset, inputs = preset_inputs()
+    bm = preset["benchmark_op_margin"]
+    years_ = preset["years"]
+    baseline_inputs = tuple(0 if k in GROWTH_KEYS else v for k, v in zip(INPUT_KEYS, inputs))
+    scenario = portfolio_with_cumulative(years_, inputs)
+
+    def page_crossover():
+        s = portfolio_with_cumulative(years_, inputs)
+        b = portfolio_with_cumulative(years_, baseline_inputs)
+        hit = s[s["CumulativeOperatingProfit"] >= b["CumulativeOperatingProfit"]]
+        return int(hit.index[0]) if not hit.empty else None
+
+    yield "required_scale/page", {"years": years_}, lambda: required_scale_to_hit_benchmark(
+        scenario, bm, preset["voh_t3"], preset["voh_t2"], preset["voh_t1"]
+    )
+    yield "cumulative_crossover/page", {"years": years_}, page_crossover
+
+    n = 10_000
+    columns = random_inputs(n)
+    batch = project_portfolio_batch(15, *columns)
+    base = project_portfolio_batch(15, *[np.zeros(n) if k in GROWTH_KEYS else c for k, c in zip(INPUT_KEYS, columns)])
+    voh = {k: columns[INPUT_KEYS.index(k)] for k in ("voh_t3", "voh_t2", "voh_t1")}
+    yield "required_scale/batch", {"years": 15, "n": n}, lambda: required_scale_to_hit_benchmark(
+        batch, bm, voh["voh_t3"], voh["voh_t2"], voh["voh_t1"]
+    )
+    yield "summarize_batch", {"years": 15, "n": n}, lambda: summarize_batch(batch, base, bm)
+
+
+def figure_cases():
+    from charts import (
+        baseline_vs_expansion_figure,
+        crossover_figure,
+        required_volume_figure,
+        revenue_mix_figure,
+    )
+    from projection.solver import REQUIRED_COLUMNS
+
+    preset, inputs = preset_inputs()
+    bm = preset["benchmark_op_margin"]
+    years_ = 15
+    baseline_inputs = tuple(0 if k in GROWTH_KEYS else v for k, v in zip(INPUT_KEYS, inputs))
+    scenario = portfolio_with_cumulative(years_, inputs)
+    baseline = portfolio_with_cumulative(years_, baseline_inputs)
+    required = required_scale_to_hit_benchmark(scenario, bm, preset["voh_t3"], preset["voh_t2"], preset["voh_t1"])
+    scenario = scenario.assign(**{col: required[col] for col in REQUIRED_COLUMNS})
+    below = scenario[scenario["OperatingMargin"] < bm]
+    hit = scenario[scenario["CumulativeOperatingProfit"] >= baseline["CumulativeOperatingProfit"]]
+    crossover = int(hit.index[0]) if not hit.empty else None
+
+    # Building the figure is only half of it: Streamlit serializes every
+    # figure to JSON before it reaches the browser.
+    builders = {
+        "revenue_mix": lambda: revenue_mix_figure(scenario, below, bm),
+        "required_volume": lambda: required_volume_figure(scenario),
+        "baseline_vs_expansion": lambda: baseline_vs_expansion_figure(scenario, baseline),
+        "crossover": lambda: crossover_figure(scenario, baseline, crossover),
+    }
+    for name, build in builders.items():
+        yield f"figure/{name}", {"years": years_}, build
+        yield f"figure/{name}+json", {"years": years_}, lambda b=build: b().to_json()
+
+
+def apptest_cases():
+    from streamlit.logger import set_log_level
+    from streamlit.testing.v1 import AppTest
+
+    # Keep per-rerun Streamlit warnings out of the results table.
+    set_log_level("error")
+    at = AppTest.from_file(str(APP_PATH), default_timeout=120)
+
+    def first_run():
+        for cache in _caches():
+            cache.clear()
+        AppTest.from_file(str(APP_PATH), default_timeout=120).run()
+
+    # A slider drag: every rerun moves the growth rate and misses the
+    # model caches, as the first visit to a new value would.
+    lo, hi = INPUT_BOUNDS["tier1_growth"]
+    values = iter(np.tile(np.arange(lo, hi + 1), 1000))
+
+    def slider_rerun():
+        if "tier1_growth" not in at.session_state:
+            at.run()
+        for cache in _caches():
+            cache.clear()
+        at.slider(key="tier1_growth").set_value(int(next(values))).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+    yield "apptest/first_run", {"caches": "cold"}, first_run
+    yield "apptest/slider_rerun", {"widget": "tier1_growth", "caches": "miss"}, slider_rerun
+
+
+def _caches():
+    from projection import cache
+
+    return [v for v in vars(cache).values() if isinstance(v, cache.LRUCache)]
+
+
+# --------------------------
+# Reporting
+# --------------------------
+def environment():
+    import importlib.metadata as md
+
+    versions = {}
+    for dist in ("numpy", "pandas", "plotly", "streamlit"):
+        try:
+            versions[dist] = md.version(dist)
+        except md.PackageNotFoundError:
+            versions[dist] = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=APP_PATH.parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "versions": versions,
+    }
+
+
+def compare(new, old, threshold=DEFAULT_THRESHOLD):
+    """Print median ratios against ``old``; return the names that regressed."""
+    regressed = []
+    print(f"\n{'case':<48} {'old':>10} {'new':>10} {'ratio':>7}")
+    for name, result in new["results"].items():
+        before = old["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["median"] / before["median"] if before["median"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            regressed.append(name)
+        elif ratio < 1 / threshold:
+            flag = "  faster"
+        print(f"{name:<48} {_fmt(before['median']):>10} {_fmt(result['median']):>10} {ratio:>6.2f}x{flag}")
+    return regressed
+
+
+def _fmt(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python bench.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="median ratio that counts as a regression (default: %(default)s)")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="skip the 100k/1M batches and the AppTest reruns")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend per case (default: %(default)s)")
+    parser.add_argument("--min-repeats", type=int, default=3)
+    parser.add_argument("--max-repeats", type=int, default=200)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    groups = [
+        model_cases(QUICK_BATCH_SIZES if args.quick else BATCH_SIZES),
+        graph_cases(QUICK_BATCH_SIZES),
+        tier_cases(QUICK_BATCH_SIZES),
+        compact_cases(QUICK_BATCH_SIZES if args.quick else BATCH_SIZES),
+        period_cases(QUICK_BATCH_SIZES),
+        capacity_cases(QUICK_BATCH_SIZES),
+        derived_cases(),
+        figure_cases(),
+    ]
+    if not args.quick:
+        groups.append(apptest_cases())
+
+    results = {}
+    for group in groups:
+        for name, params, fn in group:
+            if args.filter not in name:
+                continue
+            timing = measure(fn, args.min_time, args.min_repeats, args.max_repeats)
+            results[name] = {**timing, "params": params}
+            print(f"{name:<48} min {_fmt(timing['min']):>10}  median {_fmt(timing['median']):>10}  x{timing['repeats']}")
+
+    report = {"environment": environment(), "results": results}
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        old = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressed = compare(report, old, args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than {args.threshold}x: {', '.join(regressed)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
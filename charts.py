@@ -0,0 +1,864 @@
+"""Plotly figures for the forecast page.
+
+Every builder takes model output (frames or result dicts) and returns a
+styled ``go.Figure``; nothing here calls Streamlit, so figures can be built
+and timed outside the page.
+
+Builders assemble plain trace and layout dicts and wrap them without
+Plotly's per-property validation, which used to be most of the cost of a
+figure. The theme layout (template included) is resolved once per process by
+``apply_bensonwood_figure_style`` and shared, so callers must not mutate the
+returned figures.
+"""
+
+import functools
+
+import numpy as np
+import plotly.graph_objects as go
+
+from projection.montecarlo import DEFAULT_PERCENTILES
+from projection.sensitivity import SENSITIVITY_KEYS, rank_by_impact
+
+# --------------------------
+# Labels
+# --------------------------
+INPUT_LABELS = {
+    "years": "Planning Horizon",
+    "tier3_revenue": "Tier 3 Revenue",
+    "tier3_gm": "Tier 3 Gross Margin",
+    "tier3_projects": "Tier 3 Projects",
+    "tier2_price": "Tier 2 Revenue / Project",
+    "tier2_gm": "Tier 2 Gross Margin",
+    "tier2_projects0": "Tier 2 Starting Projects",
+    "tier2_growth": "Tier 2 Growth",
+    "tier1_price": "Tier 1 Revenue / Project",
+    "tier1_gm": "Tier 1 Gross Margin",
+    "tier1_projects0": "Tier 1 Starting Projects",
+    "tier1_growth": "Tier 1 Growth",
+    "fixed_overhead": "Fixed Overhead",
+    "voh_t3": "Tier 3 Variable OH",
+    "voh_t2": "Tier 2 Variable OH",
+    "voh_t1": "Tier 1 Variable OH",
+}
+
+METRIC_LABELS = {
+    "FinalOperatingMargin": "Final-Year Operating Margin (%)",
+    "MinOperatingMargin": "Minimum Operating Margin (%)",
+    "CumulativeOperatingProfit": "Cumulative Operating Profit ($M)",
+    "CrossoverYear": "Crossover Year",
+    "YearsBelowBenchmark": "Years Below Benchmark",
+    "FinalT3Share": "Final-Year Tier 3 Share (%)",
+}
+
+# Per-year series the goal seek can target (projection.goalseek.GOAL_METRICS).
+GOAL_METRIC_LABELS = {
+    "OperatingMargin": "Operating Margin (%)",
+    "OperatingProfit": "Operating Profit ($M)",
+    "CumulativeOperatingProfit": "Cumulative Operating Profit ($M)",
+    "TotalRevenue": "Total Revenue ($M)",
+    "T3_Share": "Tier 3 Share (%)",
+    "T2_Share": "Tier 2 Share (%)",
+    "T1_Share": "Tier 1 Share (%)",
+    "ProfitPerProject_k": "Operating Profit per Project ($K)",
+}
+
+
+# --------------------------
+# Plot styling helper
+# --------------------------
+def apply_bensonwood_figure_style(fig):
+    fig.update_layout(
+        template="plotly_white",
+        paper_bgcolor="rgba(0,0,0,0)",
+        plot_bgcolor="#162321",
+        font=dict(family="Montserrat, sans-serif", color="#e7efec"),
+        colorway=["#2f5a51", "#b88152", "#7f9b90", "#1f3a36"],
+        legend=dict(
+            bgcolor="rgba(22,35,33,0.85)",
+            bordercolor="#2d4540",
+            borderwidth=1,
+            orientation="h",
+            yanchor="top",
+            y=-0.18,
+            xanchor="center",
+            x=0.5,
+        ),
+        margin=dict(b=120),
+    )
+    fig.update_xaxes(**_AXIS_STYLE)
+    fig.update_yaxes(**_AXIS_STYLE)
+
+
+_AXIS_STYLE = dict(gridcolor="#2d4540", zerolinecolor="#2d4540")
+
+_BENCHMARK_LINE = dict(dash="dash", color="#87ceeb")
+_BAND_LINE = dict(width=0, color="#7f9b90")
+_BAND_FILL = "rgba(127,155,144,0.35)"
+# One line per compared scenario; the sidebar scenario is drawn in white.
+_COMPARE_COLORS = ("#2f5a51", "#7f9b90", "#b88152", "#87ceeb", "#c9a66b", "#a33a2a", "#5f8fa0", "#d8c3a5")
+
+
+@functools.cache
+def _style_layout():
+    """Theme layout with the template expanded, built once per process."""
+    fig = go.Figure()
+    apply_bensonwood_figure_style(fig)
+    return fig.to_dict()["layout"]
+
+
+def _title(text):
+    return {"text": text}
+
+
+def _figure(data, **layout):
+    """Wrap trace dicts and figure-specific layout in the shared theme.
+
+    Every x/y axis in ``layout`` (and always ``xaxis``/``yaxis``) gets the
+    theme grid colors, as ``apply_bensonwood_figure_style`` would give it.
+    """
+    full = dict(_style_layout())
+    for axis in {"xaxis", "yaxis", *(k for k in layout if k.startswith(("xaxis", "yaxis")))}:
+        layout[axis] = {**layout.get(axis, {}), **_AXIS_STYLE}
+    full.update(layout)
+    return go.Figure({"data": data, "layout": full}, _validate=False)
+
+
+def _values(x):
+    """Trace data as a NumPy array (frames, indexes and lists alike)."""
+    return np.asarray(x)
+
+
+def _hline(y, color, text):
+    shape = {"line": {"color": color, "dash": "dash"}, "type": "line",
+             "x0": 0, "x1": 1, "xref": "x domain", "y0": y, "y1": y, "yref": "y"}
+    annotation = {"showarrow": False, "text": text, "x": 1, "xanchor": "right",
+                  "xref": "x domain", "y": y, "yanchor": "bottom", "yref": "y"}
+    return shape, annotation
+
+
+def _vline(x, color, text):
+    shape = {"line": {"color": color, "dash": "dash"}, "type": "line",
+             "x0": x, "x1": x, "xref": "x", "y0": 0, "y1": 1, "yref": "y domain"}
+    annotation = {"showarrow": False, "text": text, "x": x, "xanchor": "left",
+                  "xref": "x", "y": 1, "yanchor": "top", "yref": "y domain"}
+    return shape, annotation
+
+
+# --------------------------
+# Figures
+# --------------------------
+def revenue_mix_figure(scenario, below_benchmark, benchmark_op_margin, x_label="Year"):
+    """Stacked tier revenue with operating margin against the benchmark.
+
+    ``x_label`` names the rows of ``scenario`` ("Period" for sub-annual frames).
+    """
+    years = _values(scenario.index)
+    data = [
+        {
+            "type": "bar",
+            "x": years,
+            "y": _values(scenario["T3_Revenue"]),
+            "name": "Tier 3 (Custom) Revenue",
+            "marker": {"color": "#2f5a51"},
+            "customdata": np.stack([scenario["T3_Share"], scenario["TotalRevenue"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                "Tier 3 Revenue: $%{y:.2f}M<br>"
+                "Tier 3 Share: %{customdata[0]:.1f}%<br>"
+                "Total Revenue: $%{customdata[1]:.2f}M"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "bar",
+            "x": years,
+            "y": _values(scenario["T2_Revenue"]),
+            "name": "Tier 2 Revenue",
+            "marker": {"color": "#7f9b90"},
+            "customdata": np.stack([scenario["T2_Share"], scenario["T2_Projects"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                "Tier 2 Revenue: $%{y:.2f}M<br>"
+                "Tier 2 Share: %{customdata[0]:.1f}%<br>"
+                "Tier 2 Projects: %{customdata[1]:.0f}"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "bar",
+            "x": years,
+            "y": _values(scenario["T1_Revenue"]),
+            "name": "Tier 1 Revenue",
+            "marker": {"color": "#b88152"},
+            "customdata": np.stack([scenario["T1_Share"], scenario["T1_Projects"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                "Tier 1 Revenue: $%{y:.2f}M<br>"
+                "Tier 1 Share: %{customdata[0]:.1f}%<br>"
+                "Tier 1 Projects: %{customdata[1]:.0f}"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(scenario["OperatingMargin"]),
+            "name": "Operating Margin %",
+            "mode": "lines+markers",
+            "yaxis": "y2",
+            "line": {"width": 3, "color": "#ffffff"},
+            "customdata": np.stack([scenario["OperatingProfit"], scenario["TotalOverhead"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                "Operating Margin: %{y:.2f}%<br>"
+                "Operating Profit: $%{customdata[0]:.2f}M<br>"
+                "Total Overhead: $%{customdata[1]:.2f}M"
+                "<extra></extra>"
+            ),
+        },
+    ]
+
+    if not below_benchmark.empty:
+        data.append({
+            "type": "scatter",
+            "x": _values(below_benchmark.index),
+            "y": _values(below_benchmark["OperatingMargin"]),
+            "name": "Below Benchmark",
+            "mode": "markers",
+            "marker": {"size": 10, "color": "#a33a2a"},
+            "yaxis": "y2",
+            "customdata": np.stack([below_benchmark["OperatingProfit"], below_benchmark["TotalProjects"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                "Operating Margin: %{y:.2f}% (below benchmark)<br>"
+                "Operating Profit: $%{customdata[0]:.2f}M<br>"
+                "Total Projects: %{customdata[1]:.0f}"
+                "<extra></extra>"
+            ),
+        })
+
+    data.append({
+        "type": "scatter",
+        "x": years,
+        "y": [benchmark_op_margin] * len(years),
+        "name": "Benchmark Operating Margin",
+        "mode": "lines",
+        "yaxis": "y2",
+        "line": _BENCHMARK_LINE,
+        "hovertemplate": "Benchmark Target: %{y:.2f}%<extra></extra>",
+    })
+
+    return _figure(
+        data,
+        title=_title("Tier-Based Revenue Mix & Operating Margin"),
+        xaxis={"title": _title(x_label)},
+        yaxis={"title": _title("Revenue ($M)")},
+        yaxis2={
+            "title": _title("Operating Margin (%)"),
+            "overlaying": "y",
+            "side": "right",
+            "range": [0, 25],
+            "showgrid": False,
+        },
+        barmode="stack",
+        height=600,
+    )
+
+
+def margin_fan_figure(index, mc, benchmark_op_margin):
+    """Monte Carlo P5-P95 operating margin band with the chance of missing the benchmark."""
+    lo, mid, hi = DEFAULT_PERCENTILES
+    years = _values(index)
+    data = [
+        {
+            "type": "bar",
+            "x": years,
+            "y": mc["ProbBelowBenchmark"] * 100,
+            "name": "Chance Below Benchmark",
+            "marker": {"color": "#a33a2a"},
+            "opacity": 0.55,
+            "yaxis": "y2",
+            "hovertemplate": "Year %{x}<br>Chance Below Benchmark: %{y:.1f}%<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["OperatingMargin"][hi],
+            "name": f"P{hi} Operating Margin",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "showlegend": False,
+            "hovertemplate": f"Year %{{x}}<br>P{hi} Operating Margin: %{{y:.2f}}%<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["OperatingMargin"][lo],
+            "name": f"P{lo}–P{hi} Operating Margin",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "fill": "tonexty",
+            "fillcolor": _BAND_FILL,
+            "hovertemplate": f"Year %{{x}}<br>P{lo} Operating Margin: %{{y:.2f}}%<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["OperatingMargin"][mid],
+            "name": "Median Operating Margin",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#ffffff"},
+            "hovertemplate": "Year %{x}<br>Median Operating Margin: %{y:.2f}%<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": [benchmark_op_margin] * len(years),
+            "name": "Benchmark Operating Margin",
+            "mode": "lines",
+            "line": _BENCHMARK_LINE,
+            "hovertemplate": "Benchmark Target: %{y:.2f}%<extra></extra>",
+        },
+    ]
+    return _figure(
+        data,
+        title=_title(f"Operating Margin Range ({mc['n_paths']:,} simulated paths)"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Operating Margin (%)")},
+        yaxis2={
+            "title": _title("Chance Below Benchmark (%)"),
+            "overlaying": "y",
+            "side": "right",
+            "range": [0, 100],
+            "showgrid": False,
+        },
+        height=420,
+    )
+
+
+def cumulative_fan_figure(index, mc):
+    """Monte Carlo P5-P95 band for cumulative operating profit."""
+    lo, mid, hi = DEFAULT_PERCENTILES
+    years = _values(index)
+    data = [
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["CumulativeOperatingProfit"][hi],
+            "name": f"P{hi} Cumulative Operating Profit",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "showlegend": False,
+            "hovertemplate": f"Year %{{x}}<br>P{hi} Cumulative Op Profit: $%{{y:.2f}}M<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["CumulativeOperatingProfit"][lo],
+            "name": f"P{lo}–P{hi} Cumulative Operating Profit",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "fill": "tonexty",
+            "fillcolor": _BAND_FILL,
+            "hovertemplate": f"Year %{{x}}<br>P{lo} Cumulative Op Profit: $%{{y:.2f}}M<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": mc["CumulativeOperatingProfit"][mid],
+            "name": "Median Cumulative Operating Profit",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#ffffff"},
+            "hovertemplate": "Year %{x}<br>Median Cumulative Op Profit: $%{y:.2f}M<extra></extra>",
+        },
+    ]
+    return _figure(
+        data,
+        title=_title("Cumulative Operating Profit Range"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Cumulative Operating Profit ($M)")},
+        height=420,
+    )
+
+
+def required_volume_figure(scenario):
+    """Projected vs required Tier 1 + Tier 2 revenue at the benchmark margin."""
+    years = _values(scenario.index)
+    data = [
+        {
+            "type": "bar",
+            "x": years,
+            "y": _values(scenario["ProductRevenue"]),
+            "name": "Projected Tier 1 + Tier 2 Revenue",
+            "marker": {"color": "#2f5a51"},
+            "customdata": np.stack(
+                [scenario["RequiredProductRevenueAtBenchmark"], scenario["AdditionalProductRevenueNeeded"]],
+                axis=-1
+            ),
+            "hovertemplate": (
+                "Year %{x}<br>"
+                "Projected Product Revenue: $%{y:.2f}M<br>"
+                "Required at Benchmark: $%{customdata[0]:.2f}M<br>"
+                "Additional Needed: $%{customdata[1]:.2f}M"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(scenario["RequiredProductRevenueAtBenchmark"]),
+            "name": "Required Product Revenue to Hit Benchmark",
+            "mode": "lines+markers",
+            "line": {"color": "#b88152", "width": 3},
+            "customdata": np.stack(
+                [
+                    scenario["OperatingMargin"],
+                    scenario["TotalProjects"],
+                    scenario["RequiredT1Projects"],
+                    scenario["RequiredT2Projects"],
+                ],
+                axis=-1
+            ),
+            "hovertemplate": (
+                "Year %{x}<br>"
+                "Required Product Revenue: $%{y:.2f}M<br>"
+                "Projected Operating Margin: %{customdata[0]:.2f}%<br>"
+                "Total Projects: %{customdata[1]:.0f}<br>"
+                "Required Tier 1 Projects: %{customdata[2]:.1f}<br>"
+                "Required Tier 2 Projects: %{customdata[3]:.1f}"
+                "<extra></extra>"
+            ),
+        },
+    ]
+    return _figure(
+        data,
+        title=_title("Required Tier 1 + Tier 2 Revenue to Maintain Benchmark Operating Margin"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Product Revenue ($M)")},
+        height=600,
+    )
+
+
+def baseline_vs_expansion_figure(scenario, baseline):
+    """Cumulative operating profit of the expansion against the zero-growth baseline."""
+    years = _values(scenario.index)
+    data = [
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(baseline["CumulativeOperatingProfit"]),
+            "name": "Baseline Cumulative Operating Profit",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#7f9b90"},
+            "customdata": np.stack([baseline["OperatingProfit"], baseline["OperatingMargin"]], axis=-1),
+            "hovertemplate": (
+                "Year %{x}<br>"
+                "Baseline Cumulative Op Profit: $%{y:.2f}M<br>"
+                "Baseline Annual Op Profit: $%{customdata[0]:.2f}M<br>"
+                "Baseline Op Margin: %{customdata[1]:.2f}%"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(scenario["CumulativeOperatingProfit"]),
+            "name": "Expansion Cumulative Operating Profit",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#2f5a51"},
+            "customdata": np.stack([scenario["OperatingProfit"], scenario["OperatingMargin"]], axis=-1),
+            "hovertemplate": (
+                "Year %{x}<br>"
+                "Expansion Cumulative Op Profit: $%{y:.2f}M<br>"
+                "Expansion Annual Op Profit: $%{customdata[0]:.2f}M<br>"
+                "Expansion Op Margin: %{customdata[1]:.2f}%"
+                "<extra></extra>"
+            ),
+        },
+    ]
+    return _figure(
+        data,
+        title=_title("Baseline vs Expansion: Cumulative Operating Profit (After Overhead)"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Cumulative Operating Profit ($M)")},
+        height=600,
+    )
+
+
+def tornado_figure(sens, sens_metric, sens_pct):
+    """Tornado of one-at-a-time input swings, largest at the top."""
+    order = rank_by_impact(sens, sens_metric)[::-1]
+    sens_base = sens["base"][sens_metric]
+    labels = [INPUT_LABELS[SENSITIVITY_KEYS[i]] for i in order]
+    metric_label = METRIC_LABELS[sens_metric]
+
+    data = []
+    for side, sign, color in (("low", "−", "#b88152"), ("high", "+", "#2f5a51")):
+        data.append({
+            "type": "bar",
+            "y": labels,
+            "x": sens[side][sens_metric][order] - sens_base,
+            "base": sens_base,
+            "orientation": "h",
+            "name": f"Input {sign}{sens_pct}%",
+            "marker": {"color": color},
+            "customdata": np.stack([sens[f"{side}_value"][order], sens[side][sens_metric][order]], axis=-1),
+            "hovertemplate": (
+                "%{y}<br>"
+                "Input: %{customdata[0]:.2f}<br>"
+                f"{metric_label}: %{{customdata[1]:.2f}}"
+                "<extra></extra>"
+            ),
+        })
+    shape, annotation = _vline(sens_base, "#87ceeb", f"Current: {sens_base:.2f}")
+    return _figure(
+        data,
+        shapes=[shape],
+        annotations=[annotation],
+        title=_title(f"Sensitivity of {metric_label} to ±{sens_pct}% Input Changes"),
+        xaxis={"title": _title(metric_label)},
+        barmode="overlay",
+        height=600,
+    )
+
+
+def heatmap_figure(sweep, hm_metric, hm_x, hm_y, current):
+    """Heatmap of a sweep metric over two inputs, marking the current scenario."""
+    data = [
+        {
+            "type": "heatmap",
+            "x": sweep["x"],
+            "y": sweep["y"],
+            "z": sweep["metrics"][hm_metric],
+            "colorscale": [[0.0, "#a33a2a"], [0.5, "#b88152"], [1.0, "#2f5a51"]],
+            "reversescale": hm_metric in ("YearsBelowBenchmark", "CrossoverYear", "FinalT3Share"),
+            "colorbar": {"title": _title(METRIC_LABELS[hm_metric])},
+            "hovertemplate": (
+                f"{INPUT_LABELS[hm_x]}: %{{x:.2f}}<br>"
+                f"{INPUT_LABELS[hm_y]}: %{{y:.2f}}<br>"
+                f"{METRIC_LABELS[hm_metric]}: %{{z:.2f}}"
+                "<extra></extra>"
+            ),
+        },
+        {
+            "type": "scatter",
+            "x": [current[hm_x]],
+            "y": [current[hm_y]],
+            "mode": "markers",
+            "marker": {"size": 12, "color": "#ffffff", "line": {"width": 2, "color": "#162321"}},
+            "name": "Current Scenario",
+            "hovertemplate": "Current Scenario<extra></extra>",
+        },
+    ]
+    return _figure(
+        data,
+        title=_title(
+            f"{METRIC_LABELS[hm_metric]} ({len(sweep['x'])} × {len(sweep['y'])} grid"
+            + ("" if sweep["pass"] + 1 == sweep["passes"] else ", refining…") + ")"
+        ),
+        xaxis={"title": _title(INPUT_LABELS[hm_x])},
+        yaxis={"title": _title(INPUT_LABELS[hm_y])},
+        height=600,
+    )
+
+
+def optimizer_figure(scenario, opt, benchmark_op_margin):
+    """Operating margin of the optimizer's best plan against the current plan."""
+    years = _values(scenario.index)
+    data = [
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(scenario["OperatingMargin"]),
+            "name": "Current Plan Operating Margin",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#2f5a51"},
+            "hovertemplate": "Year %{x}<br>Current Plan Margin: %{y:.2f}%<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": opt["margin"],
+            "name": "Best Plan Operating Margin",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#ffffff"},
+            "hovertemplate": "Year %{x}<br>Best Plan Margin: %{y:.2f}%<extra></extra>",
+        },
+    ]
+    if opt["binding_years"]:
+        data.append({
+            "type": "scatter",
+            "x": opt["binding_years"],
+            "y": opt["margin"][np.array(opt["binding_years"]) - 1],
+            "name": "Binding Years",
+            "mode": "markers",
+            "marker": {"size": 11, "color": "#b88152"},
+            "hovertemplate": "Year %{x}<br>Binding at %{y:.2f}%<extra></extra>",
+        })
+    data.append({
+        "type": "scatter",
+        "x": years,
+        "y": [benchmark_op_margin] * len(years),
+        "name": "Benchmark Operating Margin",
+        "mode": "lines",
+        "line": _BENCHMARK_LINE,
+        "hovertemplate": "Benchmark Target: %{y:.2f}%<extra></extra>",
+    })
+    return _figure(
+        data,
+        title=_title(f"Best Growth Plan vs Current ({opt['evaluations']:,} plans evaluated)"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Operating Margin (%)")},
+        height=460,
+    )
+
+
+def goal_seek_figure(index, gs, key, current, goal):
+    """Per-year range of one input that meets a goal, against its current value."""
+    years = _values(index)
+    label = INPUT_LABELS[key]
+    data = [
+        {
+            "type": "scatter",
+            "x": years,
+            "y": gs["upper"][0],
+            "name": f"Highest {label} Meeting Goal",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "showlegend": False,
+            "hovertemplate": f"Year %{{x}}<br>Highest {label}: %{{y:.2f}}<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": gs["lower"][0],
+            "name": f"{label} Meeting Goal",
+            "mode": "lines",
+            "line": _BAND_LINE,
+            "fill": "tonexty",
+            "fillcolor": _BAND_FILL,
+            "hovertemplate": f"Year %{{x}}<br>Lowest {label}: %{{y:.2f}}<extra></extra>",
+        },
+        {
+            "type": "scatter",
+            "x": years,
+            "y": [current] * len(years),
+            "name": f"Current {label}",
+            "mode": "lines",
+            "line": {"width": 3, "color": "#ffffff"},
+            "hovertemplate": f"Current {label}: %{{y:.2f}}<extra></extra>",
+        },
+    ]
+    # Mark the every-year limits, except where that band edge is flat (a search bound).
+    shapes, annotations = [], []
+    for edge, text in (("lower", "Every year: at least"), ("upper", "Every year: at most")):
+        value = float(gs[f"all_years_{edge}"][0])
+        per_year = gs[edge][0]
+        if np.isfinite(value) and np.nanmin(per_year) < np.nanmax(per_year):
+            shape, annotation = _hline(value, "#b88152", f"{text} {value:.2f}")
+            shapes.append(shape)
+            annotations.append(annotation)
+    return _figure(
+        data,
+        shapes=shapes,
+        annotations=annotations,
+        title=_title(f"{label} that Keeps {goal}"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title(label)},
+        height=520,
+    )
+
+
+def crossover_figure(scenario, baseline, crossover_year):
+    """Expansion minus baseline cumulative operating profit, with the crossover year."""
+    years = _values(scenario.index)
+    diff = scenario["CumulativeOperatingProfit"] - baseline["CumulativeOperatingProfit"]
+    data = [
+        {
+            "type": "scatter",
+            "x": years,
+            "y": _values(diff),
+            "name": "Expansion Advantage",
+            "mode": "lines+markers",
+            "line": {"width": 3, "color": "#2f5a51"},
+            "customdata": np.stack(
+                [scenario["CumulativeOperatingProfit"], baseline["CumulativeOperatingProfit"]], axis=-1
+            ),
+            "hovertemplate": (
+                "Year %{x}<br>"
+                "Cumulative Difference: $%{y:.2f}M<br>"
+                "Expansion Cumulative: $%{customdata[0]:.2f}M<br>"
+                "Baseline Cumulative: $%{customdata[1]:.2f}M"
+                "<extra></extra>"
+            ),
+        },
+    ]
+
+    if crossover_year is not None:
+        crossover_value = float(diff.loc[crossover_year])
+        data.append({
+            "type": "scatter",
+            "x": [crossover_year],
+            "y": [crossover_value],
+            "mode": "markers+text",
+            "text": [f"Crossover: Year {crossover_year}"],
+            "textposition": "top center",
+            "marker": {"size": 12, "color": "#b88152"},
+            "name": "Crossover Year",
+            "hovertemplate": "Year %{x}<br>Crossover Difference: $%{y:.2f}M<extra></extra>",
+        })
+
+    shape, annotation = _hline(0, "#7f9b90", "Break-even line")
+    return _figure(
+        data,
+        shapes=[shape],
+        annotations=[annotation],
+        title=_title("Cumulative Operating Profit Advantage (Expansion vs Baseline)"),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title("Cumulative Profit Difference ($M)")},
+        height=600,
+    )
+
+
+def capacity_revenue_figure(frame, unconstrained, x_label="Year"):
+    """Revenue of the projects capacity lets start, against unconstrained demand."""
+    periods = _values(frame.index)
+    data = []
+    for n, name, color in ((3, "Tier 3 (Custom)", "#2f5a51"), (2, "Tier 2", "#7f9b90"), (1, "Tier 1", "#b88152")):
+        data.append({
+            "type": "bar",
+            "x": periods,
+            "y": _values(frame[f"T{n}_Revenue"]),
+            "name": f"{name} Revenue",
+            "marker": {"color": color},
+            "customdata": np.stack([frame[f"T{n}_Projects"], frame[f"T{n}_Demand"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                f"{name} Revenue: $%{{y:.2f}}M<br>"
+                "Projects Started: %{customdata[0]:.1f}<br>"
+                "Projects Demanded: %{customdata[1]:.1f}"
+                "<extra></extra>"
+            ),
+        })
+    data.append({
+        "type": "scatter",
+        "x": periods,
+        "y": _values(unconstrained["TotalRevenue"]),
+        "name": "Unconstrained Revenue",
+        "mode": "lines",
+        "line": _BENCHMARK_LINE,
+        "hovertemplate": f"{x_label} %{{x}}<br>Unconstrained Revenue: $%{{y:.2f}}M<extra></extra>",
+    })
+    data.append({
+        "type": "scatter",
+        "x": periods,
+        "y": _values(frame["OperatingMargin"]),
+        "name": "Operating Margin %",
+        "mode": "lines",
+        "yaxis": "y2",
+        "line": {"width": 3, "color": "#ffffff"},
+        "hovertemplate": f"{x_label} %{{x}}<br>Operating Margin: %{{y:.2f}}%<extra></extra>",
+    })
+    return _figure(
+        data,
+        title=_title("Capacity-Constrained Revenue vs Unconstrained Demand"),
+        xaxis={"title": _title(x_label)},
+        yaxis={"title": _title("Revenue ($M)")},
+        yaxis2={
+            "title": _title("Operating Margin (%)"),
+            "overlaying": "y",
+            "side": "right",
+            "range": [0, 25],
+            "showgrid": False,
+        },
+        barmode="stack",
+        height=480,
+    )
+
+
+def backlog_figure(frame, x_label="Year"):
+    """Backlog per tier (projects waiting to start) with capacity utilization."""
+    periods = _values(frame.index)
+    data = []
+    for n, name, color in ((3, "Tier 3", "#2f5a51"), (2, "Tier 2", "#7f9b90"), (1, "Tier 1", "#b88152")):
+        data.append({
+            "type": "scatter",
+            "x": periods,
+            "y": _values(frame[f"T{n}_Backlog"]),
+            "name": f"{name} Backlog",
+            "mode": "lines",
+            "stackgroup": "backlog",
+            "line": {"width": 0, "color": color},
+            "customdata": np.stack([frame[f"T{n}_Cancelled"]], axis=-1),
+            "hovertemplate": (
+                f"{x_label} %{{x}}<br>"
+                f"{name} Backlog: %{{y:.1f}} projects<br>"
+                "Cancelled This Period: %{customdata[0]:.1f}"
+                "<extra></extra>"
+            ),
+        })
+        utilization = frame[f"T{n}_Utilization"]
+        if utilization.notna().any():
+            data.append({
+                "type": "scatter",
+                "x": periods,
+                "y": _values(utilization),
+                "name": f"{name} Utilization %",
+                "mode": "lines",
+                "yaxis": "y2",
+                "line": {"width": 2, "dash": "dot", "color": color},
+                "hovertemplate": f"{x_label} %{{x}}<br>{name} Utilization: %{{y:.0f}}%<extra></extra>",
+            })
+    return _figure(
+        data,
+        title=_title("Backlog and Capacity Utilization"),
+        xaxis={"title": _title(x_label)},
+        yaxis={"title": _title("Projects Waiting to Start")},
+        yaxis2={
+            "title": _title("Utilization (%)"),
+            "overlaying": "y",
+            "side": "right",
+            "range": [0, 105],
+            "showgrid": False,
+        },
+        height=420,
+    )
+
+
+def compare_figure(comparison, column, title, y_label, current=None, benchmark_op_margin=None):
+    """One line per scenario of ``comparison`` (see compare_scenarios) for ``column``.
+
+    ``current`` names the entry to highlight (the sidebar scenario); with
+    ``benchmark_op_margin`` a dashed benchmark line is added.
+    """
+    data = []
+    others = [name for name in comparison if name != current]
+    for i, name in enumerate(others + ([current] if current in comparison else [])):
+        entry = comparison[name]
+        y = entry["series"][column]
+        is_current = name == current
+        data.append({
+            "type": "scatter",
+            "x": np.arange(1, y.size + 1),
+            "y": y,
+            "name": name,
+            "mode": "lines+markers" if is_current else "lines",
+            "line": {
+                "width": 4 if is_current else 2,
+                "color": "#ffffff" if is_current else _COMPARE_COLORS[i % len(_COMPARE_COLORS)],
+            },
+            "hovertemplate": f"{name}<br>Year %{{x}}<br>{y_label}: %{{y:.2f}}<extra></extra>",
+        })
+
+    layout = {}
+    if benchmark_op_margin is not None:
+        shape, annotation = _hline(benchmark_op_margin, _BENCHMARK_LINE["color"], "Benchmark")
+        layout = {"shapes": [shape], "annotations": [annotation]}
+    return _figure(
+        data,
+        **layout,
+        title=_title(title),
+        xaxis={"title": _title("Year")},
+        yaxis={"title": _title(y_label)},
+        height=600,
+    )
@@ -0,0 +1,2 @@
+# Lets the tests under tests/ import the projection package and the page
+# modules from the repository root without installing anything.
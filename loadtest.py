@@ -0,0 +1,312 @@
+"""Load test for the page: simulated sessions changing sidebar inputs concurrently.
+
+    python loadtest.py --sessions 1,5,10,25 --changes 20
+    python loadtest.py --url ws://localhost:8501 --sessions 10 --think 2 --out load.json
+
+Each simulated session opens the page's websocket the way a browser tab does,
+then repeatedly moves one random slider or number input, presses Apply (one
+rerun per change) and waits ``--think`` seconds. Every level in ``--sessions``
+runs in turn against the same server, so the report shows where latency
+starts to climb. Without ``--url`` the app is started here on a free port and
+its resident memory is sampled from /proc (Linux only).
+
+Reported per level: rerun latency (request sent to script finished) at p50,
+p90 and p99, reruns per second, bytes received per rerun, errors, and the
+server's RSS before, at peak and after, plus the growth per session.
+
+Needs the websockets package (pip install websockets).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+from bench import APP_PATH, environment
+
+DEFAULT_LEVELS = "1,5,10"
+
+# Seconds to wait for a started server to answer its health check.
+STARTUP_TIMEOUT = 60
+
+# RSS sampling interval while a level runs, in seconds.
+RSS_INTERVAL = 0.2
+
+
+def _require_websockets():
+    try:
+        import websockets  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit("The load test needs websockets: pip install websockets") from exc
+
+
+# --------------------------
+# Server
+# --------------------------
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    """Run the app headless on ``port``; returns the process once it is healthy."""
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", str(APP_PATH),
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        cwd=APP_PATH.parent,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"streamlit exited with code {proc.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.terminate()
+    raise SystemExit(f"server did not come up within {STARTUP_TIMEOUT}s")
+
+
+def rss_mb(pid):
+    """Resident memory of ``pid`` in MB, or None where /proc isn't available."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+# --------------------------
+# Simulated session
+# --------------------------
+class Session:
+    """One browser tab: a websocket plus the sidebar form's widget values."""
+
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.inputs = {}  # widget id -> (proto, kind, value)
+        self.submit_id = None
+        self.latencies = []
+        self.bytes = []
+        self.errors = 0
+
+    async def open(self):
+        import websockets
+
+        self.ws = await websockets.connect(f"{self.url}/_stcore/stream", subprotocols=["streamlit"], max_size=None)
+        elements = await self._rerun()
+        for element in elements:
+            kind = element.WhichOneof("type")
+            if kind in ("slider", "number_input"):
+                proto = getattr(element, kind)
+                if proto.form_id and not proto.disabled:
+                    default = proto.default[0] if kind == "slider" else proto.default
+                    self.inputs[proto.id] = (proto, kind, default)
+            elif kind == "button" and element.button.is_form_submitter:
+                self.submit_id = element.button.id
+        if self.submit_id is None or not self.inputs:
+            raise RuntimeError("no sidebar form found on the page")
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _states(self, submit):
+        from streamlit.proto.WidgetStates_pb2 import WidgetStates
+
+        states = WidgetStates()
+        for widget_id, (proto, kind, value) in self.inputs.items():
+            state = states.widgets.add(id=widget_id)
+            if kind == "slider":
+                state.double_array_value.data.append(value)
+            elif proto.data_type == proto.INT:
+                state.int_value = int(value)
+            else:
+                state.double_value = value
+        if submit:
+            states.widgets.add(id=self.submit_id, trigger_value=True)
+        return states
+
+    async def _rerun(self, submit=False):
+        """Send one rerun; returns the new elements, recording latency and bytes."""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        if submit:
+            msg.rerun_script.widget_states.CopyFrom(self._states(submit))
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received = 0
+        elements = []
+        while True:
+            raw = await self.ws.recv()
+            received += len(raw)
+            fwd = ForwardMsg()
+            fwd.ParseFromString(raw)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                elements.append(element)
+                if element.WhichOneof("type") == "exception":
+                    self.errors += 1
+            elif kind == "script_finished":
+                if fwd.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    self.errors += 1
+                break
+        self.latencies.append(time.perf_counter() - start)
+        self.bytes.append(received)
+        return elements
+
+    def _move_one_input(self):
+        widget_id = self.rng.choice(sorted(self.inputs))
+        proto, kind, _ = self.inputs[widget_id]
+        steps = round((proto.max - proto.min) / proto.step) if proto.step else 0
+        value = proto.min + self.rng.randint(0, max(steps, 0)) * (proto.step or 0)
+        self.inputs[widget_id] = (proto, kind, min(max(value, proto.min), proto.max))
+
+    async def change_inputs(self, changes, think):
+        for _ in range(changes):
+            self._move_one_input()
+            await self._rerun(submit=True)
+            if think:
+                await asyncio.sleep(self.rng.uniform(0.5, 1.5) * think)
+
+
+# --------------------------
+# Levels
+# --------------------------
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def run_level(url, n_sessions, changes, think, seed, pid=None):
+    """Open ``n_sessions`` sessions, let each make ``changes`` changes at once, and summarize."""
+    rss = {"before": rss_mb(pid) if pid else None, "samples": []}
+    stop = asyncio.Event()
+
+    async def sample():
+        while not stop.is_set():
+            value = rss_mb(pid)
+            if value is not None:
+                rss["samples"].append(value)
+            await asyncio.sleep(RSS_INTERVAL)
+
+    sampler = asyncio.create_task(sample()) if pid else None
+    sessions = [Session(url, random.Random(seed * 1000 + i)) for i in range(n_sessions)]
+    try:
+        await asyncio.gather(*(s.open() for s in sessions))
+        # Opening runs the page once per session; time only the changes.
+        for s in sessions:
+            s.latencies.clear()
+            s.bytes.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(s.change_inputs(changes, think) for s in sessions))
+        elapsed = time.perf_counter() - start
+    finally:
+        stop.set()
+        if sampler is not None:
+            await sampler
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+    latencies = [x for s in sessions for x in s.latencies]
+    sent = [x for s in sessions for x in s.bytes]
+    after = rss_mb(pid) if pid else None
+    summary = {
+        "sessions": n_sessions,
+        "reruns": len(latencies),
+        "errors": sum(s.errors for s in sessions),
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p90_ms": _percentile(latencies, 90) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000,
+        "reruns_per_s": len(latencies) / elapsed,
+        "kb_per_rerun": statistics.mean(sent) / 1024,
+        "rss_before_mb": rss["before"],
+        "rss_peak_mb": max(rss["samples"], default=None),
+        "rss_after_mb": after,
+    }
+    if rss["before"] is not None and after is not None:
+        summary["rss_per_session_mb"] = (after - rss["before"]) / n_sessions
+    return summary
+
+
+def _fmt_row(row):
+    rss = (
+        f"rss {row['rss_before_mb']:.0f} -> peak {row['rss_peak_mb']:.0f} MB"
+        if row.get("rss_peak_mb") is not None else "rss n/a"
+    )
+    return (
+        f"{row['sessions']:>4} sessions  p50 {row['p50_ms']:7.0f} ms  p90 {row['p90_ms']:7.0f} ms  "
+        f"p99 {row['p99_ms']:7.0f} ms  {row['reruns_per_s']:6.1f} reruns/s  "
+        f"{row['kb_per_rerun']:6.1f} kB/rerun  {rss}  errors {row['errors']}"
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python loadtest.py", description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="running server, e.g. ws://localhost:8501 (default: start one here)")
+    parser.add_argument(
+        "--sessions", default=DEFAULT_LEVELS, help="comma-separated concurrent session counts (default: %(default)s)"
+    )
+    parser.add_argument("--changes", type=int, default=10, help="input changes per session (default: %(default)s)")
+    parser.add_argument("--think", type=float, default=0.5, help="mean seconds between changes (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the report as JSON")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    _require_websockets()
+    levels = [int(x) for x in args.sessions.split(",")]
+    if min(levels) < 1 or args.changes < 1:
+        raise SystemExit("--sessions and --changes must be at least 1")
+
+    proc = None
+    url = args.url
+    if url is None:
+        port = _free_port()
+        proc = start_server(port)
+        url = f"ws://localhost:{port}"
+    try:
+        rows = []
+        for level in levels:
+            row = asyncio.run(run_level(url, level, args.changes, args.think, args.seed, proc.pid if proc else None))
+            rows.append(row)
+            print(_fmt_row(row))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    if args.out:
+        report = {"environment": environment(), "settings": vars(args), "levels": rows}
+        Path(args.out).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
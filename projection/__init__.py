@@ -0,0 +1,42 @@
+"""Projection math for the Bensonwood revenue & product mix forecast.
+
+The package imports NumPy only: pandas is loaded on first use by the
+DataFrame helpers and the batch CLI, and nothing here touches Streamlit or
+Plotly, so tests, batch jobs and worker processes start in roughly the time
+NumPy takes to import (~60 ms) instead of paying for the page's UI stack.
+``python -m projection.importtime`` measures this and fails if a heavy
+module sneaks in.
+"""
+
+from projection.compact import CompactResult, project_portfolio_compact
+from projection.engine import (
+    GROWTH_KEYS,
+    INPUT_BOUNDS,
+    INPUT_KEYS,
+    INTEGER_KEYS,
+    PORTFOLIO_COLUMNS,
+    ModelGraph,
+    portfolio_with_cumulative,
+    project_portfolio,
+    project_portfolio_batch,
+)
+from projection.solver import REQUIRED_COLUMNS, required_scale_to_hit_benchmark
+from projection.tiers import TierTable, project_tiers
+
+__all__ = [
+    "CompactResult",
+    "GROWTH_KEYS",
+    "INPUT_BOUNDS",
+    "INPUT_KEYS",
+    "INTEGER_KEYS",
+    "ModelGraph",
+    "PORTFOLIO_COLUMNS",
+    "REQUIRED_COLUMNS",
+    "TierTable",
+    "portfolio_with_cumulative",
+    "project_portfolio",
+    "project_portfolio_batch",
+    "project_portfolio_compact",
+    "project_tiers",
+    "required_scale_to_hit_benchmark",
+]
@@ -0,0 +1,191 @@
+import numbers
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from projection.engine import GROWTH_KEYS, INPUT_KEYS
+
+_BASELINE_POSITIONS = tuple(i for i, k in enumerate(INPUT_KEYS) if k not in GROWTH_KEYS)
+
+# Widget values arrive as int or float and may carry float noise from
+# number_input steps (7.5 vs 7.499999999); rounding makes equal inputs share a key.
+_KEY_DECIMALS = 9
+
+_MISSING = object()
+
+_MB = 1024 * 1024
+
+
+def nbytes_of(value):
+    """Approximate memory held by a cached value.
+
+    Counts array, frame and bytes payloads, recursing into dicts, lists and
+    tuples; a Plotly figure is counted by its trace data (the shared theme
+    layout is left out). Anything else is counted by ``sys.getsizeof``. Good
+    enough to budget caches whose entries differ in size by orders of magnitude.
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    to_plotly_json = getattr(value, "to_plotly_json", None)
+    if callable(to_plotly_json):  # go.Figure
+        return nbytes_of(to_plotly_json()["data"])
+    memory_usage = getattr(value, "memory_usage", None)
+    if callable(memory_usage):  # DataFrame or Series
+        usage = memory_usage(index=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, numbers.Integral):
+        return int(nbytes)
+    if isinstance(value, Mapping):
+        return sum(nbytes_of(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes_of(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """Thread-safe LRU cache with hit/miss/eviction counters.
+
+    Instances are meant to live at module level so every Streamlit session in
+    the server process shares them. Cached values are handed out as-is, so
+    callers must treat them as read-only.
+
+    ``maxbytes`` additionally bounds the summed ``nbytes_of`` of the entries,
+    so memory stays flat however many sessions fill the cache; a value larger
+    than the whole budget is returned but not kept.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = int(maxsize)
+        self.maxbytes = None if maxbytes is None else int(maxbytes)
+        self._data = OrderedDict()
+        self._sizes = {}
+        self.nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` (counted as a hit or miss)."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = 0 if self.maxbytes is None else nbytes_of(value)
+        with self._lock:
+            self.nbytes -= self._sizes.pop(key, 0)
+            self._data.pop(key, None)
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes):
+                old, _ = self._data.popitem(last=False)
+                self.nbytes -= self._sizes.pop(old)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Compute outside the lock so a slow miss doesn't block other
+            # sessions; two sessions racing on the same key both compute it.
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "nbytes": self.nbytes,
+                "maxbytes": self.maxbytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def scenario_key(years_, inputs):
+    """Normalized cache key for a full parameter set (INPUT_KEYS order)."""
+    return (int(years_),) + tuple(round(float(x), _KEY_DECIMALS) for x in inputs)
+
+
+def baseline_key(years_, inputs):
+    """Cache key for the zero-growth baseline; growth rates are left out."""
+    key = scenario_key(years_, inputs)
+    return (key[0],) + tuple(key[1 + i] for i in _BASELINE_POSITIONS)
+
+
+# Every shared cache has a byte budget as well as an entry cap, so memory stays
+# bounded however many sessions fill them. Annual frames are a few kB.
+SCENARIO_CACHE = LRUCache(maxsize=256, maxbytes=8 * _MB)
+BASELINE_CACHE = LRUCache(maxsize=64, maxbytes=2 * _MB)
+# Scenario frame plus the required-scale columns, keyed by scenario + benchmark.
+REQUIRED_CACHE = LRUCache(maxsize=256, maxbytes=8 * _MB)
+# Sub-annual frames are 12x the rows of the annual ones.
+PERIOD_CACHE = LRUCache(maxsize=32, maxbytes=16 * _MB)
+# Capacity runs carry the period frame plus four series per tier.
+CAPACITY_CACHE = LRUCache(maxsize=32, maxbytes=16 * _MB)
+# Monte Carlo summaries are small but expensive; keep only recent settings.
+MONTE_CARLO_CACHE = LRUCache(maxsize=16, maxbytes=2 * _MB)
+# A 201 x 201 heatmap keeps six metric grids (~2 MB), a 51 x 51 one ~130 kB;
+# budget bytes rather than entries, so many small grids fit where few large ones do.
+SWEEP_CACHE = LRUCache(maxsize=64, maxbytes=32 * _MB)
+OPTIMIZER_CACHE = LRUCache(maxsize=16, maxbytes=2 * _MB)
+# Side-by-side runs of the sidebar scenario plus a session's saved scenarios.
+COMPARE_CACHE = LRUCache(maxsize=32, maxbytes=4 * _MB)
+# Encoded download files, keyed by the result they hold plus the format:
+# a few kB for the tables, a few MB for a heatmap grid.
+EXPORT_CACHE = LRUCache(maxsize=64, maxbytes=32 * _MB)
+# Serialized Plotly figures (JSON strings), keyed by builder name plus the key
+# of the result they draw; revisiting a tab or setting skips building and
+# encoding the figure. ~12 kB for a line chart, ~740 kB for a 201 x 201 heatmap.
+FIGURE_CACHE = LRUCache(maxsize=128, maxbytes=32 * _MB)
+# Each session's last scenario and baseline as ModelGraphs, keyed by (session
+# id, name), so its next change recomputes only what the changed inputs feed.
+# ~3 kB per graph; an evicted session just rebuilds its graphs on next miss.
+GRAPH_CACHE = LRUCache(maxsize=1024, maxbytes=4 * _MB)
+
+
+def cache_stats():
+    return {
+        "scenario": SCENARIO_CACHE.stats(),
+        "baseline": BASELINE_CACHE.stats(),
+        "required": REQUIRED_CACHE.stats(),
+        "period": PERIOD_CACHE.stats(),
+        "capacity": CAPACITY_CACHE.stats(),
+        "monte_carlo": MONTE_CARLO_CACHE.stats(),
+        "sweep": SWEEP_CACHE.stats(),
+        "optimizer": OPTIMIZER_CACHE.stats(),
+        "compare": COMPARE_CACHE.stats(),
+        "export": EXPORT_CACHE.stats(),
+        "figure": FIGURE_CACHE.stats(),
+        "graph": GRAPH_CACHE.stats(),
+    }
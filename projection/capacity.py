@@ -0,0 +1,108 @@
+import numpy as np
+
+from projection.engine import PORTFOLIO_COLUMNS, _column
+from projection.periods import RESOLUTIONS, TIERS, period_demand, period_financials, period_labels
+
+# Per-tier series reported next to PORTFOLIO_COLUMNS by project_portfolio_capacity.
+CAPACITY_COLUMNS = tuple(
+    f"T{tier[-1]}_{what}" for what in ("Demand", "Backlog", "Cancelled", "Utilization") for tier in TIERS
+)
+
+
+def capacity_from_hours(hours_per_year, hours_per_project):
+    """Projects a year that ``hours_per_year`` of shop or crew time can start."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(np.asarray(hours_per_project) > 0, np.asarray(hours_per_year) / hours_per_project, np.inf)
+
+
+def per_period_decay(annual_decay, periods_per_year):
+    """Per-period cancellation share equivalent to ``annual_decay`` (0-1) a year."""
+    return 1.0 - (1.0 - np.clip(annual_decay, 0.0, 1.0)) ** (1.0 / periods_per_year)
+
+
+def run_backlog(demand, capacity, decay=0.0):
+    """Start projects up to ``capacity`` each period, queueing the rest.
+
+    ``demand`` is ``(..., P)`` new projects per period; ``capacity`` (projects
+    per period, ``np.inf`` for no limit) and ``decay`` (share of the queue
+    cancelled at the start of each period, constant over time) broadcast
+    against it, so per-scenario values are ``(N, 1)`` columns. Each period:
+
+        cancelled = backlog * decay
+        started   = min(backlog - cancelled + demand, capacity)
+        backlog   = backlog - cancelled + demand - started
+
+    The recurrence is path-dependent, so it loops over the P periods, but
+    each step is one vector operation across every scenario; the period
+    axis is moved to the front so each step reads contiguous rows.
+
+    Returns ``(started, backlog, cancelled)``, each shaped like ``demand``;
+    ``backlog`` is the queue at the end of each period.
+    """
+    demand = np.asarray(demand, dtype=float)
+    periods = np.ascontiguousarray(np.moveaxis(demand, -1, 0))
+    capacity = np.ascontiguousarray(np.moveaxis(np.broadcast_to(capacity, demand.shape), -1, 0))
+    decay = np.broadcast_to(decay, demand.shape)[..., 0]
+    keep = 1.0 - decay
+
+    started = np.empty_like(periods)
+    backlog = np.empty_like(periods)
+    cancelled = np.empty_like(periods)
+    queue = np.zeros(demand.shape[:-1])
+    for t in range(periods.shape[0]):
+        np.multiply(queue, decay, out=cancelled[t])
+        queue *= keep
+        queue += periods[t]
+        np.minimum(queue, capacity[t], out=started[t])
+        queue -= started[t]
+        backlog[t] = queue
+    return tuple(np.moveaxis(a, 0, -1) for a in (started, backlog, cancelled))
+
+
+def project_portfolio_capacity(
+    years_, *inputs, capacity=None, decay=0.0, resolution="monthly", curves=None, method="auto"
+):
+    """Period model with per-tier start capacity and a backlog queue.
+
+    Demand is the unconstrained period model's starts (see period_demand).
+    ``capacity`` maps tier ("tier3", "tier2", "tier1") to projects a year it
+    can start, as a scalar or length-N array; missing tiers, None and
+    ``np.inf`` are unlimited. Work that can't start waits in the tier's
+    backlog, of which ``decay`` (0-1, scalar or length-N) is cancelled a year.
+    Revenue and overhead then follow the projects actually started.
+
+    Returns a dict keyed by PORTFOLIO_COLUMNS + CAPACITY_COLUMNS of
+    ``(N, years_ * periods)`` arrays; project columns count starts, and
+    utilization is starts as a % of capacity (NaN when unlimited).
+    """
+    periods_per_year = RESOLUTIONS[resolution]
+    demand = period_demand(years_, inputs, periods_per_year)
+    n = demand["tier3"].shape[0]
+    decay = per_period_decay(_column(decay, n), periods_per_year)
+
+    out = {}
+    starts = {}
+    for tier in TIERS:
+        limit = (capacity or {}).get(tier)
+        limit = np.inf if limit is None else _column(limit, n) / periods_per_year
+        started, backlog, cancelled = run_backlog(demand[tier], limit, decay)
+        starts[tier] = started
+        prefix = f"T{tier[-1]}_"
+        out[prefix + "Demand"] = demand[tier]
+        out[prefix + "Backlog"] = backlog
+        out[prefix + "Cancelled"] = cancelled
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[prefix + "Utilization"] = np.where(np.isfinite(limit), started / limit * 100, np.nan)
+
+    out.update(period_financials(inputs, starts, periods_per_year, curves, method))
+    return {col: out[col] for col in PORTFOLIO_COLUMNS + CAPACITY_COLUMNS}
+
+
+def portfolio_capacity(years_, inputs, capacity=None, decay=0.0, resolution="monthly", curves=None):
+    """Single-scenario project_portfolio_capacity as a DataFrame indexed by period label."""
+    import pandas as pd
+
+    batch = project_portfolio_capacity(
+        years_, *inputs, capacity=capacity, decay=decay, resolution=resolution, curves=curves
+    )
+    return pd.DataFrame({col: values[0] for col, values in batch.items()}, index=period_labels(years_, resolution))
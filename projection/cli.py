@@ -0,0 +1,191 @@
+"""Headless batch runner for scenario files.
+
+    python -m projection scenarios.csv --summary summary.csv --series series.parquet
+
+Each input row is one parameter set with the same keys as PRESETS (a
+``scenario`` column, if present, is carried through as a label); ``years``
+and the project counts must be whole numbers. Rows are
+read, evaluated and written ``--chunk-size`` at a time, so memory stays flat
+however long the file is.
+"""
+
+import argparse
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from projection.engine import GROWTH_KEYS, INPUT_KEYS, INTEGER_KEYS, PORTFOLIO_COLUMNS, project_portfolio_batch
+from projection.export import FORMATS, ChunkWriter, _require_pyarrow, detect_format
+from projection.metrics import summarize_batch
+from projection.presets import PRESETS, SCENARIO_KEYS
+from projection.solver import REQUIRED_COLUMNS, required_scale_to_hit_benchmark
+
+SERIES_COLUMNS = PORTFOLIO_COLUMNS + ("CumulativeOperatingProfit",) + REQUIRED_COLUMNS
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def read_scenarios(path, chunk_size, fmt=None):
+    """Yield DataFrames of at most ``chunk_size`` scenario rows."""
+    import pandas as pd
+
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"can't read {fmt} scenario files; use one of {FORMATS}")
+    source = sys.stdin if path == "-" else path
+    if fmt == "csv":
+        yield from pd.read_csv(source, chunksize=chunk_size)
+    elif fmt == "jsonl":
+        yield from pd.read_json(source, lines=True, chunksize=chunk_size)
+    else:
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+
+
+def run_chunk(chunk, first_id, defaults=None, series_columns=()):
+    """Evaluate one chunk of scenario rows.
+
+    Columns missing from ``chunk`` fall back to ``defaults`` (a PRESETS
+    entry). Returns ``(summary, series)`` DataFrames; ``series`` is long
+    format (one row per scenario-year, within each row's own horizon) and
+    None when no ``series_columns`` are requested.
+    """
+    import pandas as pd
+
+    n = len(chunk)
+    values = {}
+    for k in SCENARIO_KEYS:
+        if k in chunk:
+            values[k] = chunk[k].to_numpy(dtype=float)
+        elif defaults is not None:
+            values[k] = np.full(n, float(defaults[k]))
+        else:
+            raise ValueError(f"scenario file has no {k!r} column (pass --defaults to fill it)")
+        if np.isnan(values[k]).any():
+            bad = first_id + int(np.flatnonzero(np.isnan(values[k]))[0])
+            raise ValueError(f"scenario {bad}: {k!r} is empty")
+        if k == "years" or k in INTEGER_KEYS:
+            fractional = np.flatnonzero(values[k] != np.round(values[k]))
+            if fractional.size:
+                bad = first_id + int(fractional[0])
+                raise ValueError(f"scenario {bad}: {k!r} must be a whole number, got {values[k][fractional[0]]:g}")
+
+    horizons = values["years"].astype(np.int64)
+    if (horizons < 1).any():
+        raise ValueError(f"scenario {first_id + int(np.argmin(horizons))}: years must be at least 1")
+    years_ = int(horizons.max())
+    scenario = project_portfolio_batch(years_, *[values[k] for k in INPUT_KEYS])
+    baseline = project_portfolio_batch(years_, *[0 if k in GROWTH_KEYS else values[k] for k in INPUT_KEYS])
+
+    ids = np.arange(first_id, first_id + n)
+    labels = {"scenario": chunk["scenario"].to_numpy()} if "scenario" in chunk else {}
+    summary = pd.DataFrame({
+        "scenario_id": ids,
+        **labels,
+        **summarize_batch(scenario, baseline, values["benchmark_op_margin"], horizons),
+    })
+    if not series_columns:
+        return summary, None
+
+    scenario["CumulativeOperatingProfit"] = np.cumsum(scenario["OperatingProfit"], axis=1)
+    if any(c in REQUIRED_COLUMNS for c in series_columns):
+        scenario.update(required_scale_to_hit_benchmark(
+            scenario, values["benchmark_op_margin"], values["voh_t3"], values["voh_t2"], values["voh_t1"]
+        ))
+    in_horizon = np.arange(years_) < horizons[:, None]
+    rows, cols = np.nonzero(in_horizon)
+    series = pd.DataFrame({
+        "scenario_id": ids[rows],
+        "Year": cols + 1,
+        **{c: scenario[c][in_horizon] for c in series_columns},
+    })
+    return summary, series
+
+
+def iter_results(chunks, defaults=None, series_columns=(), workers=1):
+    """Yield ``(summary, series)`` per chunk, in input order.
+
+    With ``workers > 1`` chunks are evaluated in a process pool; at most
+    ``2 * workers`` chunks are in flight so memory stays bounded.
+    """
+    first_id = 0
+    if workers <= 1:
+        for chunk in chunks:
+            yield run_chunk(chunk, first_id, defaults, series_columns)
+            first_id += len(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(run_chunk, chunk, first_id, defaults, series_columns))
+            first_id += len(chunk)
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m projection",
+        description="Run the tier model over a file of scenarios (same keys as the app's presets).",
+    )
+    parser.add_argument("input", help="scenario file (.csv, .jsonl or .parquet; '-' reads CSV from stdin)")
+    parser.add_argument("--format", choices=FORMATS, help="input format, if the extension doesn't say")
+    parser.add_argument(
+        "--summary", default="-",
+        help="summary metrics output, one row per scenario; .csv, .jsonl, .parquet or .xlsx (default: stdout)",
+    )
+    parser.add_argument("--series", help="per-year series output, one row per scenario-year")
+    parser.add_argument(
+        "--columns",
+        default="TotalRevenue,OperatingProfit,OperatingMargin,CumulativeOperatingProfit",
+        help="comma-separated series columns, or 'all' (default: %(default)s)",
+    )
+    parser.add_argument("--defaults", choices=sorted(PRESETS), help="preset that fills columns missing from the file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: %(default)s)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.chunk_size < 1:
+        raise SystemExit("--chunk-size must be at least 1")
+
+    series_columns = ()
+    if args.series:
+        series_columns = SERIES_COLUMNS if args.columns == "all" else tuple(c.strip() for c in args.columns.split(","))
+        unknown = [c for c in series_columns if c not in SERIES_COLUMNS]
+        if unknown:
+            raise SystemExit(f"unknown series columns: {', '.join(unknown)}")
+
+    defaults = PRESETS[args.defaults] if args.defaults else None
+    chunks = read_scenarios(args.input, args.chunk_size, args.format)
+    summary_out = ChunkWriter(args.summary)
+    series_out = ChunkWriter(args.series) if args.series else None
+    total = 0
+    try:
+        for summary, series in iter_results(chunks, defaults, series_columns, args.workers):
+            summary_out.write(summary)
+            if series_out is not None:
+                series_out.write(series)
+            total += len(summary)
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}") from None
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head); not an error.
+        sys.stdout = None
+        return 0
+    finally:
+        summary_out.close()
+        if series_out is not None:
+            series_out.close()
+    print(f"{total} scenarios evaluated", file=sys.stderr)
+    return 0
@@ -0,0 +1,196 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from projection.engine import PORTFOLIO_COLUMNS, _column, _grown_projects
+
+# Per-scenario inputs kept as (N, 1) columns; every money series is derived
+# from these and the project counts when it is read.
+_PARAMS = (
+    "t3_rev_m", "t3_gm_pct", "t2_price_m", "t2_gm_pct", "t1_price_m", "t1_gm_pct",
+    "fixed_oh_m", "voh_t3_k", "voh_t2_k", "voh_t1_k",
+)
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def _counts(values):
+    """int32 project counts, or int64 if they would overflow it."""
+    return values.astype(np.int32 if values.max(initial=0) <= _INT32_MAX else np.int64)
+
+
+class CompactResult(Mapping):
+    """Batch model output holding only project counts and per-scenario inputs.
+
+    Behaves like the dict returned by ``project_portfolio_batch`` (keyed by
+    PORTFOLIO_COLUMNS, ``(N, years)`` values), but stores just the Tier 1/2
+    project counts as int32 (Tier 3 is one count per scenario) plus the
+    inputs as ``(N, 1)`` columns: 8 bytes per scenario-year instead of 176.
+    Every other column is derived when it is read, and nothing is kept, so
+    read each column once per use. Constant-per-year columns (Tier 3
+    revenue, fixed overhead, Tier 3 projects) come back as read-only
+    broadcast views.
+
+    With ``dtype=np.float64`` every column matches ``project_portfolio_batch``
+    exactly. ``dtype=np.float32`` halves the size of what is derived, with
+    these bounds against float64 (float32 rounds to 6e-8 and no column
+    chains more than five operations):
+
+    - revenue, gross profit and overhead columns: relative error below 1e-6;
+    - shares: within 1e-4 points;
+    - OperatingProfit (a difference of two sums): absolute error below
+      ``1e-6 * (GrossProfit + TotalOverhead)``, so OperatingMargin is within
+      ``1e-6 * (GrossProfit + TotalOverhead) / TotalRevenue * 100`` points
+      (under 2e-3 points anywhere inside INPUT_BOUNDS);
+    - project counts: exact.
+    """
+
+    def __init__(self, t3_projects, t2_projects, t1_projects, params, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.shape = t2_projects.shape
+        self._t3 = t3_projects
+        self._t2 = t2_projects
+        self._t1 = t1_projects
+        self._params = {k: np.asarray(v, dtype=self.dtype) for k, v in params.items()}
+
+    def __len__(self):
+        return len(PORTFOLIO_COLUMNS)
+
+    def __iter__(self):
+        return iter(PORTFOLIO_COLUMNS)
+
+    def __getitem__(self, col):
+        if col not in _DERIVED:
+            raise KeyError(col)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return _DERIVED[col](self)
+
+    @property
+    def nbytes(self):
+        """Bytes actually held (counts and inputs)."""
+        return self._t3.nbytes + self._t2.nbytes + self._t1.nbytes + sum(v.nbytes for v in self._params.values())
+
+    def _money(self, counts, param):
+        return counts.astype(self.dtype) * self._params[param]
+
+    def _wide(self, column):
+        return np.broadcast_to(column, self.shape)
+
+    def to_dict(self, columns=PORTFOLIO_COLUMNS):
+        """Materialize ``columns`` as a plain dict of arrays."""
+        return {col: self[col] for col in columns}
+
+    def to_frame(self, row=0, columns=PORTFOLIO_COLUMNS):
+        """One scenario as a DataFrame indexed by Year, for display."""
+        import pandas as pd
+
+        return pd.DataFrame({col: self[col][row] for col in columns}, index=range(1, self.shape[1] + 1))
+
+
+def _t3_revenue(r):
+    return r._wide(r._params["t3_rev_m"])
+
+
+def _t2_revenue(r):
+    return r._money(r._t2, "t2_price_m")
+
+
+def _t1_revenue(r):
+    return r._money(r._t1, "t1_price_m")
+
+
+def _total_revenue(r):
+    return _t1_revenue(r) + _t2_revenue(r) + _t3_revenue(r)
+
+
+def _t3_gp(r):
+    return _t3_revenue(r) * (r._params["t3_gm_pct"] / 100)
+
+
+def _t2_gp(r):
+    return _t2_revenue(r) * (r._params["t2_gm_pct"] / 100)
+
+
+def _t1_gp(r):
+    return _t1_revenue(r) * (r._params["t1_gm_pct"] / 100)
+
+
+def _gross_profit(r):
+    return _t1_gp(r) + _t2_gp(r) + _t3_gp(r)
+
+
+def _fixed_overhead(r):
+    return r._wide(r._params["fixed_oh_m"])
+
+
+def _var_overhead(r):
+    p = r._params
+    return (
+        r._wide(r._t3).astype(r.dtype) * (p["voh_t3_k"] / 1000.0)
+        + r._t2.astype(r.dtype) * (p["voh_t2_k"] / 1000.0)
+        + r._t1.astype(r.dtype) * (p["voh_t1_k"] / 1000.0)
+    )
+
+
+def _total_overhead(r):
+    return _fixed_overhead(r) + _var_overhead(r)
+
+
+def _total_projects(r):
+    return r._t1 + r._t2 + r._t3
+
+
+def _operating_profit(r):
+    return _gross_profit(r) - _total_overhead(r)
+
+
+def _per_total(numerator, denominator, scale):
+    return np.where(denominator > 0, (numerator / denominator) * scale, np.nan)
+
+
+_DERIVED = {
+    "T3_Projects": lambda r: r._wide(r._t3),
+    "T2_Projects": lambda r: r._t2,
+    "T1_Projects": lambda r: r._t1,
+    "TotalProjects": _total_projects,
+    "T3_Revenue": _t3_revenue,
+    "T2_Revenue": _t2_revenue,
+    "T1_Revenue": _t1_revenue,
+    "TotalRevenue": _total_revenue,
+    "T3_Share": lambda r: (_t3_revenue(r) / _total_revenue(r)) * 100,
+    "T2_Share": lambda r: (_t2_revenue(r) / _total_revenue(r)) * 100,
+    "T1_Share": lambda r: (_t1_revenue(r) / _total_revenue(r)) * 100,
+    "T3_GrossProfit": _t3_gp,
+    "T2_GrossProfit": _t2_gp,
+    "T1_GrossProfit": _t1_gp,
+    "GrossProfit": _gross_profit,
+    "FixedOverhead": _fixed_overhead,
+    "VarOverhead": _var_overhead,
+    "TotalOverhead": _total_overhead,
+    "OperatingProfit": _operating_profit,
+    "OperatingMargin": lambda r: _per_total(_operating_profit(r), _total_revenue(r), 100),
+    "ProfitPerProject_k": lambda r: _per_total(_operating_profit(r), _total_projects(r).astype(r.dtype), 1000),
+    "OverheadPerProject_k": lambda r: _per_total(_total_overhead(r), _total_projects(r).astype(r.dtype), 1000),
+}
+
+
+def project_portfolio_compact(years_, *inputs, dtype=np.float64):
+    """``project_portfolio_batch`` as a CompactResult (same 15 positional inputs)."""
+    n = max(np.size(x) for x in inputs)
+    (
+        t3_rev_m, t3_gm_pct, t3_projects_fixed,
+        t2_price_m, t2_gm_pct, t2_projects_start, t2_growth_pct,
+        t1_price_m, t1_gm_pct, t1_projects_start, t1_growth_pct,
+        fixed_oh_m, voh_t3_k, voh_t2_k, voh_t1_k,
+    ) = (_column(x, n) for x in inputs)
+    t = np.arange(int(years_))
+    return CompactResult(
+        _counts(t3_projects_fixed),
+        _counts(_grown_projects(t2_projects_start, t2_growth_pct, t, np.float64)),
+        _counts(_grown_projects(t1_projects_start, t1_growth_pct, t, np.float64)),
+        dict(zip(_PARAMS, (
+            t3_rev_m, t3_gm_pct, t2_price_m, t2_gm_pct, t1_price_m, t1_gm_pct,
+            fixed_oh_m, voh_t3_k, voh_t2_k, voh_t1_k,
+        ))),
+        dtype=dtype,
+    )
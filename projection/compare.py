@@ -0,0 +1,96 @@
+import functools
+
+import numpy as np
+
+from projection.cache import scenario_key
+from projection.engine import GROWTH_KEYS, INPUT_KEYS, project_portfolio_batch
+from projection.metrics import summarize_batch
+from projection.presets import PRESETS, SCENARIO_KEYS
+from projection.solver import required_scale_to_hit_benchmark
+
+# Per-year series kept for each compared scenario, trimmed to its own horizon.
+COMPARE_SERIES = (
+    "OperatingMargin",
+    "CumulativeOperatingProfit",
+    "CumulativeAdvantage",
+    "RequiredProductRevenueAtBenchmark",
+)
+
+
+def compare_scenarios(scenarios):
+    """Evaluate named parameter sets side by side in one batched model call.
+
+    ``scenarios`` maps a name to a dict with every SCENARIO_KEYS entry (a
+    PRESETS value, say). Horizons and benchmarks may differ: the batch runs
+    at the longest horizon and each row is cut back to its own.
+
+    Returns ``{name: {"years", "benchmark", "series", "summary"}}`` in input
+    order; ``series`` maps COMPARE_SERIES to ``(years,)`` arrays and
+    ``summary`` maps SUMMARY_METRICS to floats.
+    """
+    names = list(scenarios)
+    if not names:
+        return {}
+    values = {k: np.array([float(scenarios[name][k]) for name in names]) for k in SCENARIO_KEYS}
+    horizons = values["years"].astype(np.int64)
+    bm = values["benchmark_op_margin"]
+    years_ = int(horizons.max())
+
+    scenario = project_portfolio_batch(years_, *[values[k] for k in INPUT_KEYS])
+    baseline = project_portfolio_batch(years_, *[0 if k in GROWTH_KEYS else values[k] for k in INPUT_KEYS])
+    summary = summarize_batch(scenario, baseline, bm, horizons)
+
+    cumulative = np.cumsum(scenario["OperatingProfit"], axis=1)
+    required = required_scale_to_hit_benchmark(scenario, bm, values["voh_t3"], values["voh_t2"], values["voh_t1"])
+    series = {
+        "OperatingMargin": scenario["OperatingMargin"],
+        "CumulativeOperatingProfit": cumulative,
+        "CumulativeAdvantage": cumulative - np.cumsum(baseline["OperatingProfit"], axis=1),
+        "RequiredProductRevenueAtBenchmark": required["RequiredProductRevenueAtBenchmark"],
+    }
+    return {
+        name: {
+            "years": int(horizons[i]),
+            "benchmark": float(bm[i]),
+            "series": {col: series[col][i, :horizons[i]] for col in COMPARE_SERIES},
+            "summary": {metric: float(v[i]) for metric, v in summary.items()},
+        }
+        for i, name in enumerate(names)
+    }
+
+
+def stored_comparison(loaded):
+    """compare_scenarios-shaped entries from ScenarioStore.load output (no model run)."""
+    return {
+        name: {
+            "years": int(entry["params"]["years"]),
+            "benchmark": float(entry["params"]["benchmark_op_margin"]),
+            "series": {
+                "OperatingMargin": entry["series"]["OperatingMargin"],
+                "CumulativeOperatingProfit": entry["series"]["CumulativeOperatingProfit"],
+                "CumulativeAdvantage": (
+                    entry["series"]["CumulativeOperatingProfit"] - entry["series"]["BaselineCumulativeOperatingProfit"]
+                ),
+                "RequiredProductRevenueAtBenchmark": entry["series"]["RequiredProductRevenueAtBenchmark"],
+            },
+            "summary": entry["summary"],
+        }
+        for name, entry in loaded.items()
+    }
+
+
+def compare_key(scenarios):
+    """Cache key for compare_scenarios over ``scenarios`` (names and values)."""
+    return tuple(
+        (name,) + scenario_key(s["years"], [s[k] for k in SCENARIO_KEYS[1:]]) for name, s in scenarios.items()
+    )
+
+
+@functools.cache
+def preset_comparison():
+    """compare_scenarios over PRESETS, computed once per process.
+
+    Presets never change while the server runs, so every session shares this
+    one result; treat it as read-only.
+    """
+    return compare_scenarios(PRESETS)
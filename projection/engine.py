@@ -0,0 +1,343 @@
+import numpy as np
+
+# Sidebar / PRESETS keys, in the positional order taken by project_portfolio
+# (after the horizon).
+INPUT_KEYS = (
+    "tier3_revenue",
+    "tier3_gm",
+    "tier3_projects",
+    "tier2_price",
+    "tier2_gm",
+    "tier2_projects0",
+    "tier2_growth",
+    "tier1_price",
+    "tier1_gm",
+    "tier1_projects0",
+    "tier1_growth",
+    "fixed_overhead",
+    "voh_t3",
+    "voh_t2",
+    "voh_t1",
+)
+
+# Inputs that the zero-growth baseline runs at 0.
+GROWTH_KEYS = ("tier2_growth", "tier1_growth")
+
+# Inputs that are whole numbers in the sidebar.
+INTEGER_KEYS = ("tier3_projects", "tier2_projects0", "tier1_projects0")
+
+# Sidebar widget limits for the horizon and every model input; sweeps and
+# searches stay inside these by default.
+INPUT_BOUNDS = {
+    "years": (5, 15),
+    "tier3_revenue": (1.0, 200.0),
+    "tier3_gm": (10, 40),
+    "tier3_projects": (1, 200),
+    "tier2_price": (0.10, 10.00),
+    "tier2_gm": (5, 35),
+    "tier2_projects0": (0, 500),
+    "tier2_growth": (0, 40),
+    "tier1_price": (0.05, 10.00),
+    "tier1_gm": (1, 30),
+    "tier1_projects0": (0, 500),
+    "tier1_growth": (0, 60),
+    "fixed_overhead": (0.0, 50.0),
+    "voh_t3": (0.0, 500.0),
+    "voh_t2": (0.0, 500.0),
+    "voh_t1": (0.0, 500.0),
+}
+
+# Derived series returned by the engine, in the column order of the
+# single-scenario DataFrame.
+PORTFOLIO_COLUMNS = (
+    "T3_Projects",
+    "T2_Projects",
+    "T1_Projects",
+    "TotalProjects",
+    "T3_Revenue",
+    "T2_Revenue",
+    "T1_Revenue",
+    "TotalRevenue",
+    "T3_Share",
+    "T2_Share",
+    "T1_Share",
+    "T3_GrossProfit",
+    "T2_GrossProfit",
+    "T1_GrossProfit",
+    "GrossProfit",
+    "FixedOverhead",
+    "VarOverhead",
+    "TotalOverhead",
+    "OperatingProfit",
+    "OperatingMargin",
+    "ProfitPerProject_k",
+    "OverheadPerProject_k",
+)
+
+
+def _column(x, n):
+    """Broadcast a scalar or 1-D input to a float (n, 1) column."""
+    a = np.asarray(x, dtype=float)
+    if a.ndim > 1:
+        raise ValueError(f"expected a scalar or 1-D array, got shape {a.shape}")
+    return np.broadcast_to(a.reshape(-1), (n,)).reshape(n, 1)
+
+
+def _grown_projects(start, growth_pct, t, dtype=np.int64):
+    """Whole-project counts compounding from ``start`` at ``growth_pct`` a year."""
+    return np.round(start * ((1 + growth_pct / 100) ** t)).astype(dtype)
+
+
+def _wide(column, shape):
+    return np.ascontiguousarray(np.broadcast_to(column, shape))
+
+
+def _sum3(a, b, c):
+    return a + b + c
+
+
+def _share(part, total):
+    return (part / total) * 100
+
+
+def _gross_profit(revenue, gm_pct):
+    return revenue * (gm_pct / 100)
+
+
+def _var_overhead(t3_projects, t2_projects, t1_projects, voh_t3_k, voh_t2_k, voh_t1_k):
+    return t3_projects * (voh_t3_k / 1000.0) + t2_projects * (voh_t2_k / 1000.0) + t1_projects * (voh_t1_k / 1000.0)
+
+
+def _per_total(numerator, denominator, scale):
+    return np.where(denominator > 0, (numerator / denominator) * scale, np.nan)
+
+
+# The tier model as a graph: node -> (what it is computed from, how).
+# Dependencies are INPUT_KEYS entries as (N, 1) columns, "years", "n" (the
+# batch size) or other nodes. Beyond PORTFOLIO_COLUMNS, "periods" and
+# "shape" are internal and the last two nodes are the frame's extra columns.
+MODEL_NODES = {
+    "periods": (("years",), np.arange),
+    "shape": (("n", "years"), lambda n, years: (n, years)),
+    # Projects
+    "T3_Projects": (("tier3_projects", "shape"), lambda count, shape: _wide(count.astype(np.int64), shape)),
+    "T2_Projects": (("tier2_projects0", "tier2_growth", "periods"), _grown_projects),
+    "T1_Projects": (("tier1_projects0", "tier1_growth", "periods"), _grown_projects),
+    "TotalProjects": (("T1_Projects", "T2_Projects", "T3_Projects"), _sum3),
+    # Revenue
+    "T3_Revenue": (("tier3_revenue", "shape"), _wide),
+    "T2_Revenue": (("T2_Projects", "tier2_price"), np.multiply),
+    "T1_Revenue": (("T1_Projects", "tier1_price"), np.multiply),
+    "TotalRevenue": (("T1_Revenue", "T2_Revenue", "T3_Revenue"), _sum3),
+    # Mix (revenue share)
+    "T3_Share": (("T3_Revenue", "TotalRevenue"), _share),
+    "T2_Share": (("T2_Revenue", "TotalRevenue"), _share),
+    "T1_Share": (("T1_Revenue", "TotalRevenue"), _share),
+    # Gross profit
+    "T3_GrossProfit": (("T3_Revenue", "tier3_gm"), _gross_profit),
+    "T2_GrossProfit": (("T2_Revenue", "tier2_gm"), _gross_profit),
+    "T1_GrossProfit": (("T1_Revenue", "tier1_gm"), _gross_profit),
+    "GrossProfit": (("T1_GrossProfit", "T2_GrossProfit", "T3_GrossProfit"), _sum3),
+    # Overhead
+    "FixedOverhead": (("fixed_overhead", "shape"), _wide),
+    "VarOverhead": (("T3_Projects", "T2_Projects", "T1_Projects", "voh_t3", "voh_t2", "voh_t1"), _var_overhead),
+    "TotalOverhead": (("FixedOverhead", "VarOverhead"), np.add),
+    # Operating profit & margin
+    "OperatingProfit": (("GrossProfit", "TotalOverhead"), np.subtract),
+    "OperatingMargin": (("OperatingProfit", "TotalRevenue"), lambda profit, revenue: _per_total(profit, revenue, 100)),
+    # Efficiency metrics
+    "ProfitPerProject_k": (("OperatingProfit", "TotalProjects"), lambda profit, n: _per_total(profit, n, 1000)),
+    "OverheadPerProject_k": (("TotalOverhead", "TotalProjects"), lambda overhead, n: _per_total(overhead, n, 1000)),
+    # portfolio_with_cumulative's extra columns
+    "CumulativeOperatingProfit": (("OperatingProfit",), lambda profit: np.cumsum(profit, axis=1)),
+    "ProductRevenue": (("T1_Revenue", "T2_Revenue"), np.add),
+}
+
+# Graph inputs: everything a node may depend on that isn't itself a node.
+GRAPH_INPUTS = ("years", "n") + INPUT_KEYS
+
+
+def _downstream(nodes):
+    """For each input and node, every node computed from it, directly or not."""
+    children = {}
+    for name, (deps, _) in nodes.items():
+        for dep in deps:
+            children.setdefault(dep, []).append(name)
+    found = {}
+
+    def visit(name):
+        if name not in found:
+            found[name] = set()
+            for child in children.get(name, ()):
+                found[name] |= {child} | visit(child)
+        return found[name]
+
+    for name in (*GRAPH_INPUTS, *nodes):
+        visit(name)
+    return found
+
+
+_DOWNSTREAM = _downstream(MODEL_NODES)
+
+
+class ModelGraph:
+    """The tier model for a batch of scenarios, recomputed only where inputs change.
+
+    Nodes (MODEL_NODES) are computed when first read and then kept.
+    ``update`` takes new input values and drops just the nodes downstream of
+    the inputs that actually changed, so a new ``voh_t1`` recomputes
+    VarOverhead, TotalOverhead, OperatingProfit and what follows from them,
+    reusing the cached project counts, revenue and gross profit. Values
+    match ``project_portfolio_batch`` exactly; they are shared between
+    reads, so treat them as read-only. ``recomputed`` lists the nodes
+    evaluated since the last update.
+    """
+
+    def __init__(self, years_, inputs):
+        self._raw = {}
+        self._values = {}  # inputs and computed nodes
+        self.recomputed = []
+        self.update(years_, inputs)
+
+    def update(self, years_=None, inputs=None):
+        """Change the horizon and/or some inputs; returns the nodes invalidated."""
+        inputs = inputs or {}
+        unknown = set(inputs) - set(INPUT_KEYS)
+        if unknown:
+            raise ValueError(f"unknown inputs {sorted(unknown)}")
+        raw = {**self._raw, **inputs}
+        missing = [k for k in INPUT_KEYS if k not in raw]
+        if missing:
+            raise ValueError(f"missing inputs {missing}")
+        values = self._values
+        n = max(np.size(raw[k]) for k in INPUT_KEYS)
+        resized = n != values.get("n")
+        new = {"years": int(years_ if years_ is not None else values["years"]), "n": n}
+        for k in INPUT_KEYS:
+            if resized or k in inputs:
+                # Copied, so a caller reusing its array can't change a stored input.
+                new[k] = np.array(_column(raw[k], n))
+
+        stale = set()
+        for k, value in new.items():
+            if k not in values or not np.array_equal(values[k], value):
+                values[k] = value
+                stale |= _DOWNSTREAM[k]
+        for name in stale:
+            values.pop(name, None)
+        self._raw = raw
+        self.recomputed = []
+        return stale
+
+    def __getitem__(self, name):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self._get(name)
+
+    @property
+    def nbytes(self):
+        """Bytes held in stored inputs and computed nodes."""
+        return sum(v.nbytes for v in self._values.values() if isinstance(v, np.ndarray))
+
+    def _get(self, name):
+        values = self._values
+        if name not in values:
+            deps, compute = MODEL_NODES[name]
+            values[name] = compute(*[values[dep] if dep in values else self._get(dep) for dep in deps])
+            self.recomputed.append(name)
+        return values[name]
+
+    def values(self, columns=PORTFOLIO_COLUMNS):
+        """``{column: (N, years) array}`` for ``columns`` (project_portfolio_batch's result by default)."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {col: self._get(col) for col in columns}
+
+    def frame(self, row=0):
+        """One scenario as portfolio_with_cumulative's DataFrame."""
+        import pandas as pd
+
+        columns = PORTFOLIO_COLUMNS + ("CumulativeOperatingProfit", "ProductRevenue")
+        return pd.DataFrame({col: values[row] for col, values in self.values(columns).items()}, index=range(1, self._values["years"] + 1))
+
+
+def project_portfolio_batch(
+    years_: int,
+    t3_rev_m,
+    t3_gm_pct,
+    t3_projects_fixed,
+    t2_price_m,
+    t2_gm_pct,
+    t2_projects_start,
+    t2_growth_pct,
+    t1_price_m,
+    t1_gm_pct,
+    t1_projects_start,
+    t1_growth_pct,
+    fixed_oh_m,
+    voh_t3_k,
+    voh_t2_k,
+    voh_t1_k,
+):
+    """Evaluate the tier model for N parameter sets at once.
+
+    Every input may be a scalar or a length-N array; scalars are shared by
+    all scenarios. Returns a dict keyed by PORTFOLIO_COLUMNS whose values are
+    ``(N, years_)`` arrays (project counts as int64, everything else float64).
+    Column ``j`` corresponds to Year ``j + 1``.
+    """
+    inputs = (
+        t3_rev_m, t3_gm_pct, t3_projects_fixed,
+        t2_price_m, t2_gm_pct, t2_projects_start, t2_growth_pct,
+        t1_price_m, t1_gm_pct, t1_projects_start, t1_growth_pct,
+        fixed_oh_m, voh_t3_k, voh_t2_k, voh_t1_k,
+    )
+    return ModelGraph(years_, dict(zip(INPUT_KEYS, inputs))).values()
+
+
+def project_portfolio(
+    years_: int,
+    t3_rev_m: float,
+    t3_gm_pct: float,
+    t3_projects_fixed: int,
+    t2_price_m: float,
+    t2_gm_pct: float,
+    t2_projects_start: int,
+    t2_growth_pct: float,
+    t1_price_m: float,
+    t1_gm_pct: float,
+    t1_projects_start: int,
+    t1_growth_pct: float,
+    fixed_oh_m: float,
+    voh_t3_k: float,
+    voh_t2_k: float,
+    voh_t1_k: float,
+):
+    """Single-scenario model as a DataFrame indexed by Year (1..years_)."""
+    import pandas as pd
+
+    batch = project_portfolio_batch(
+        years_,
+        t3_rev_m,
+        t3_gm_pct,
+        t3_projects_fixed,
+        t2_price_m,
+        t2_gm_pct,
+        t2_projects_start,
+        t2_growth_pct,
+        t1_price_m,
+        t1_gm_pct,
+        t1_projects_start,
+        t1_growth_pct,
+        fixed_oh_m,
+        voh_t3_k,
+        voh_t2_k,
+        voh_t1_k,
+    )
+    return pd.DataFrame({col: batch[col][0] for col in PORTFOLIO_COLUMNS}, index=range(1, years_ + 1))
+
+
+def portfolio_with_cumulative(years_: int, inputs):
+    """project_portfolio plus the cumulative profit and product revenue columns."""
+    df = project_portfolio(years_, *inputs)
+    df["CumulativeOperatingProfit"] = df["OperatingProfit"].cumsum()
+    df["ProductRevenue"] = df["T1_Revenue"] + df["T2_Revenue"]
+    return df
@@ -0,0 +1,213 @@
+import importlib.util
+import io
+import sys
+
+import numpy as np
+
+FORMATS = ("csv", "jsonl", "parquet")
+OUTPUT_FORMATS = FORMATS + ("xlsx",)
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".xlsx": "xlsx",
+}
+
+# Package each optional format needs.
+_FORMAT_PACKAGES = {"parquet": "pyarrow", "xlsx": "openpyxl"}
+
+FORMAT_LABELS = {"csv": "CSV", "jsonl": "JSON lines", "parquet": "Parquet", "xlsx": "Excel (.xlsx)"}
+
+# MIME type per format, for downloads.
+MIME_TYPES = {
+    "csv": "text/csv",
+    "jsonl": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+# Rows per chunk when a whole frame or grid is split for writing.
+EXPORT_CHUNK_ROWS = 50_000
+
+# Excel's hard row limit per sheet (header included).
+_XLSX_MAX_ROWS = 1_048_576
+
+
+def detect_format(path):
+    if path == "-":
+        return "csv"
+    for ext, fmt in _EXTENSIONS.items():
+        if path.lower().endswith(ext):
+            return fmt
+    raise ValueError(f"can't tell the format of {path!r}; use one of {sorted(_EXTENSIONS)} or pass --format")
+
+
+def available_formats():
+    """OUTPUT_FORMATS whose optional package is installed (checked without importing it)."""
+    return tuple(
+        fmt for fmt in OUTPUT_FORMATS
+        if fmt not in _FORMAT_PACKAGES or importlib.util.find_spec(_FORMAT_PACKAGES[fmt]) is not None
+    )
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit("Parquet support needs pyarrow: pip install pyarrow") from exc
+
+
+def _require_openpyxl():
+    try:
+        import openpyxl  # noqa: F401
+    except ImportError as exc:
+        raise SystemExit("Excel support needs openpyxl: pip install openpyxl") from exc
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV, JSONL, Parquet or Excel target.
+
+    ``target`` is a path, "-" for stdout, or a binary file object (left open
+    on ``close``), so the same writer serves the batch CLI, the scenario
+    store and in-memory downloads. Each chunk is written as it arrives.
+    Parquet needs pyarrow and Excel needs openpyxl; neither is imported
+    until that format is asked for. Excel rows go through openpyxl's
+    write-only mode, one sheet per writer unless ``add_sheet`` starts another.
+    """
+
+    def __init__(self, target, fmt=None, sheet="Results"):
+        self.fmt = fmt or (detect_format(target) if isinstance(target, str) else "csv")
+        if self.fmt not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown output format {self.fmt!r}; expected one of {OUTPUT_FORMATS}")
+        self.target = target
+        self.rows = 0
+        self._parquet = None
+        self._first = True
+        self._file = None
+        self._owns_file = isinstance(target, str) and target != "-"
+        if self.fmt == "parquet":
+            _require_pyarrow()
+        elif self.fmt == "xlsx":
+            _require_openpyxl()
+            import openpyxl
+
+            self._workbook = openpyxl.Workbook(write_only=True)
+            self.add_sheet(sheet)
+        elif target == "-":
+            self._file = sys.stdout
+        elif self._owns_file:
+            self._file = open(target, "w", newline="", encoding="utf-8")
+        else:
+            self._file = io.TextIOWrapper(target, encoding="utf-8", newline="")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add_sheet(self, name):
+        """Start a new Excel sheet; later chunks go there, header first."""
+        if self.fmt != "xlsx":
+            raise ValueError("only Excel output has sheets")
+        self._sheet = self._workbook.create_sheet(name[:31])
+        self._sheet_rows = 0
+        self._first = True
+
+    def write(self, df):
+        if self.fmt == "csv":
+            df.to_csv(self._file, header=self._first, index=False)
+        elif self.fmt == "jsonl":
+            text = df.to_json(orient="records", lines=True)
+            self._file.write(text if text.endswith("\n") else text + "\n")
+        elif self.fmt == "parquet":
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.target, table.schema)
+            self._parquet.write_table(table)
+        else:
+            self._write_xlsx(df)
+        self._first = False
+        self.rows += len(df)
+
+    def _write_xlsx(self, df):
+        if self._sheet_rows + self._first + len(df) > _XLSX_MAX_ROWS:
+            raise ValueError(f"more than {_XLSX_MAX_ROWS - 1:,} rows don't fit on one Excel sheet; use CSV or Parquet")
+        if self._first:
+            self._sheet.append([str(c) for c in df.columns])
+            self._sheet_rows += 1
+        # openpyxl takes Python scalars; NaN becomes an empty cell.
+        columns = []
+        for col in df.columns:
+            values = df[col].to_numpy()
+            values = values.tolist() if values.dtype.kind in "biuf" else values.astype(object).tolist()
+            columns.append([None if v != v else v for v in values] if df[col].dtype.kind == "f" else values)
+        for row in zip(*columns):
+            self._sheet.append(row)
+        self._sheet_rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self.fmt == "xlsx":
+            self._workbook.save(self.target)
+        elif self._file is not None and self._file is not sys.stdout:
+            if self._owns_file:
+                self._file.close()
+            else:
+                self._file.flush()
+                self._file.detach()
+
+
+def write_chunks(chunks, target, fmt=None, sheet="Results"):
+    """Write an iterable of DataFrames to ``target`` as they come; returns the row count."""
+    with ChunkWriter(target, fmt, sheet) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.rows
+
+
+def frame_chunks(df, index_label=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """``df`` in row slices, with its index as a leading column if ``index_label`` is given."""
+    if index_label is not None:
+        df = df.rename_axis(index_label).reset_index()
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def sweep_chunks(sweep, x_key, y_key, chunk_rows=EXPORT_CHUNK_ROWS):
+    """A progressive_sweep grid as long-format rows (x, y, one column per metric).
+
+    Rows are generated a slice at a time from the metric grids, so the long
+    table is never built whole.
+    """
+    import pandas as pd
+
+    x, y, metrics = sweep["x"], sweep["y"], sweep["metrics"]
+    flat = {m: grid.reshape(-1) for m, grid in metrics.items()}
+    for start in range(0, y.size * x.size, chunk_rows):
+        cells = np.arange(start, min(start + chunk_rows, y.size * x.size))
+        rows, cols = np.divmod(cells, x.size)
+        yield pd.DataFrame({x_key: x[cols], y_key: y[rows], **{m: v[cells] for m, v in flat.items()}})
+
+
+def export_bytes(tables, fmt):
+    """Write ``{name: iterable of DataFrames}`` to one in-memory file.
+
+    Excel gets one sheet per table; the flat formats stack the tables with a
+    leading ``table`` column naming the source.
+    """
+    buffer = io.BytesIO()
+    names = list(tables)
+    with ChunkWriter(buffer, fmt, sheet=names[0] if names else "Results") as writer:
+        for i, name in enumerate(names):
+            if fmt == "xlsx" and i:
+                writer.add_sheet(name)
+            for chunk in tables[name]:
+                writer.write(chunk if fmt == "xlsx" or len(names) == 1 else chunk.assign(table=name)[["table", *chunk.columns]])
+    return buffer.getvalue()
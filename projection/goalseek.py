@@ -0,0 +1,154 @@
+import math
+
+import numpy as np
+
+from projection.compact import project_portfolio_compact
+from projection.engine import INPUT_BOUNDS, INPUT_KEYS, INTEGER_KEYS
+
+# Metrics goal_seek can target, as (numerator, denominator, scale): the
+# metric in each year is ``scale * numerator / denominator`` (no denominator
+# for plain money series).
+GOAL_METRICS = {
+    "OperatingMargin": ("OperatingProfit", "TotalRevenue", 100.0),
+    "OperatingProfit": ("OperatingProfit", None, 1.0),
+    "CumulativeOperatingProfit": ("CumulativeOperatingProfit", None, 1.0),
+    "TotalRevenue": ("TotalRevenue", None, 1.0),
+    "T3_Share": ("T3_Revenue", "TotalRevenue", 100.0),
+    "T2_Share": ("T2_Revenue", "TotalRevenue", 100.0),
+    "T1_Share": ("T1_Revenue", "TotalRevenue", 100.0),
+    "ProfitPerProject_k": ("OperatingProfit", "TotalProjects", 1000.0),
+}
+
+SENSES = (">=", "<=")
+
+# Inputs that reach the model through rounded, compounding project counts.
+# Every other input moves each metric's numerator and denominator linearly,
+# so those are solved in closed form.
+STEP_KEYS = ("tier2_projects0", "tier2_growth", "tier1_projects0", "tier1_growth")
+
+# Bisection stops once the bracket is this share of the search range.
+DEFAULT_TOL = 1e-6
+
+
+def _series(batch, column):
+    if column == "CumulativeOperatingProfit":
+        return np.cumsum(batch["OperatingProfit"], axis=1)
+    return batch[column]
+
+
+def _trial(years_, inputs, key, values, metric):
+    """Numerator and denominator of ``metric`` with ``key`` set to ``values``.
+
+    ``values`` is (N, K): K trial values for each of N scenarios, all run in
+    one batch. Returns two (N, K, years) arrays.
+    """
+    n, k = values.shape
+    params = {
+        name: np.repeat(np.broadcast_to(np.asarray(inputs[name], dtype=float), (n,)), k)
+        for name in INPUT_KEYS
+    }
+    params[key] = values.reshape(-1)
+    batch = project_portfolio_compact(years_, *[params[name] for name in INPUT_KEYS])
+    num_col, den_col, _ = GOAL_METRICS[metric]
+    num = _series(batch, num_col).reshape(n, k, -1)
+    den = np.ones_like(num) if den_col is None else np.asarray(_series(batch, den_col), dtype=float).reshape(n, k, -1)
+    return num, den
+
+
+def goal_seek(years_, inputs, key, metric, target, sense=">=", bounds=None, tol=DEFAULT_TOL):
+    """Values of one input that put a metric at or past a target, year by year.
+
+    Answers "what Tier 1 GM keeps OperatingMargin >= 15 in every year?",
+    "what fixed overhead ceiling keeps us above the benchmark?" or "what
+    Tier 2 growth gets T3_Share <= 50 by year N?". ``inputs`` maps every
+    INPUT_KEYS entry to a scalar or a length-N array (N scenarios, solved
+    together); ``key`` is the input to solve for, searched within ``bounds``
+    (default INPUT_BOUNDS); ``target`` is a scalar or length-N array in the
+    metric's units.
+
+    In each year every GOAL_METRICS entry is a ratio of two series that are
+    both linear in one project count or in any other single input, so it is
+    monotonic in ``key`` and the values meeting the goal form one interval.
+    Inputs outside STEP_KEYS are solved in closed form from a single batch
+    at the two bounds. STEP_KEYS go through rounded project counts and are
+    bisected for all scenarios and years at once: to ``tol`` of the range
+    for growth rates (the returned edge always meets the goal) and to the
+    exact whole number for starting projects.
+
+    Returns a dict with ``lower`` and ``upper`` ((N, years) arrays: the
+    interval of ``key`` meeting the goal in that year, NaN where no value in
+    bounds does), ``all_years_lower`` and ``all_years_upper`` ((N,): the
+    interval meeting it in every year, NaN if none) and ``method``
+    ("closed_form" or "bisection").
+    """
+    if key not in INPUT_KEYS:
+        raise ValueError(f"unknown input {key!r}; expected one of {INPUT_KEYS}")
+    if metric not in GOAL_METRICS:
+        raise ValueError(f"unknown metric {metric!r}; expected one of {tuple(GOAL_METRICS)}")
+    if sense not in SENSES:
+        raise ValueError(f"unknown sense {sense!r}; expected one of {SENSES}")
+    lo, hi = (float(v) for v in dict(INPUT_BOUNDS, **(bounds or {}))[key])
+    if not lo < hi:
+        raise ValueError(f"empty search range {lo!r}..{hi!r} for {key!r}")
+
+    n = max([np.size(inputs[k]) for k in INPUT_KEYS] + [np.size(target)])
+    scale = GOAL_METRICS[metric][2]
+    t = np.broadcast_to(np.asarray(target, dtype=float), (n,))[:, None] / scale
+    sign = 1.0 if sense == ">=" else -1.0
+    is_int = key in INTEGER_KEYS
+
+    # The goal holds where sign * (numerator - t * denominator) >= 0
+    # (denominators are positive everywhere inside INPUT_BOUNDS).
+    num, den = _trial(years_, inputs, key, np.tile([lo, hi], (n, 1)), metric)
+    gap = sign * (num - t[:, :, None] * den)
+    gap_lo, gap_hi = gap[:, 0], gap[:, 1]
+
+    if key not in STEP_KEYS:
+        method = "closed_form"
+        slope = (gap_hi - gap_lo) / (hi - lo)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            root = lo - gap_lo / slope
+        lower = np.where(slope > 0, np.maximum(root, lo), lo)
+        upper = np.where(slope < 0, np.minimum(root, hi), hi)
+        if is_int:
+            lower = np.ceil(lower - 1e-9)
+            upper = np.floor(upper + 1e-9)
+        empty = np.where(slope == 0, gap_lo < 0, lower > upper)
+    else:
+        method = "bisection"
+        rising = (gap_lo < 0) & (gap_hi >= 0)
+        falling = (gap_lo >= 0) & (gap_hi < 0)
+        # Bracket each year's crossing: ``miss`` fails the goal, ``meet`` meets it.
+        miss = np.where(rising, lo, hi)
+        meet = np.where(rising, hi, lo)
+        span = hi - lo
+        steps = math.ceil(math.log2(span)) + 1 if is_int else math.ceil(math.log2(1 / tol))
+        years_axis = np.arange(gap.shape[2])
+        for _ in range(max(steps, 1)):
+            mid = (miss + meet) / 2
+            if is_int:
+                mid = np.floor(mid)
+            num, den = _trial(years_, inputs, key, mid, metric)
+            # Row j of each scenario tried year j's midpoint; keep year j.
+            gap_mid = sign * (num[:, years_axis, years_axis] - t * den[:, years_axis, years_axis])
+            met = gap_mid >= 0
+            meet = np.where(met, mid, meet)
+            miss = np.where(met, miss, mid)
+        lower = np.where(rising, meet, lo)
+        upper = np.where(falling, meet, hi)
+        empty = (gap_lo < 0) & (gap_hi < 0)
+
+    lower = np.where(empty, np.nan, lower)
+    upper = np.where(empty, np.nan, upper)
+    all_empty = empty.any(axis=1)
+    with np.errstate(invalid="ignore"):
+        all_lower = np.where(all_empty, np.nan, lower.max(axis=1))
+        all_upper = np.where(all_empty, np.nan, upper.min(axis=1))
+    all_empty |= all_lower > all_upper
+    return {
+        "lower": lower,
+        "upper": upper,
+        "all_years_lower": np.where(all_empty, np.nan, all_lower),
+        "all_years_upper": np.where(all_empty, np.nan, all_upper),
+        "method": method,
+    }
@@ -0,0 +1,56 @@
+"""Measure the cold import cost of the model package.
+
+    python -m projection.importtime [module] [--runs N]
+
+Each run imports ``module`` in a fresh interpreter, reports the wall time of
+the import alone (interpreter start-up excluded) and checks that none of the
+UI / dataframe libraries came along with it. Exits non-zero if one did.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Libraries the model must not pull in at import time.
+HEAVY_MODULES = ("pandas", "streamlit", "plotly", "pyarrow")
+
+_PROBE = """
+import json, sys, time
+t = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module="projection", runs=5):
+    """Median cold-import time of ``module`` and any heavy modules it loaded."""
+    probe = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    samples = []
+    loaded = set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout)
+        samples.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return {"module": module, "median_seconds": statistics.median(samples), "runs": runs, "loaded": sorted(loaded)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m projection.importtime", description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="projection")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, args.runs)
+    print(f"import {result['module']}: {result['median_seconds'] * 1000:.1f} ms (median of {result['runs']})")
+    if result["loaded"]:
+        print(f"also loaded: {', '.join(result['loaded'])}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
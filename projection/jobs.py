@@ -0,0 +1,236 @@
+import functools
+import inspect
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+EXECUTORS = ("thread", "process")
+
+# Worker count when FORECAST_JOB_WORKERS is unset. The analyses are NumPy
+# batches that release the GIL for most of their time, so threads scale
+# until the cores are busy.
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+# Seconds the page waits between looks at a running job.
+POLL_INTERVAL = 0.15
+
+
+class JobCancelled(Exception):
+    """Raised by Job.wait for a job cancelled before it finished."""
+
+
+class Job:
+    """One background analysis, shared by every session that asked for it.
+
+    ``progress`` runs from 0 to 1 and ``partial`` holds the latest partial
+    result (None until the first one). Once ``done``, exactly one of
+    ``result`` (status "done"), ``error`` ("failed") or a cancellation
+    ("cancelled") is set.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.status = "pending"
+        self.progress = 0.0
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.owners = set()
+        self.future = None
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    @property
+    def done(self):
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        """Stop the job at its next progress report (or before it starts)."""
+        self._cancel.set()
+        if self.future is not None and self.future.cancel():
+            self._finish("cancelled")
+
+    def wait(self, timeout=None):
+        """Block until done; return the result or raise its error / JobCancelled."""
+        self._finished.wait(timeout)
+        if self.status == "failed":
+            raise self.error
+        if self.status == "cancelled":
+            raise JobCancelled(self.key)
+        return self.result
+
+    def _finish(self, status, result=None, error=None):
+        if self.done:
+            return
+        self.result, self.error, self.status = result, error, status
+        if status == "done":
+            self.progress = 1.0
+        self._finished.set()
+
+
+# Stand-in "job" for JobRunner.release: already done, so never tracked.
+_RELEASED = Job(None)
+_RELEASED._finish("cancelled")
+
+
+def _drain(fn, args, kwargs):
+    """Run a job function to its final value (process pool: no partials cross over)."""
+    value = fn(*args, **kwargs)
+    if inspect.isgenerator(value):
+        last = None
+        for _, partial in value:
+            last = partial if partial is not None else last
+        value = last
+    return value
+
+
+class JobRunner:
+    """Thread or process pool running analyses keyed by their parameter hash.
+
+    ``submit`` with a key already running (or queued) returns that job, so
+    sessions asking for the same analysis share one computation. Each
+    ``owner`` (a session plus a slot such as "heatmap") holds at most one
+    job: submitting a new key for it releases the old one, which is
+    cancelled once no owner is left, so a moved slider stops the superseded
+    run. Finished results go into ``cache`` (an LRUCache) if one is given,
+    and later submits are served from it.
+
+    Job functions either return their result or are generators yielding
+    ``(fraction_done, partial)`` pairs, where ``partial`` may be None and the
+    last non-None one is the result. Generators are cancelled between
+    yields. With ``executor="process"`` a job runs to completion in a worker
+    process: no partial results or progress, and a started job can't be
+    stopped, but CPU-bound work gets cores of its own. Functions and
+    arguments must then be picklable.
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, executor="thread"):
+        if executor not in EXECUTORS:
+            raise ValueError(f"unknown executor {executor!r}; expected one of {EXECUTORS}")
+        self.executor = executor
+        pool = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+        self._pool = pool(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._owned = {}
+
+    def submit(self, key, fn, *args, owner=None, cache=None, **kwargs):
+        """Job computing ``fn(*args, **kwargs)`` under ``key``, shared and deduplicated."""
+        if cache is not None:
+            hit = cache.get(key)
+            if hit is not None:
+                job = Job(key)
+                job._finish("done", hit)
+                self._take(owner, job)
+                return job
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.cancelled:
+                job = Job(key)
+                self._jobs[key] = job
+                if self.executor == "thread":
+                    job.future = self._pool.submit(self._run, job, fn, args, kwargs, cache)
+                else:
+                    job.future = self._pool.submit(_drain, fn, args, kwargs)
+                    job.future.add_done_callback(lambda future, job=job: self._collect(job, future, cache))
+            if owner is not None:
+                job.owners.add(owner)
+        self._take(owner, job)
+        return job
+
+    def _take(self, owner, job):
+        """Make ``job`` the one ``owner`` waits on, releasing its previous job."""
+        if owner is None:
+            return
+        with self._lock:
+            previous = self._owned.pop(owner, None)
+            # Finished jobs aren't tracked, so they (and their results) can go
+            # once the caller drops them.
+            if not job.done:
+                self._owned[owner] = job
+            if previous is None or previous is job:
+                return
+            previous.owners.discard(owner)
+            orphaned = not previous.owners and not previous.done
+        if orphaned:
+            previous.cancel()
+            if previous.done:
+                self._forget(previous)
+
+    def release(self, owner):
+        """Drop ``owner``'s job, cancelling it if nobody else is waiting on it."""
+        self._take(owner, _RELEASED)
+
+    def _forget(self, job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            for owner in job.owners:
+                if self._owned.get(owner) is job:
+                    del self._owned[owner]
+
+    def _run(self, job, fn, args, kwargs, cache):
+        if job.cancelled:
+            job._finish("cancelled")
+            self._forget(job)
+            return
+        job.status = "running"
+        try:
+            value = fn(*args, **kwargs)
+            if inspect.isgenerator(value):
+                last = None
+                for fraction, partial in value:
+                    if job.cancelled:
+                        value.close()
+                        job._finish("cancelled")
+                        return
+                    job.progress = float(fraction)
+                    if partial is not None:
+                        job.partial = last = partial
+                value = last
+        except Exception as exc:
+            job._finish("failed", error=exc)
+        else:
+            if cache is not None:
+                cache.put(job.key, value)
+            job._finish("done", value)
+        finally:
+            self._forget(job)
+
+    def _collect(self, job, future, cache):
+        try:
+            if future.cancelled():
+                job._finish("cancelled")
+                return
+            error = future.exception()
+            if error is not None:
+                job._finish("failed", error=error)
+                return
+            if cache is not None:
+                cache.put(job.key, future.result())
+            job._finish("done", future.result())
+        finally:
+            self._forget(job)
+
+    def running(self):
+        """Keys of jobs queued or running."""
+        with self._lock:
+            return list(self._jobs)
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+@functools.cache
+def job_runner():
+    """Process-wide JobRunner (FORECAST_JOB_WORKERS workers, FORECAST_JOB_EXECUTOR pool)."""
+    workers = int(os.environ.get("FORECAST_JOB_WORKERS") or DEFAULT_WORKERS)
+    return JobRunner(max_workers=workers, executor=os.environ.get("FORECAST_JOB_EXECUTOR") or "thread")
@@ -0,0 +1,80 @@
+import numpy as np
+
+from projection.compact import project_portfolio_compact
+from projection.engine import GROWTH_KEYS, INPUT_KEYS
+
+SUMMARY_METRICS = (
+    "FinalOperatingMargin",
+    "MinOperatingMargin",
+    "CumulativeOperatingProfit",
+    "CrossoverYear",
+    "YearsBelowBenchmark",
+    "FinalT3Share",
+)
+
+
+def _horizon_mask(shape, horizons):
+    """(N, years) mask of the years inside each row's horizon."""
+    if horizons is None:
+        return np.ones(shape, dtype=bool)
+    return np.arange(shape[1]) < np.asarray(horizons).reshape(-1, 1)
+
+
+def _at_horizon(series, horizons):
+    """Value of each row in its final year."""
+    if horizons is None:
+        return series[:, -1]
+    rows = np.arange(series.shape[0])
+    return series[rows, np.asarray(horizons, dtype=np.int64) - 1]
+
+
+def crossover_year(scenario_cumulative, baseline_cumulative, horizons=None):
+    """First year the scenario's cumulative profit reaches the baseline's.
+
+    Returns a float (N,) array of 1-based years, NaN where there is no
+    crossover within the horizon.
+    """
+    hit = (scenario_cumulative >= baseline_cumulative) & _horizon_mask(scenario_cumulative.shape, horizons)
+    found = hit.any(axis=1)
+    return np.where(found, hit.argmax(axis=1) + 1.0, np.nan)
+
+
+def summarize_batch(scenario, baseline, bm_pct, horizons=None):
+    """Per-scenario summary metrics from engine output.
+
+    ``scenario`` and ``baseline`` are ``project_portfolio_batch`` results of
+    the same shape. ``horizons`` optionally truncates each row to its own
+    number of years (the batch is then evaluated at the longest horizon).
+    Returns a dict keyed by SUMMARY_METRICS of (N,) arrays.
+    """
+    margin = scenario["OperatingMargin"]
+    in_horizon = _horizon_mask(margin.shape, horizons)
+    scenario_cumulative = np.cumsum(scenario["OperatingProfit"], axis=1)
+    baseline_cumulative = np.cumsum(baseline["OperatingProfit"], axis=1)
+    bm = np.asarray(bm_pct, dtype=float)
+    if bm.ndim == 1:
+        bm = bm[:, None]
+    return {
+        "FinalOperatingMargin": _at_horizon(margin, horizons),
+        "MinOperatingMargin": np.where(in_horizon, margin, np.inf).min(axis=1),
+        "CumulativeOperatingProfit": _at_horizon(scenario_cumulative, horizons),
+        "CrossoverYear": crossover_year(scenario_cumulative, baseline_cumulative, horizons),
+        "YearsBelowBenchmark": np.count_nonzero((margin < bm) & in_horizon, axis=1),
+        "FinalT3Share": _at_horizon(scenario["T3_Share"], horizons),
+    }
+
+
+def evaluate_summary(years_, params, bm_pct, horizons=None):
+    """Run scenario + zero-growth baseline for a batch and summarize it.
+
+    ``params`` maps every INPUT_KEYS entry to a scalar or length-N array.
+    Both runs are CompactResults, so only the columns the summary reads are
+    ever materialized.
+    """
+    args = [params[k] for k in INPUT_KEYS]
+    baseline_args = [0 if k in GROWTH_KEYS else params[k] for k in INPUT_KEYS]
+    scenario = project_portfolio_compact(years_, *args)
+    baseline_profit = project_portfolio_compact(years_, *baseline_args)["OperatingProfit"]
+    # If every growth-free input was a scalar, one baseline row serves all.
+    baseline = {"OperatingProfit": np.broadcast_to(baseline_profit, scenario.shape)}
+    return summarize_batch(scenario, baseline, bm_pct, horizons)
@@ -0,0 +1,183 @@
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from projection.compact import project_portfolio_compact
+from projection.engine import INPUT_KEYS
+
+# Sidebar inputs that may be given a distribution instead of a point value.
+UNCERTAIN_KEYS = (
+    "tier2_growth",
+    "tier1_growth",
+    "tier3_gm",
+    "tier2_gm",
+    "tier1_gm",
+    "tier2_price",
+    "tier1_price",
+    "voh_t3",
+    "voh_t2",
+    "voh_t1",
+)
+
+DISTRIBUTION_KINDS = ("normal", "triangular", "lognormal")
+
+DEFAULT_PERCENTILES = (5, 50, 95)
+
+# Paths per engine call. Each chunk holds compact project counts plus the few
+# series derived for margin and profit (~15 MB at 16k paths x 15 years);
+# changing it changes which draws land on which path for a given seed.
+DEFAULT_CHUNK_SIZE = 16_384
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Bounded distribution for one model input (one draw per path).
+
+    ``center`` is the mean (normal), mode (triangular) or median (lognormal).
+    ``spread`` is the standard deviation (normal), half-width (triangular) or
+    log-space standard deviation (lognormal). Draws are clipped to
+    ``[low, high]``.
+    """
+
+    kind: str
+    center: float
+    spread: float
+    low: float = -math.inf
+    high: float = math.inf
+
+    def __post_init__(self):
+        if self.kind not in DISTRIBUTION_KINDS:
+            raise ValueError(f"unknown distribution kind {self.kind!r}; expected one of {DISTRIBUTION_KINDS}")
+        if self.spread < 0:
+            raise ValueError("spread must be non-negative")
+        if self.low > self.high:
+            raise ValueError("low bound exceeds high bound")
+
+    def sample(self, rng, n):
+        if self.spread == 0:
+            draws = np.full(n, float(self.center))
+        elif self.kind == "normal":
+            draws = rng.normal(self.center, self.spread, n)
+        elif self.kind == "triangular":
+            draws = rng.triangular(self.center - self.spread, self.center, self.center + self.spread, n)
+        else:
+            draws = self.center * np.exp(self.spread * rng.standard_normal(n))
+        return np.clip(draws, self.low, self.high)
+
+
+def band_distribution(kind, center, plus_minus, low=-math.inf, high=math.inf):
+    """Distribution whose bulk (~95% of draws) lies within ``center +/- plus_minus``.
+
+    Used by the page, where each input gets a single "+/-" spread: a normal
+    uses it as 2 standard deviations, a triangular as its half-width, and a
+    lognormal as the 2-sigma multiplicative band ``1 + plus_minus / center``.
+    """
+    plus_minus = abs(float(plus_minus))
+    if kind == "normal":
+        spread = plus_minus / 2
+    elif kind == "triangular":
+        spread = plus_minus
+    elif center > 0:
+        spread = math.log1p(plus_minus / center) / 2
+    else:
+        spread = 0.0
+    return Distribution(kind, float(center), spread, low, high)
+
+
+def simulate_paths(
+    years_,
+    inputs,
+    distributions,
+    bm_pct,
+    n_paths=100_000,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    percentiles=DEFAULT_PERCENTILES,
+    seed=None,
+):
+    """Monte Carlo the tier model and summarize each year across paths.
+
+    ``inputs`` maps every INPUT_KEYS entry to its point value; ``distributions``
+    maps a subset of UNCERTAIN_KEYS to a Distribution that replaces the point
+    value. Paths run through ``project_portfolio_compact`` ``chunk_size`` at
+    a time; only operating margin and cumulative operating profit are kept
+    (as float32, 8 bytes per path-year) for the percentile pass.
+
+    Returns a dict with ``OperatingMargin`` and ``CumulativeOperatingProfit``
+    (each ``{percentile: (years,) array}``), ``ProbBelowBenchmark`` (share of
+    paths under ``bm_pct`` per year, 0-1) and ``n_paths``.
+    """
+    for _, summary in iter_simulate_paths(
+        years_, inputs, distributions, bm_pct, n_paths, chunk_size, percentiles, seed, partials=0
+    ):
+        pass
+    return summary
+
+
+def iter_simulate_paths(
+    years_,
+    inputs,
+    distributions,
+    bm_pct,
+    n_paths=100_000,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    percentiles=DEFAULT_PERCENTILES,
+    seed=None,
+    partials=3,
+):
+    """simulate_paths as ``(fraction_done, summary)`` pairs, one per chunk.
+
+    ``summary`` is None except on the last pair (the simulate_paths result)
+    and, up to ``partials`` times along the way, a summary of the paths run
+    so far. Same draws and result as simulate_paths for the same seed.
+    """
+    unknown = set(distributions) - set(UNCERTAIN_KEYS)
+    if unknown:
+        raise ValueError(f"no distribution support for {sorted(unknown)}")
+    if n_paths < 1:
+        raise ValueError("n_paths must be at least 1")
+
+    years_ = int(years_)
+    rng = np.random.default_rng(seed)
+    margin = np.empty((n_paths, years_), dtype=np.float32)
+    cumulative = np.empty((n_paths, years_), dtype=np.float32)
+    below = np.zeros(years_, dtype=np.int64)
+    next_partial = 1
+
+    for start in range(0, n_paths, chunk_size):
+        stop = min(start + chunk_size, n_paths)
+        n = stop - start
+        args = [
+            distributions[k].sample(rng, n) if k in distributions else inputs[k]
+            for k in INPUT_KEYS
+        ]
+        batch = project_portfolio_compact(years_, *args)
+        op_margin = batch["OperatingMargin"]
+        margin[start:stop] = op_margin
+        profit = batch["OperatingProfit"]
+        np.cumsum(profit, axis=1, out=profit)
+        cumulative[start:stop] = profit
+        below += np.count_nonzero(op_margin < bm_pct, axis=0)
+
+        if stop == n_paths:
+            break
+        summary = None
+        if next_partial <= partials and stop >= next_partial * n_paths / (partials + 1):
+            summary = _summarize(margin[:stop], cumulative[:stop], below, percentiles)
+            next_partial += 1
+        yield stop / n_paths, summary
+
+    yield 1.0, _summarize(margin, cumulative, below, percentiles)
+
+
+def _summarize(margin, cumulative, below, percentiles):
+    n_paths = len(margin)
+    q = list(percentiles)
+    margin_q = np.percentile(margin, q, axis=0)
+    cumulative_q = np.percentile(cumulative, q, axis=0)
+    return {
+        "OperatingMargin": {p: margin_q[i].astype(float) for i, p in enumerate(q)},
+        "CumulativeOperatingProfit": {p: cumulative_q[i].astype(float) for i, p in enumerate(q)},
+        "ProbBelowBenchmark": below / n_paths,
+        "n_paths": n_paths,
+    }
@@ -0,0 +1,183 @@
+import numpy as np
+
+from projection.compact import project_portfolio_compact
+from projection.engine import INPUT_BOUNDS, INPUT_KEYS, INTEGER_KEYS
+
+# The growth plan: starting volumes and growth rates for the product tiers.
+PLAN_KEYS = ("tier1_projects0", "tier1_growth", "tier2_projects0", "tier2_growth")
+
+OBJECTIVES = ("max_cumulative_profit", "target_t3_share")
+
+# A year within this many margin points of the benchmark counts as binding.
+BINDING_TOL = 0.25
+
+
+def _evaluate(years_, inputs, candidates, bm_pct, objective, target_share):
+    """Score (M, len(PLAN_KEYS)) candidates; higher is better.
+
+    Returns (score, feasible, violation, margin, cumulative, t3_share).
+    """
+    params = dict(inputs)
+    for j, key in enumerate(PLAN_KEYS):
+        params[key] = candidates[:, j]
+    batch = project_portfolio_compact(years_, *[params[k] for k in INPUT_KEYS])
+    margin = batch["OperatingMargin"]
+    cumulative = batch["OperatingProfit"].sum(axis=1)
+    t3_share = batch["T3_Share"][:, -1]
+
+    shortfall = np.maximum(bm_pct - np.nan_to_num(margin, nan=-np.inf), 0.0)
+    violation = shortfall.sum(axis=1)
+    feasible = violation == 0
+
+    if objective == "max_cumulative_profit":
+        score = cumulative.copy()
+    else:
+        # Closest final-year Tier 3 share to target; profit only breaks ties.
+        score = -np.abs(t3_share - target_share) + 1e-6 * cumulative
+    # Any feasible plan beats every infeasible one; among infeasible plans
+    # the smaller total margin shortfall wins.
+    score = np.where(feasible, score, -1e12 - violation)
+    return score, feasible, violation, margin, cumulative, t3_share
+
+
+def optimize_growth_plan(
+    years_,
+    inputs,
+    bm_pct,
+    objective="max_cumulative_profit",
+    target_share=50.0,
+    bounds=None,
+    integer_keys=INTEGER_KEYS,
+    population=4096,
+    generations=40,
+    elite_frac=0.1,
+    seed=0,
+):
+    """Search Tier 1/2 starting volumes and growth rates for the best plan.
+
+    Maximizes cumulative operating profit (or gets the final-year Tier 3
+    share closest to ``target_share``) subject to ``OperatingMargin >=
+    bm_pct`` in every year. Every other input stays at its ``inputs`` value.
+
+    The search is a cross-entropy method: each generation samples
+    ``population`` candidates from a normal around the elite of the last,
+    clipped to ``bounds`` (default INPUT_BOUNDS), and scores them in one
+    batched model call; elites carry over unchanged. The defaults evaluate
+    ~160k candidates. Plan keys in ``integer_keys`` are searched on whole
+    numbers (pass PLAN_KEYS to match the sidebar's 1-point growth steps).
+
+    Returns a dict with ``plan`` ({key: value}), ``feasible``,
+    ``cumulative_profit``, ``final_t3_share``, ``margin`` (per-year
+    operating margin of the plan), ``binding_years`` (1-based years within
+    BINDING_TOL of the benchmark, or below it if infeasible), ``at_bounds``
+    (plan keys sitting on a search bound) and ``evaluations``.
+    """
+    for _, result in iter_optimize_growth_plan(
+        years_,
+        inputs,
+        bm_pct,
+        objective,
+        target_share,
+        bounds,
+        integer_keys,
+        population,
+        generations,
+        elite_frac,
+        seed,
+        partial_every=0,
+    ):
+        pass
+    return result
+
+
+def iter_optimize_growth_plan(
+    years_,
+    inputs,
+    bm_pct,
+    objective="max_cumulative_profit",
+    target_share=50.0,
+    bounds=None,
+    integer_keys=INTEGER_KEYS,
+    population=4096,
+    generations=40,
+    elite_frac=0.1,
+    seed=0,
+    partial_every=10,
+):
+    """optimize_growth_plan as ``(fraction_done, plan)`` pairs, one per generation.
+
+    ``plan`` is None except on the last pair (the optimize_growth_plan
+    result) and every ``partial_every`` generations, where it describes the
+    best plan found so far. The search is the same, draw for draw.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"unknown objective {objective!r}; expected one of {OBJECTIVES}")
+    bounds = dict(INPUT_BOUNDS, **(bounds or {}))
+    lo = np.array([bounds[k][0] for k in PLAN_KEYS], dtype=float)
+    hi = np.array([bounds[k][1] for k in PLAN_KEYS], dtype=float)
+    is_int = np.array([k in integer_keys for k in PLAN_KEYS])
+    rng = np.random.default_rng(seed)
+    n_elite = max(2, int(population * elite_frac))
+
+    def snap(c):
+        c = np.clip(c, lo, hi)
+        c[:, is_int] = np.round(c[:, is_int])
+        return c
+
+    # Seed the first generation with the current plan so the search never
+    # returns something worse than what is on screen.
+    current = np.array([[inputs[k] for k in PLAN_KEYS]], dtype=float)
+    candidates = snap(np.vstack([current, rng.uniform(lo, hi, size=(population - 1, len(PLAN_KEYS)))]))
+    elite = np.empty((0, len(PLAN_KEYS)))
+    elite_score = np.empty(0)
+    evaluations = 0
+
+    for generation in range(1, generations + 1):
+        score = _evaluate(years_, inputs, candidates, bm_pct, objective, target_share)[0]
+        evaluations += len(candidates)
+
+        pool = np.vstack([elite, candidates])
+        pool_score = np.concatenate([elite_score, score])
+        top = np.argsort(-pool_score, kind="stable")[:n_elite]
+        elite, elite_score = pool[top], pool_score[top]
+
+        mean = elite.mean(axis=0)
+        std = np.maximum(elite.std(axis=0), 1e-3 * (hi - lo))
+        candidates = snap(rng.normal(mean, std, size=(population, len(PLAN_KEYS))))
+
+        if generation < generations:
+            partial = None
+            if partial_every and generation % partial_every == 0:
+                partial = _plan_result(
+                    years_, inputs, elite[:1], bm_pct, objective, target_share, lo, hi, is_int, evaluations
+                )
+            yield generation / generations, partial
+
+    yield 1.0, _plan_result(years_, inputs, elite[:1], bm_pct, objective, target_share, lo, hi, is_int, evaluations)
+
+
+def _plan_result(years_, inputs, best, bm_pct, objective, target_share, lo, hi, is_int, evaluations):
+    """optimize_growth_plan's result dict for the (1, len(PLAN_KEYS)) plan ``best``."""
+    _, feasible, _, margin, cumulative, t3_share = _evaluate(
+        years_, inputs, best, bm_pct, objective, target_share
+    )
+    margin = margin[0]
+    binding = np.nonzero(margin - bm_pct < BINDING_TOL)[0] + 1
+    at_bounds = [
+        k for j, k in enumerate(PLAN_KEYS)
+        if np.isclose(best[0, j], lo[j]) or np.isclose(best[0, j], hi[j])
+    ]
+    plan = {
+        k: int(best[0, j]) if is_int[j] else float(best[0, j])
+        for j, k in enumerate(PLAN_KEYS)
+    }
+    return {
+        "plan": plan,
+        "feasible": bool(feasible[0]),
+        "cumulative_profit": float(cumulative[0]),
+        "final_t3_share": float(t3_share[0]),
+        "margin": margin,
+        "binding_years": [int(y) for y in binding],
+        "at_bounds": at_bounds,
+        "evaluations": evaluations,
+    }
@@ -0,0 +1,215 @@
+import numpy as np
+
+from projection.engine import PORTFOLIO_COLUMNS, _column, project_portfolio_batch
+
+# Periods per year for each resolution.
+RESOLUTIONS = {"annual": 1, "quarterly": 4, "monthly": 12}
+
+# How a project's revenue and variable overhead are recognized over its build.
+RECOGNITION_SHAPES = ("uniform", "s_curve")
+
+TIERS = ("tier3", "tier2", "tier1")
+
+# Build durations in months; 0 recognizes a project entirely in its start period.
+DEFAULT_CURVES = {
+    "tier3": ("s_curve", 12),
+    "tier2": ("s_curve", 6),
+    "tier1": ("uniform", 3),
+}
+
+# Kernels longer than this go through the FFT path (see spread_starts); on a
+# 10k x 180 monthly batch the two break even at about a year of taps.
+FFT_MIN_TAPS = 12
+
+
+def _cdf(shape, u):
+    u = np.clip(u, 0.0, 1.0)
+    if shape == "uniform":
+        return u
+    if shape == "s_curve":
+        return u * u * (3 - 2 * u)  # smoothstep: slow start, fast middle, slow finish
+    raise ValueError(f"unknown recognition shape {shape!r}; expected one of {RECOGNITION_SHAPES}")
+
+
+def recognition_curve(shape, duration_months, periods_per_year):
+    """Share of a project recognized in each period after its start.
+
+    Projects start at the beginning of a period and are recognized over
+    ``duration_months`` following ``shape``; the weights sum to 1.
+    """
+    months = 12 / periods_per_year
+    n_taps = max(1, int(np.ceil(duration_months / months - 1e-9)))
+    if duration_months <= 0 or n_taps == 1:
+        return np.ones(1)
+    edges = np.arange(n_taps + 1) * months / duration_months
+    return np.diff(_cdf(shape, edges))
+
+
+def spread_starts(starts, curve, method="auto"):
+    """Recognized volume per period for (N, P) ``starts`` under ``curve``.
+
+    ``y[t] = sum_k curve[k] * starts[t - k]``, with the business taken to be
+    in steady state before the horizon: every period before the first starts
+    as many projects as the first does, so a flat plan stays flat.
+
+    ``method`` is "direct" (one multiply-add per curve tap), "fft" (one real
+    FFT per row; cost independent of the curve length) or "auto", which picks
+    FFT once the curve has more than FFT_MIN_TAPS taps.
+    """
+    starts = np.asarray(starts, dtype=float)
+    curve = np.asarray(curve, dtype=float)
+    n_periods = starts.shape[-1]
+    taps = min(len(curve), n_periods)
+    if method == "auto":
+        method = "fft" if taps > FFT_MIN_TAPS else "direct"
+
+    if method == "direct":
+        out = starts * curve[0]
+        for k in range(1, taps):
+            out[..., k:] += curve[k] * starts[..., :-k]
+    elif method == "fft":
+        size = 1 << int(np.ceil(np.log2(n_periods + taps - 1)))
+        spectrum = np.fft.rfft(starts, size, axis=-1) * np.fft.rfft(curve[:taps], size)
+        out = np.fft.irfft(spectrum, size, axis=-1)[..., :n_periods]
+    else:
+        raise ValueError(f"unknown method {method!r}; expected 'auto', 'direct' or 'fft'")
+
+    # Pre-horizon starts still being recognized: the curve's remaining tail.
+    tail = 1.0 - np.cumsum(curve)[:min(len(curve) - 1, n_periods)]
+    if tail.size:
+        out[..., :tail.size] += starts[..., :1] * tail
+    return out
+
+
+def period_demand(years_, inputs, periods_per_year):
+    """Project starts per period for each tier, from the annual model.
+
+    Each year's project count starts evenly across that year's periods.
+    Returns ``{tier: (N, years_ * periods_per_year)}`` float arrays.
+    """
+    annual = project_portfolio_batch(years_, *inputs)
+    return {
+        tier: np.repeat(annual[f"T{tier[-1]}_Projects"] / periods_per_year, periods_per_year, axis=1)
+        for tier in TIERS
+    }
+
+
+def period_financials(inputs, starts, periods_per_year, curves=None, method="auto"):
+    """Revenue, overhead and margins per period from per-tier project starts.
+
+    ``starts`` is ``{tier: (N, P)}`` (see period_demand); revenue and
+    variable overhead are recognized along each tier's ``curves`` entry.
+    Returns a dict keyed by PORTFOLIO_COLUMNS of (N, P) float arrays.
+    """
+    curves = dict(DEFAULT_CURVES, **(curves or {}))
+    t3_starts, t2_starts, t1_starts = (starts[tier] for tier in TIERS)
+    n = t3_starts.shape[0]
+    (
+        t3_rev_m, t3_gm_pct, t3_projects_fixed,
+        t2_price_m, t2_gm_pct, _, _,
+        t1_price_m, t1_gm_pct, _, _,
+        fixed_oh_m, voh_t3_k, voh_t2_k, voh_t1_k,
+    ) = (_column(x, n) for x in inputs)
+
+    def recognize(tier, values):
+        shape, months = curves[tier]
+        return spread_starts(values, recognition_curve(shape, months, periods_per_year), method)
+
+    out = {}
+    out["T3_Projects"] = t3_starts
+    out["T2_Projects"] = t2_starts
+    out["T1_Projects"] = t1_starts
+    total_projects = t1_starts + t2_starts + t3_starts
+    out["TotalProjects"] = total_projects
+
+    # Project-equivalents recognized per period; revenue and variable
+    # overhead are both proportional to them, so each tier is spread once.
+    t3_active = recognize("tier3", t3_starts)
+    t2_active = recognize("tier2", t2_starts)
+    t1_active = recognize("tier1", t1_starts)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Tier 3 revenue is an input total; per project it is that total over
+        # the fixed project count (and stays flat if there are no projects).
+        t3_revenue = np.where(
+            t3_projects_fixed > 0,
+            t3_active * (t3_rev_m / t3_projects_fixed),
+            t3_rev_m / periods_per_year,
+        )
+    t2_revenue = t2_active * t2_price_m
+    t1_revenue = t1_active * t1_price_m
+    total_revenue = t1_revenue + t2_revenue + t3_revenue
+    out["T3_Revenue"] = t3_revenue
+    out["T2_Revenue"] = t2_revenue
+    out["T1_Revenue"] = t1_revenue
+    out["TotalRevenue"] = total_revenue
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["T3_Share"] = (t3_revenue / total_revenue) * 100
+        out["T2_Share"] = (t2_revenue / total_revenue) * 100
+        out["T1_Share"] = (t1_revenue / total_revenue) * 100
+
+        t3_gp = t3_revenue * (t3_gm_pct / 100)
+        t2_gp = t2_revenue * (t2_gm_pct / 100)
+        t1_gp = t1_revenue * (t1_gm_pct / 100)
+        gross_profit = t1_gp + t2_gp + t3_gp
+        out["T3_GrossProfit"] = t3_gp
+        out["T2_GrossProfit"] = t2_gp
+        out["T1_GrossProfit"] = t1_gp
+        out["GrossProfit"] = gross_profit
+
+        fixed_overhead = np.broadcast_to(fixed_oh_m / periods_per_year, total_revenue.shape)
+        var_overhead = (
+            t3_active * (voh_t3_k / 1000.0)
+            + t2_active * (voh_t2_k / 1000.0)
+            + t1_active * (voh_t1_k / 1000.0)
+        )
+        total_overhead = fixed_overhead + var_overhead
+        out["FixedOverhead"] = np.ascontiguousarray(fixed_overhead)
+        out["VarOverhead"] = var_overhead
+        out["TotalOverhead"] = total_overhead
+
+        operating_profit = gross_profit - total_overhead
+        out["OperatingProfit"] = operating_profit
+        out["OperatingMargin"] = np.where(total_revenue > 0, (operating_profit / total_revenue) * 100, np.nan)
+
+        out["ProfitPerProject_k"] = np.where(total_projects > 0, (operating_profit / total_projects) * 1000, np.nan)
+        out["OverheadPerProject_k"] = np.where(total_projects > 0, (total_overhead / total_projects) * 1000, np.nan)
+
+    return {col: out[col] for col in PORTFOLIO_COLUMNS}
+
+
+def project_portfolio_periods(years_, *inputs, resolution="monthly", curves=None, method="auto"):
+    """Tier model at sub-annual resolution with revenue spread over each build.
+
+    ``inputs`` are the 15 project_portfolio_batch inputs (scalars or length-N
+    arrays). Each year's project count (as in the annual model) starts evenly
+    across that year's periods; revenue and variable overhead are then
+    recognized along the tier's ``curves`` entry, a ``(shape, months)`` pair
+    (default DEFAULT_CURVES). Work still in progress at the end of the horizon
+    is not recognized.
+
+    Returns a dict keyed by PORTFOLIO_COLUMNS of ``(N, years_ * periods)``
+    arrays, all float64: project columns count starts per period. With every
+    duration at 0, summing each year's periods reproduces the annual model.
+    """
+    periods_per_year = RESOLUTIONS[resolution]
+    starts = period_demand(years_, inputs, periods_per_year)
+    return period_financials(inputs, starts, periods_per_year, curves, method)
+
+
+def period_labels(years_, resolution):
+    """Row labels such as "Y1 Q3" or "Y12 M07" (plain year numbers when annual)."""
+    periods_per_year = RESOLUTIONS[resolution]
+    if periods_per_year == 1:
+        return [str(y) for y in range(1, years_ + 1)]
+    prefix, width = ("Q", 1) if resolution == "quarterly" else ("M", 2)
+    return [f"Y{y} {prefix}{p:0{width}d}" for y in range(1, years_ + 1) for p in range(1, periods_per_year + 1)]
+
+
+def portfolio_periods(years_, inputs, resolution="monthly", curves=None):
+    """Single-scenario project_portfolio_periods as a DataFrame indexed by period label."""
+    import pandas as pd
+
+    batch = project_portfolio_periods(years_, *inputs, resolution=resolution, curves=curves)
+    return pd.DataFrame({col: batch[col][0] for col in PORTFOLIO_COLUMNS}, index=period_labels(years_, resolution))
@@ -0,0 +1,135 @@
+from projection.engine import INPUT_KEYS
+
+# Every key a saved scenario or scenario file row carries.
+SCENARIO_KEYS = ("years", "benchmark_op_margin") + INPUT_KEYS
+
+# Shop/crew capacity in projects started per year (0 = no limit) and the share
+# of the backlog cancelled per year. Presets that leave these out reset them.
+CAPACITY_DEFAULTS = dict(
+    cap_tier3=0,
+    cap_tier2=0,
+    cap_tier1=0,
+    backlog_decay=0,
+)
+
+# Preset scenarios offered as buttons under the chart.
+PRESETS = {
+    "Balanced Growth": dict(
+        years=10,
+        benchmark_op_margin=15,
+        tier3_revenue=21.8,
+        tier3_gm=25,
+        tier3_projects=20,
+        tier2_price=0.95,
+        tier2_gm=20,
+        tier2_projects0=15,
+        tier2_growth=12,
+        tier1_price=0.55,
+        tier1_gm=14,
+        tier1_projects0=25,
+        tier1_growth=15,
+        fixed_overhead=7.5,
+        voh_t3=40.0,
+        voh_t2=25.0,
+        voh_t1=20.0,
+    ),
+    "Premium Tilt (Tier 2-led)": dict(
+        years=10,
+        benchmark_op_margin=15,
+        tier3_revenue=21.8,
+        tier3_gm=25,
+        tier3_projects=20,
+        tier2_price=1.15,
+        tier2_gm=23,
+        tier2_projects0=18,
+        tier2_growth=18,
+        tier1_price=0.55,
+        tier1_gm=13,
+        tier1_projects0=15,
+        tier1_growth=8,
+        fixed_overhead=7.5,
+        voh_t3=40.0,
+        voh_t2=27.0,
+        voh_t1=20.0,
+    ),
+    "Tier 1 Blitz (Volume Risk)": dict(
+        years=10,
+        benchmark_op_margin=15,
+        tier3_revenue=21.8,
+        tier3_gm=25,
+        tier3_projects=20,
+        tier2_price=0.95,
+        tier2_gm=19,
+        tier2_projects0=10,
+        tier2_growth=8,
+        tier1_price=0.50,
+        tier1_gm=11,
+        tier1_projects0=35,
+        tier1_growth=28,
+        fixed_overhead=7.5,
+        voh_t3=40.0,
+        voh_t2=25.0,
+        voh_t1=22.0,
+    ),
+    "Efficiency First (Lower OH)": dict(
+        years=10,
+        benchmark_op_margin=15,
+        tier3_revenue=21.8,
+        tier3_gm=25,
+        tier3_projects=20,
+        tier2_price=0.95,
+        tier2_gm=21,
+        tier2_projects0=16,
+        tier2_growth=14,
+        tier1_price=0.55,
+        tier1_gm=14,
+        tier1_projects0=22,
+        tier1_growth=14,
+        fixed_overhead=6.5,
+        voh_t3=35.0,
+        voh_t2=20.0,
+        voh_t1=16.0,
+    ),
+    "Margin Rescue (Reprice/GM)": dict(
+        years=10,
+        benchmark_op_margin=16,
+        tier3_revenue=21.8,
+        tier3_gm=27,
+        tier3_projects=20,
+        tier2_price=1.05,
+        tier2_gm=25,
+        tier2_projects0=15,
+        tier2_growth=14,
+        tier1_price=0.60,
+        tier1_gm=17,
+        tier1_projects0=22,
+        tier1_growth=14,
+        fixed_overhead=7.5,
+        voh_t3=40.0,
+        voh_t2=25.0,
+        voh_t1=20.0,
+    ),
+    "Capacity-Constrained": dict(
+        years=10,
+        benchmark_op_margin=15,
+        tier3_revenue=21.8,
+        tier3_gm=25,
+        tier3_projects=20,
+        tier2_price=0.95,
+        tier2_gm=21,
+        tier2_projects0=16,
+        tier2_growth=12,
+        tier1_price=0.55,
+        tier1_gm=14,
+        tier1_projects0=18,
+        tier1_growth=8,
+        fixed_overhead=7.5,
+        voh_t3=40.0,
+        voh_t2=25.0,
+        voh_t1=20.0,
+        cap_tier3=20,
+        cap_tier2=30,
+        cap_tier1=30,
+        backlog_decay=10,
+    ),
+}
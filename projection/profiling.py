@@ -0,0 +1,115 @@
+"""Opt-in timing of the phases of a page rerun.
+
+Profiling is off unless the ``FORECAST_PROFILE`` environment variable is set
+when the app starts:
+
+    FORECAST_PROFILE=1      wall time per phase
+    FORECAST_PROFILE=alloc  wall time plus tracemalloc allocations per phase
+                            (tracemalloc slows Python-heavy phases noticeably,
+                            and its counters are process-wide, so allocation
+                            figures only make sense with one active session)
+
+``FORECAST_PROFILE_LOG=path.jsonl`` additionally appends one JSON line per
+rerun. A disabled profiler's ``phase`` is a shared no-op context manager, so
+leaving the hooks in the page costs nothing.
+"""
+
+import contextlib
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+_NULL_PHASE = contextlib.nullcontext()
+
+
+class RerunProfiler:
+    """Wall time (and optionally allocations) per named phase of one rerun.
+
+    Repeated phases with the same name accumulate, so a page that draws two
+    charts reports one ``plotly_chart`` row with ``calls == 2``. Phases must
+    not nest.
+    """
+
+    def __init__(self, enabled=False, allocations=False, log_path=None):
+        self.enabled = enabled
+        self.allocations = enabled and allocations
+        self.log_path = log_path
+        self._phases = {}
+        self._open = None
+        self._started = time.perf_counter()
+
+    def start(self, name):
+        if not self.enabled:
+            return
+        if self._open is not None:
+            raise RuntimeError(f"phase {self._open[0]!r} is still open")
+        alloc_start = None
+        if self.allocations:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            alloc_start = tracemalloc.get_traced_memory()[0]
+        self._open = (name, time.perf_counter(), alloc_start)
+
+    def stop(self):
+        if not self.enabled or self._open is None:
+            return
+        name, t0, alloc_start = self._open
+        elapsed = time.perf_counter() - t0
+        self._open = None
+        row = self._phases.setdefault(name, {"phase": name, "seconds": 0.0, "calls": 0})
+        row["seconds"] += elapsed
+        row["calls"] += 1
+        if alloc_start is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            row["alloc_peak_kb"] = max(row.get("alloc_peak_kb", 0.0), (peak - alloc_start) / 1024)
+            row["alloc_net_kb"] = row.get("alloc_net_kb", 0.0) + (current - alloc_start) / 1024
+
+    def phase(self, name):
+        """Context manager timing the enclosed block as ``name``."""
+        if not self.enabled:
+            return _NULL_PHASE
+        return self._phase(name)
+
+    @contextlib.contextmanager
+    def _phase(self, name):
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop()
+
+    def records(self):
+        """Phase rows in the order they first ran."""
+        return [dict(row) for row in self._phases.values()]
+
+    def total_seconds(self):
+        """Wall time since the profiler was created."""
+        return time.perf_counter() - self._started
+
+    def write_log(self, **context):
+        """Append this rerun to ``log_path`` as one JSON line (if logging)."""
+        if not self.enabled or not self.log_path:
+            return
+        entry = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "total_seconds": self.total_seconds(),
+            **context,
+            "phases": self.records(),
+        }
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+
+
+def profiler_from_env(environ=None):
+    """RerunProfiler configured from FORECAST_PROFILE / FORECAST_PROFILE_LOG."""
+    environ = os.environ if environ is None else environ
+    mode = environ.get("FORECAST_PROFILE", "").strip().lower()
+    enabled = mode not in ("", "0", "false", "no", "off")
+    return RerunProfiler(
+        enabled=enabled,
+        allocations=mode == "alloc",
+        log_path=environ.get("FORECAST_PROFILE_LOG") or None,
+    )
@@ -0,0 +1,136 @@
+import contextlib
+from functools import cached_property
+
+from projection.cache import (
+    BASELINE_CACHE,
+    CAPACITY_CACHE,
+    GRAPH_CACHE,
+    PERIOD_CACHE,
+    REQUIRED_CACHE,
+    SCENARIO_CACHE,
+    baseline_key,
+    scenario_key,
+)
+from projection.capacity import portfolio_capacity
+from projection.engine import GROWTH_KEYS, INPUT_KEYS, ModelGraph, portfolio_with_cumulative
+from projection.periods import portfolio_periods
+from projection.solver import REQUIRED_COLUMNS, required_scale_to_hit_benchmark
+
+# Derived quantities, cheapest first; each is computed on first access.
+LAZY_FIELDS = ("scenario", "below_benchmark", "baseline", "crossover_year", "with_required")
+
+_VOH = tuple(INPUT_KEYS.index(k) for k in ("voh_t3", "voh_t2", "voh_t1"))
+
+
+class ScenarioResult:
+    """One rerun's view of a scenario, computed only as far as it is read.
+
+    Every field in LAZY_FIELDS is a memoized property: the page asks for what
+    the selected chart and the insights panel need, and nothing else runs
+    (the Revenue Mix tab never solves for the required scale, for example).
+    The frames come from the shared caches and must be treated as read-only.
+    ``profiler`` (a RerunProfiler) times the model calls when given.
+
+    ``session`` is an optional id (one per browser session) under which the
+    scenario and baseline are held as ModelGraphs in GRAPH_CACHE. A cache
+    miss then updates the graph from that session's last run and recomputes
+    only the series downstream of the inputs that changed.
+    """
+
+    def __init__(self, years_, inputs, bm_pct, profiler=None, session=None):
+        self.years = int(years_)
+        self.inputs = tuple(inputs)
+        self.bm_pct = bm_pct
+        self._profiler = profiler
+        self._session = session
+
+    def _phase(self, name):
+        return self._profiler.phase(name) if self._profiler is not None else contextlib.nullcontext()
+
+    @cached_property
+    def key(self):
+        """Cache key for everything derived from this scenario and benchmark."""
+        return scenario_key(self.years, self.inputs) + (self.bm_pct,)
+
+    def _frame(self, name, inputs):
+        """portfolio_with_cumulative for ``inputs``, via the session's ``name`` graph if there is a session."""
+        if self._session is None:
+            return portfolio_with_cumulative(self.years, inputs)
+        values = dict(zip(INPUT_KEYS, inputs))
+        key = (self._session, name)
+        graph = GRAPH_CACHE.get(key)
+        if graph is None:
+            graph = ModelGraph(self.years, values)
+        else:
+            graph.update(self.years, values)
+        frame = graph.frame()
+        GRAPH_CACHE.put(key, graph)  # re-sized: the update dropped nodes and frame() filled them
+        return frame
+
+    def computed(self):
+        """Names of the LAZY_FIELDS evaluated so far."""
+        return [name for name in LAZY_FIELDS if name in self.__dict__]
+
+    @cached_property
+    def scenario(self):
+        """Model frame with CumulativeOperatingProfit and ProductRevenue."""
+        with self._phase("scenario"):
+            return SCENARIO_CACHE.get_or_compute(
+                scenario_key(self.years, self.inputs),
+                lambda: self._frame("scenario", self.inputs),
+            )
+
+    @cached_property
+    def baseline(self):
+        """Same scenario with Tier 1 and Tier 2 held flat (no growth)."""
+        baseline_inputs = tuple(0 if k in GROWTH_KEYS else v for k, v in zip(INPUT_KEYS, self.inputs))
+        with self._phase("baseline"):
+            return BASELINE_CACHE.get_or_compute(
+                baseline_key(self.years, self.inputs),
+                lambda: self._frame("baseline", baseline_inputs),
+            )
+
+    @cached_property
+    def below_benchmark(self):
+        """Rows of ``scenario`` whose operating margin misses the benchmark."""
+        scenario = self.scenario
+        return scenario[scenario["OperatingMargin"] < self.bm_pct]
+
+    @cached_property
+    def crossover_year(self):
+        """First year cumulative profit reaches the baseline's, or None."""
+        scenario, baseline = self.scenario, self.baseline
+        candidates = scenario[scenario["CumulativeOperatingProfit"] >= baseline["CumulativeOperatingProfit"]]
+        return int(candidates.index[0]) if not candidates.empty else None
+
+    @cached_property
+    def with_required(self):
+        """``scenario`` plus the REQUIRED_COLUMNS at the benchmark margin."""
+        scenario = self.scenario
+
+        def solve():
+            voh = [self.inputs[i] for i in _VOH]
+            required = required_scale_to_hit_benchmark(scenario, self.bm_pct, *voh)
+            return scenario.assign(**{col: required[col] for col in REQUIRED_COLUMNS})
+
+        with self._phase("required_scale"):
+            return REQUIRED_CACHE.get_or_compute(self.key, solve)
+
+    def periods(self, resolution, curves):
+        """Sub-annual frame (see portfolio_periods); ``curves`` maps tier to (shape, months)."""
+        curves = tuple(sorted(curves.items()))
+        with self._phase("periods"):
+            return PERIOD_CACHE.get_or_compute(
+                scenario_key(self.years, self.inputs) + (resolution, curves),
+                lambda: portfolio_periods(self.years, self.inputs, resolution, dict(curves)),
+            )
+
+    def capacity(self, resolution, curves, capacity, decay):
+        """Capacity-constrained frame (see portfolio_capacity); ``capacity`` maps tier to projects a year."""
+        curves = tuple(sorted(curves.items()))
+        capacity = tuple(sorted(capacity.items()))
+        with self._phase("capacity"):
+            return CAPACITY_CACHE.get_or_compute(
+                scenario_key(self.years, self.inputs) + (resolution, curves, capacity, decay),
+                lambda: portfolio_capacity(self.years, self.inputs, dict(capacity), decay, resolution, dict(curves)),
+            )
@@ -0,0 +1,56 @@
+import numpy as np
+
+from projection.engine import INPUT_KEYS, INTEGER_KEYS
+from projection.metrics import evaluate_summary
+
+# Everything project_portfolio takes: the horizon plus the 15 model inputs.
+SENSITIVITY_KEYS = ("years",) + INPUT_KEYS
+
+TORNADO_METRICS = ("FinalOperatingMargin", "CumulativeOperatingProfit", "CrossoverYear")
+
+
+def tornado(years_, inputs, bm_pct, pct=10.0):
+    """One-at-a-time +/-pct sensitivity of the summary metrics.
+
+    Row 0 is the base case, then each SENSITIVITY_KEYS entry scaled by
+    ``1 - pct/100`` and ``1 + pct/100``; all 2K+1 runs (and their baselines)
+    go through a single batched evaluation. Whole-number inputs and the
+    horizon are rounded after perturbing.
+
+    Returns ``{"base": {metric: float}, "low": {metric: (K,)},
+    "high": {metric: (K,)}, "low_value": (K,), "high_value": (K,)}`` with K
+    in SENSITIVITY_KEYS order. A missing crossover is reported as one year
+    past the run's horizon so it still ranks.
+    """
+    base = np.array([years_] + [inputs[k] for k in INPUT_KEYS], dtype=float)
+    k = len(SENSITIVITY_KEYS)
+    factors = np.array([1 - pct / 100.0, 1 + pct / 100.0])
+
+    table = np.repeat(base[None, :], 1 + 2 * k, axis=0)
+    idx = np.arange(k)
+    table[1 + 2 * idx, idx] *= factors[0]
+    table[2 + 2 * idx, idx] *= factors[1]
+
+    for j, key in enumerate(SENSITIVITY_KEYS):
+        if key == "years" or key in INTEGER_KEYS:
+            table[:, j] = np.round(table[:, j])
+    table[:, 0] = np.maximum(table[:, 0], 1)
+    horizons = table[:, 0].astype(np.int64)
+
+    params = {key: table[:, j + 1] for j, key in enumerate(INPUT_KEYS)}
+    summary = evaluate_summary(int(horizons.max()), params, bm_pct, horizons=horizons)
+    summary["CrossoverYear"] = np.where(np.isnan(summary["CrossoverYear"]), horizons + 1, summary["CrossoverYear"])
+
+    return {
+        "base": {m: float(summary[m][0]) for m in TORNADO_METRICS},
+        "low": {m: summary[m][1::2] for m in TORNADO_METRICS},
+        "high": {m: summary[m][2::2] for m in TORNADO_METRICS},
+        "low_value": table[1 + 2 * idx, idx],
+        "high_value": table[2 + 2 * idx, idx],
+    }
+
+
+def rank_by_impact(result, metric):
+    """SENSITIVITY_KEYS indices ordered by |high - low| swing, largest first."""
+    swing = np.abs(result["high"][metric] - result["low"][metric])
+    return np.argsort(-swing, kind="stable")
@@ -0,0 +1,81 @@
+import numpy as np
+
+# Below this |denominator| scaling Tier 1+2 no longer moves the margin
+# toward the benchmark, so there is no finite required scale.
+DENOM_EPS = 1e-9
+
+REQUIRED_COLUMNS = (
+    "RequiredScaleK",
+    "RequiredProductRevenueAtBenchmark",
+    "AdditionalProductRevenueNeeded",
+    "RequiredT1Projects",
+    "RequiredT2Projects",
+)
+
+
+def _per_scenario(x, ndim):
+    """Shape a scalar or length-N input so it broadcasts against the series."""
+    a = np.asarray(x, dtype=float)
+    if ndim == 2 and a.ndim == 1:
+        a = a[:, None]
+    return a
+
+
+def required_scale_to_hit_benchmark(result, bm_pct, voh_t3_k, voh_t2_k, voh_t1_k):
+    """Closed-form scale on Tier 1+2 volume needed to reach the benchmark margin.
+
+    Scaling Tier 1 and Tier 2 project counts together by ``k`` (prices and
+    margins unchanged) gives
+
+        margin(k) = (B + k * (GP - VOH)) / (A + k * R)
+
+    where ``A``/``B`` are the Tier 3 revenue and Tier 3 contribution after
+    fixed overhead, and ``R``/``GP``/``VOH`` are Tier 1+2 revenue, gross profit
+    and variable overhead. Solving ``margin(k) = bm`` gives
+    ``k = (bm * A - B) / ((GP - VOH) - bm * R)``.
+
+    ``result`` is either the dict returned by ``project_portfolio_batch``
+    (``(N, years)`` arrays) or a single-scenario frame (``(years,)`` columns).
+    ``bm_pct`` and the variable overheads are scalars or length-N arrays.
+    Where the denominator is within ``DENOM_EPS`` of zero the scale is NaN;
+    negative scales are clipped to 0 (the benchmark is already met with no
+    product volume).
+    """
+    t1_projects = np.asarray(result["T1_Projects"], dtype=float)
+    ndim = t1_projects.ndim
+    bm = _per_scenario(bm_pct, ndim) / 100.0
+    voh_t3_k = _per_scenario(voh_t3_k, ndim)
+    voh_t2_k = _per_scenario(voh_t2_k, ndim)
+    voh_t1_k = _per_scenario(voh_t1_k, ndim)
+
+    t2_projects = np.asarray(result["T2_Projects"], dtype=float)
+    t1_revenue = np.asarray(result["T1_Revenue"], dtype=float)
+    t2_revenue = np.asarray(result["T2_Revenue"], dtype=float)
+
+    A = np.asarray(result["T3_Revenue"], dtype=float)
+    B = (
+        np.asarray(result["T3_GrossProfit"], dtype=float)
+        - np.asarray(result["FixedOverhead"], dtype=float)
+        - (np.asarray(result["T3_Projects"], dtype=float) * (voh_t3_k / 1000.0))
+    )
+
+    R = t1_revenue + t2_revenue
+    GP = np.asarray(result["T1_GrossProfit"], dtype=float) + np.asarray(result["T2_GrossProfit"], dtype=float)
+    VOH = (t1_projects * (voh_t1_k / 1000.0)) + (t2_projects * (voh_t2_k / 1000.0))
+
+    denom = (GP - VOH) - bm * R
+    numer = bm * A - B
+
+    solvable = np.abs(denom) >= DENOM_EPS
+    k = np.full(np.broadcast(numer, denom).shape, np.nan)
+    np.divide(numer, denom, out=k, where=solvable)
+    k = np.where(solvable, np.maximum(k, 0.0), np.nan)
+
+    required_revenue = R * k
+    return {
+        "RequiredScaleK": k,
+        "RequiredProductRevenueAtBenchmark": required_revenue,
+        "AdditionalProductRevenueNeeded": np.maximum(required_revenue - R, 0.0),
+        "RequiredT1Projects": t1_projects * k,
+        "RequiredT2Projects": t2_projects * k,
+    }
@@ -0,0 +1,315 @@
+"""Named scenarios saved to a local SQLite database, with their results.
+
+Results are stored once per distinct parameter set, under a hash of the
+canonical (rounded) parameter values, so saving a duplicate or reopening a
+saved scenario is a lookup rather than a model run. Each result row carries
+the SUMMARY_METRICS as indexed columns for filtering and the per-year
+STORE_SERIES as one float64 blob.
+
+    store = ScenarioStore("scenarios.db")
+    store.save({"Board plan": params})
+    store.list_scenarios({"MinOperatingMargin": (15, None)})
+
+Bulk import and export from the command line (files as read by the batch CLI):
+
+    python -m projection.store import sweep.parquet --db scenarios.db
+    python -m projection.store export good.csv --min MinOperatingMargin=15
+"""
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timezone
+
+import numpy as np
+
+from projection.cache import scenario_key
+from projection.cli import SERIES_COLUMNS, read_scenarios
+from projection.engine import GROWTH_KEYS, INPUT_KEYS, project_portfolio_batch
+from projection.export import write_chunks
+from projection.metrics import SUMMARY_METRICS, summarize_batch
+from projection.presets import SCENARIO_KEYS
+from projection.solver import REQUIRED_COLUMNS, required_scale_to_hit_benchmark
+
+STORE_SERIES = SERIES_COLUMNS + ("BaselineCumulativeOperatingProfit",)
+
+# Database the page saves to unless FORECAST_STORE names another.
+DEFAULT_STORE_PATH = "scenarios.db"
+
+# Scenarios evaluated per model call and rows per executemany when saving.
+SAVE_CHUNK = 10_000
+
+# SQLite caps bound parameters per statement (32766 since 3.32; 999 before).
+_IN_CHUNK = 900
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    param_hash TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    years INTEGER NOT NULL,
+    {", ".join(f"{m} REAL" for m in SUMMARY_METRICS)},
+    series BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scenarios (
+    name TEXT PRIMARY KEY,
+    param_hash TEXT NOT NULL REFERENCES results(param_hash),
+    saved_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scenarios_by_hash ON scenarios(param_hash);
+{"".join(f"CREATE INDEX IF NOT EXISTS results_by_{m} ON results({m});" for m in SUMMARY_METRICS)}
+"""
+
+
+def param_hash(params):
+    """Canonical hash of a parameter set (every SCENARIO_KEYS entry)."""
+    key = scenario_key(params["years"], [params[k] for k in SCENARIO_KEYS[1:]])
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()[:32]
+
+
+def evaluate_params(params_list):
+    """Summary metrics and STORE_SERIES for parameter sets, in one batch.
+
+    Returns ``(summary, series)``: SUMMARY_METRICS to ``(N,)`` arrays and
+    STORE_SERIES to ``(N, years)`` arrays at the longest horizon (rows past
+    their own horizon are meaningless and dropped when stored).
+    """
+    values = {k: np.array([float(p[k]) for p in params_list]) for k in SCENARIO_KEYS}
+    horizons = values["years"].astype(np.int64)
+    bm = values["benchmark_op_margin"]
+    years_ = int(horizons.max())
+    scenario = project_portfolio_batch(years_, *[values[k] for k in INPUT_KEYS])
+    baseline = project_portfolio_batch(years_, *[0 if k in GROWTH_KEYS else values[k] for k in INPUT_KEYS])
+    summary = summarize_batch(scenario, baseline, bm, horizons)
+
+    scenario["CumulativeOperatingProfit"] = np.cumsum(scenario["OperatingProfit"], axis=1)
+    scenario["BaselineCumulativeOperatingProfit"] = np.cumsum(baseline["OperatingProfit"], axis=1)
+    required = required_scale_to_hit_benchmark(scenario, bm, values["voh_t3"], values["voh_t2"], values["voh_t1"])
+    scenario.update({col: required[col] for col in REQUIRED_COLUMNS})
+    return summary, {col: scenario[col] for col in STORE_SERIES}
+
+
+class ScenarioStore:
+    """SQLite-backed scenario library shared by every session in the process.
+
+    One connection is opened per store and reused for every call (guarded by
+    a lock, since Streamlit runs sessions on separate threads); writes go in
+    a single transaction per call with ``executemany``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _existing_hashes(self, hashes):
+        found = set()
+        hashes = list(hashes)
+        for start in range(0, len(hashes), _IN_CHUNK):
+            chunk = hashes[start:start + _IN_CHUNK]
+            rows = self._conn.execute(
+                f"SELECT param_hash FROM results WHERE param_hash IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update(h for (h,) in rows)
+        return found
+
+    def save(self, scenarios):
+        """Save ``{name: params}``, replacing scenarios of the same name.
+
+        Only parameter sets the store has not seen are evaluated, in batches
+        of SAVE_CHUNK. Returns the number of new results computed.
+        """
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        hashes = {name: param_hash(params) for name, params in scenarios.items()}
+        with self._lock:
+            known = self._existing_hashes(set(hashes.values()))
+            missing = {}
+            for name, h in hashes.items():
+                if h not in known:
+                    missing.setdefault(h, scenarios[name])
+            items = list(missing.items())
+            with self._conn:
+                for start in range(0, len(items), SAVE_CHUNK):
+                    chunk = items[start:start + SAVE_CHUNK]
+                    summary, series = evaluate_params([p for _, p in chunk])
+                    self._conn.executemany(
+                        f"INSERT OR IGNORE INTO results VALUES ({','.join('?' * (4 + len(SUMMARY_METRICS)))})",
+                        (
+                            (
+                                h,
+                                json.dumps({k: float(p[k]) for k in SCENARIO_KEYS}),
+                                int(p["years"]),
+                                *(None if np.isnan(summary[m][i]) else float(summary[m][i]) for m in SUMMARY_METRICS),
+                                np.stack([series[col][i, :int(p["years"])] for col in STORE_SERIES]).tobytes(),
+                            )
+                            for i, (h, p) in enumerate(chunk)
+                        ),
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO scenarios VALUES (?, ?, ?)",
+                    ((name, h, now) for name, h in hashes.items()),
+                )
+        return len(items)
+
+    def delete(self, names):
+        """Remove saved names; results no scenario refers to are dropped too."""
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM scenarios WHERE name = ?", ((n,) for n in names))
+            self._conn.execute("DELETE FROM results WHERE param_hash NOT IN (SELECT param_hash FROM scenarios)")
+
+    def names(self):
+        """Saved scenario names, most recent first."""
+        with self._lock:
+            return [n for (n,) in self._conn.execute("SELECT name FROM scenarios ORDER BY saved_at DESC, name")]
+
+    def list_scenarios(self, filters=None, limit=None):
+        """Saved scenarios with their parameters and summary metrics.
+
+        ``filters`` maps SUMMARY_METRICS names to ``(low, high)`` inclusive
+        bounds, either of which may be None. Returns a DataFrame indexed by
+        name, most recent first.
+        """
+        import pandas as pd
+
+        where, args = [], []
+        for metric, (low, high) in (filters or {}).items():
+            if metric not in SUMMARY_METRICS:
+                raise ValueError(f"unknown metric {metric!r}; expected one of {SUMMARY_METRICS}")
+            if low is not None:
+                where.append(f"r.{metric} >= ?")
+                args.append(low)
+            if high is not None:
+                where.append(f"r.{metric} <= ?")
+                args.append(high)
+        sql = (
+            f"SELECT s.name, s.saved_at, r.params, {', '.join('r.' + m for m in SUMMARY_METRICS)} "
+            "FROM scenarios s JOIN results r USING (param_hash)"
+            + (f" WHERE {' AND '.join(where)}" if where else "")
+            + " ORDER BY s.saved_at DESC, s.name"
+            + (" LIMIT ?" if limit is not None else "")
+        )
+        if limit is not None:
+            args.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        columns = ["name", "saved_at", *SCENARIO_KEYS, *SUMMARY_METRICS]
+        records = [(name, saved_at, *json.loads(params).values(), *metrics) for name, saved_at, params, *metrics in rows]
+        return pd.DataFrame.from_records(records, columns=columns).set_index("name")
+
+    def load(self, names):
+        """``{name: {"params", "series", "summary"}}`` for saved names, without recomputing.
+
+        ``series`` maps STORE_SERIES to ``(years,)`` arrays; unknown names
+        are left out.
+        """
+        names = list(names)
+        out = {}
+        with self._lock:
+            for start in range(0, len(names), _IN_CHUNK):
+                chunk = names[start:start + _IN_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT s.name, r.params, r.years, {', '.join('r.' + m for m in SUMMARY_METRICS)}, r.series "
+                    f"FROM scenarios s JOIN results r USING (param_hash) WHERE s.name IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for name, params, years_, *metrics, blob in rows:
+                    series = np.frombuffer(blob, dtype=np.float64).reshape(len(STORE_SERIES), years_)
+                    out[name] = {
+                        "params": json.loads(params),
+                        "series": dict(zip(STORE_SERIES, series)),
+                        "summary": {m: np.nan if v is None else v for m, v in zip(SUMMARY_METRICS, metrics)},
+                    }
+        return {name: out[name] for name in names if name in out}
+
+    def import_file(self, path, fmt=None, chunk_size=SAVE_CHUNK):
+        """Save every row of a scenario file (as read by the batch CLI).
+
+        Rows are named by their ``scenario`` column, or "row N" without one.
+        Returns the number of rows saved.
+        """
+        total = 0
+        for chunk in read_scenarios(path, chunk_size, fmt):
+            missing = [k for k in SCENARIO_KEYS if k not in chunk]
+            if missing:
+                raise ValueError(f"scenario file has no {missing[0]!r} column")
+            names = (
+                chunk["scenario"].astype(str).tolist() if "scenario" in chunk
+                else [f"row {total + i + 1}" for i in range(len(chunk))]
+            )
+            records = chunk[list(SCENARIO_KEYS)].to_dict("records")
+            self.save(dict(zip(names, records)))
+            total += len(chunk)
+        return total
+
+    def export_file(self, path, fmt=None, filters=None):
+        """Write saved scenarios (parameters and summary metrics) to CSV, JSONL, Parquet or Excel.
+
+        The output has a ``scenario`` name column, so it can be imported
+        again or run through the batch CLI.
+        """
+        frame = self.list_scenarios(filters).drop(columns="saved_at").rename_axis("scenario").reset_index()
+        return write_chunks([frame], path, fmt)
+
+
+@functools.cache
+def open_store(path=None):
+    """Process-wide ScenarioStore at ``path`` (default: FORECAST_STORE or DEFAULT_STORE_PATH)."""
+    return ScenarioStore(path or os.environ.get("FORECAST_STORE") or DEFAULT_STORE_PATH)
+
+
+def _bound(text):
+    metric, _, value = text.partition("=")
+    if metric not in SUMMARY_METRICS or not value:
+        raise argparse.ArgumentTypeError(f"expected METRIC=VALUE with METRIC one of {', '.join(SUMMARY_METRICS)}")
+    return metric, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m projection.store", description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("import", "export", "list"))
+    parser.add_argument("path", nargs="?", help="scenario file to import, or export destination ('-' for stdout)")
+    parser.add_argument("--db", help=f"database file (default: FORECAST_STORE or {DEFAULT_STORE_PATH})")
+    parser.add_argument("--format", help="file format, if the extension doesn't say")
+    parser.add_argument("--min", type=_bound, action="append", default=[], metavar="METRIC=VALUE")
+    parser.add_argument("--max", type=_bound, action="append", default=[], metavar="METRIC=VALUE")
+    args = parser.parse_args(argv)
+
+    filters = {}
+    for metric, value in args.min:
+        filters[metric] = (value, filters.get(metric, (None, None))[1])
+    for metric, value in args.max:
+        filters[metric] = (filters.get(metric, (None, None))[0], value)
+
+    store = open_store(args.db)
+    try:
+        if args.command == "import":
+            if not args.path:
+                parser.error("import needs a scenario file")
+            print(f"{store.import_file(args.path, args.format)} scenarios saved", file=sys.stderr)
+        elif args.command == "export":
+            print(f"{store.export_file(args.path or '-', args.format, filters)} scenarios exported", file=sys.stderr)
+        else:
+            print(store.list_scenarios(filters).to_string())
+    except ValueError as exc:
+        raise SystemExit(f"error: {exc}") from None
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head); not an error.
+        sys.stdout = None
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
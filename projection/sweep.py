@@ -0,0 +1,101 @@
+import numpy as np
+
+from projection.engine import INPUT_BOUNDS, INTEGER_KEYS
+from projection.metrics import SUMMARY_METRICS, evaluate_summary
+
+# Anything with sidebar bounds can go on a heatmap axis: the horizon plus
+# the 15 model inputs.
+SWEEP_KEYS = tuple(INPUT_BOUNDS)
+
+
+def axis_values(key, n, value_range=None):
+    """``n`` evenly spaced values for ``key``, ascending.
+
+    Whole-number inputs are rounded, and get at most one point per whole
+    number in the range (a 201-point grid over 5-15 years has 11), so no
+    grid row or column repeats another.
+    """
+    lo, hi = value_range if value_range is not None else INPUT_BOUNDS[key]
+    if key == "years" or key in INTEGER_KEYS:
+        return np.unique(np.round(np.linspace(lo, hi, min(n, int(hi - lo) + 1))))
+    return np.linspace(lo, hi, n)
+
+
+def _shared(previous, values):
+    """Positions in ``values`` of points also in ``previous``, and theirs in ``previous``."""
+    pos = np.searchsorted(previous, values).clip(0, len(previous) - 1)
+    hit = np.isclose(previous[pos], values, rtol=1e-12, atol=1e-12)
+    return np.nonzero(hit)[0], pos[hit]
+
+
+def evaluate_cells(years_, inputs, bm_pct, x_key, x_values, y_key, y_values):
+    """Summary metrics for M (x, y) cells, as flat (M,) arrays."""
+    params = dict(inputs)
+    horizons = None
+    for key, values in ((x_key, x_values), (y_key, y_values)):
+        if key == "years":
+            horizons = np.asarray(values, dtype=np.int64)
+            years_ = int(horizons.max())
+        else:
+            params[key] = np.asarray(values, dtype=float)
+    return evaluate_summary(years_, params, bm_pct, horizons=horizons)
+
+
+def progressive_sweep(
+    years_,
+    inputs,
+    bm_pct,
+    x_key,
+    y_key,
+    x_range=None,
+    y_range=None,
+    coarse=26,
+    passes=4,
+):
+    """Evaluate an x_key by y_key grid in successively finer passes.
+
+    Pass ``i`` has ``(coarse - 1) * 2**i + 1`` points per axis (fewer on a
+    whole-number axis with a short range, see axis_values), so earlier grid
+    points land on the next grid: each pass copies the cells it already has
+    and evaluates only the new ones, all in one batch. The defaults end on a
+    201 x 201 grid.
+
+    Yields ``{"x": (nx,), "y": (ny,), "metrics": {metric: (ny, nx)},
+    "pass": i, "passes": passes, "progress": share of the final grid's
+    cells}`` after every pass.
+    """
+    if x_key == y_key:
+        raise ValueError("x_key and y_key must differ")
+    if coarse < 2 or passes < 1:
+        raise ValueError("need coarse >= 2 and passes >= 1")
+
+    final = (coarse - 1) * 2 ** (passes - 1) + 1
+    final_cells = axis_values(x_key, final, x_range).size * axis_values(y_key, final, y_range).size
+    x = y = grids = None
+    for i in range(passes):
+        n = (coarse - 1) * 2**i + 1
+        new_x = axis_values(x_key, n, x_range)
+        new_y = axis_values(y_key, n, y_range)
+        finer = {m: np.empty((new_y.size, new_x.size)) for m in SUMMARY_METRICS}
+        todo = np.ones((new_y.size, new_x.size), dtype=bool)
+        if grids is not None:
+            # Copy the cells both grids share; only the rest are evaluated.
+            cols, prev_cols = _shared(x, new_x)
+            rows, prev_rows = _shared(y, new_y)
+            for m in SUMMARY_METRICS:
+                finer[m][np.ix_(rows, cols)] = grids[m][np.ix_(prev_rows, prev_cols)]
+            todo[np.ix_(rows, cols)] = False
+        x, y, grids = new_x, new_y, finer
+
+        rows, cols = np.nonzero(todo)
+        if rows.size:
+            cells = evaluate_cells(years_, inputs, bm_pct, x_key, x[cols], y_key, y[rows])
+            for m in SUMMARY_METRICS:
+                grids[m][rows, cols] = cells[m]
+        yield {"x": x, "y": y, "metrics": grids, "pass": i, "passes": passes, "progress": x.size * y.size / final_cells}
+
+
+def iter_sweep_progress(*args, **kwargs):
+    """progressive_sweep as ``(fraction_done, sweep)`` pairs (share of final-grid cells evaluated)."""
+    for sweep in progressive_sweep(*args, **kwargs):
+        yield sweep["progress"], sweep
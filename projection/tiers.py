@@ -0,0 +1,184 @@
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from projection.engine import INPUT_KEYS
+
+# Per-tier series returned by project_tiers, each (N, tiers, years).
+TIER_SERIES = ("Projects", "Revenue", "Share", "GrossProfit", "VarOverhead")
+
+# Portfolio totals returned by project_tiers, each (N, years).
+TOTAL_SERIES = (
+    "TotalProjects",
+    "TotalRevenue",
+    "GrossProfit",
+    "FixedOverhead",
+    "VarOverhead",
+    "TotalOverhead",
+    "OperatingProfit",
+    "OperatingMargin",
+    "ProfitPerProject_k",
+    "OverheadPerProject_k",
+)
+
+# The page's three tiers, in engine column order, with their column prefixes.
+LEGACY_TIERS = (("Tier 3", "T3"), ("Tier 2", "T2"), ("Tier 1", "T1"))
+
+
+@dataclass(frozen=True)
+class TierTable:
+    """Product lines as a data axis: one entry per tier in every field.
+
+    Each numeric field is a ``(tiers,)`` array shared by all scenarios or a
+    ``(scenarios, tiers)`` array. A growing tier books ``projects0`` projects
+    in year 1, compounding at ``growth_pct`` a year (rounded to whole
+    projects), at ``price_m`` each. A ``hold_constant`` tier keeps
+    ``projects0`` projects and ``revenue_m`` of revenue (an annual total)
+    every year; its price and growth are ignored. ``gm_pct`` is gross margin
+    on revenue and ``voh_k`` variable overhead per project in $k.
+    """
+
+    names: tuple
+    price_m: np.ndarray
+    gm_pct: np.ndarray
+    projects0: np.ndarray
+    growth_pct: np.ndarray
+    voh_k: np.ndarray
+    hold_constant: np.ndarray
+    revenue_m: np.ndarray
+
+    def __post_init__(self):
+        object.__setattr__(self, "names", tuple(self.names))
+        for f in fields(self)[1:]:
+            dtype = bool if f.name == "hold_constant" else float
+            value = np.asarray(getattr(self, f.name), dtype=dtype)
+            if value.ndim not in (1, 2) or value.shape[-1] != len(self.names):
+                raise ValueError(f"{f.name} must have one value per tier ({len(self.names)}), got shape {value.shape}")
+            object.__setattr__(self, f.name, value)
+
+    @classmethod
+    def from_records(cls, records):
+        """Table from ``[{"name": ..., "price_m": ..., ...}, ...]`` rows (e.g. a DataFrame's records).
+
+        ``hold_constant`` and ``revenue_m`` default to False and 0.
+        """
+        rows = list(records)
+        defaults = {"hold_constant": False, "revenue_m": 0.0}
+        return cls(
+            names=[row["name"] for row in rows],
+            **{
+                f.name: [row.get(f.name, defaults.get(f.name)) for row in rows]
+                for f in fields(cls)[1:]
+            },
+        )
+
+    @classmethod
+    def from_inputs(cls, inputs):
+        """The page's three tiers (LEGACY_TIERS order) from an INPUT_KEYS mapping.
+
+        Values may be scalars or length-N arrays. Tier 3 is the held-constant
+        tier, so its price and growth are 0 and its revenue is ``tier3_revenue``.
+        """
+        n = max(np.size(inputs[k]) for k in INPUT_KEYS)
+
+        def per_tier(*values):
+            return np.stack([np.broadcast_to(np.asarray(v, dtype=float), (n,)) for v in values], axis=-1)
+
+        return cls(
+            names=[name for name, _ in LEGACY_TIERS],
+            price_m=per_tier(0.0, inputs["tier2_price"], inputs["tier1_price"]),
+            gm_pct=per_tier(inputs["tier3_gm"], inputs["tier2_gm"], inputs["tier1_gm"]),
+            projects0=per_tier(inputs["tier3_projects"], inputs["tier2_projects0"], inputs["tier1_projects0"]),
+            growth_pct=per_tier(0.0, inputs["tier2_growth"], inputs["tier1_growth"]),
+            voh_k=per_tier(inputs["voh_t3"], inputs["voh_t2"], inputs["voh_t1"]),
+            hold_constant=[True, False, False],
+            revenue_m=per_tier(inputs["tier3_revenue"], 0.0, 0.0),
+        )
+
+    @property
+    def scenarios(self):
+        """Rows of the per-scenario fields (1 if every field is shared)."""
+        return max((getattr(self, f.name).shape[0] for f in fields(self)[1:] if getattr(self, f.name).ndim == 2), default=1)
+
+    def __len__(self):
+        return len(self.names)
+
+
+def project_tiers(years_, tiers, fixed_oh_m):
+    """Evaluate the tier model for N scenarios and any number of tiers at once.
+
+    ``tiers`` is a TierTable; ``fixed_oh_m`` is a scalar or length-N array.
+    Every series is computed on a ``(scenarios, tiers, years)`` array, so the
+    cost grows with the array size rather than with code per tier.
+
+    Returns a dict with the TOTAL_SERIES as ``(N, years)`` arrays and, under
+    ``"tiers"``, the TIER_SERIES as ``(N, tiers, years)`` arrays (project
+    counts int64); N is the longest scenario axis among the inputs. Totals
+    follow the engine's formulas; for the three page tiers they match
+    ``project_portfolio_batch`` to rounding (summing over the tier axis can
+    change the last bit).
+    """
+    fixed = np.asarray(fixed_oh_m, dtype=float).reshape(-1, 1)
+    n = max(fixed.shape[0], tiers.scenarios)
+    shape = (n, len(tiers), int(years_))
+
+    def cube(values):
+        """(tiers,) or (N, tiers) field as an (N, tiers, 1) array."""
+        return np.broadcast_to(values, (n, len(tiers)))[:, :, None]
+
+    t = np.arange(int(years_))
+    hold = cube(tiers.hold_constant)
+    projects0 = cube(tiers.projects0)
+    grown = np.round(projects0 * ((1 + cube(tiers.growth_pct) / 100) ** t)).astype(np.int64)
+    projects = np.where(hold, projects0.astype(np.int64), grown)
+    revenue = np.where(hold, cube(tiers.revenue_m), projects * cube(tiers.price_m))
+    gross_profit = revenue * (cube(tiers.gm_pct) / 100)
+    var_overhead = projects * (cube(tiers.voh_k) / 1000.0)
+
+    total_projects = projects.sum(axis=1)
+    total_revenue = revenue.sum(axis=1)
+    out = {
+        "Projects": projects,
+        "Revenue": revenue,
+        "GrossProfit": gross_profit,
+        "VarOverhead": var_overhead,
+    }
+    totals = {
+        "TotalProjects": total_projects,
+        "TotalRevenue": total_revenue,
+        "GrossProfit": gross_profit.sum(axis=1),
+        "FixedOverhead": np.ascontiguousarray(np.broadcast_to(fixed, (n, shape[2]))),
+        "VarOverhead": var_overhead.sum(axis=1),
+    }
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["Share"] = (revenue / total_revenue[:, None, :]) * 100
+        totals["TotalOverhead"] = totals["FixedOverhead"] + totals["VarOverhead"]
+        totals["OperatingProfit"] = totals["GrossProfit"] - totals["TotalOverhead"]
+        totals["OperatingMargin"] = np.where(
+            total_revenue > 0, (totals["OperatingProfit"] / total_revenue) * 100, np.nan
+        )
+        totals["ProfitPerProject_k"] = np.where(
+            total_projects > 0, (totals["OperatingProfit"] / total_projects) * 1000, np.nan
+        )
+        totals["OverheadPerProject_k"] = np.where(
+            total_projects > 0, (totals["TotalOverhead"] / total_projects) * 1000, np.nan
+        )
+    return {"tiers": {k: out[k] for k in TIER_SERIES}, **totals}
+
+
+def tier_columns(result, prefixes):
+    """Flat per-tier columns (``T2_Revenue``-style) from a project_tiers result.
+
+    ``prefixes`` names each tier in table order. With LEGACY_TIERS' prefixes
+    the result has every PORTFOLIO_COLUMNS key except the per-tier variable
+    overhead, which the engine doesn't split out.
+    """
+    per_tier = result["tiers"]
+    if len(prefixes) != per_tier["Projects"].shape[1]:
+        raise ValueError(f"need one prefix per tier ({per_tier['Projects'].shape[1]}), got {len(prefixes)}")
+    columns = {}
+    for series in ("Projects", "Revenue", "Share", "GrossProfit"):
+        for i, prefix in enumerate(prefixes):
+            columns[f"{prefix}_{series}"] = per_tier[series][:, i]
+    columns.update({k: result[k] for k in TOTAL_SERIES})
+    return columns
@@ -0,0 +1,78 @@
+from pathlib import Path
+
+import pytest
+
+from projection import INPUT_KEYS
+from projection.result import ScenarioResult
+
+testing = pytest.importorskip("streamlit.testing.v1")
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+CHART_TABS = (
+    "Revenue Mix & Operating Margin",
+    "Margin Uncertainty",
+    "Required Product Volume",
+    "Baseline vs Expansion",
+    "Cumulative Profit Crossover",
+    "Capacity & Backlog",
+    "Sensitivity",
+    "Parameter Heatmap",
+    "Growth Plan Optimizer",
+    "Goal Seek",
+)
+
+
+@pytest.fixture(scope="module")
+def app():
+    at = testing.AppTest.from_file(APP, default_timeout=300)
+    at.run()
+    assert not at.exception
+    return at
+
+
+@pytest.mark.parametrize("compare", [False, True])
+@pytest.mark.parametrize("tab", CHART_TABS)
+def test_every_tab_renders(app, tab, compare):
+    app.radio(key="chart_tab").set_value(tab)
+    app.checkbox(key="compare_presets").set_value(compare)
+    app.run()
+
+    assert not app.exception, [e.value for e in app.exception]
+    assert app.get("plotly_chart")
+
+
+def test_timing_inputs_follow_resolution_without_apply(app):
+    app.selectbox(key="resolution").set_value("annual").run()
+    assert app.selectbox(key="recognition_shape").disabled
+    assert app.number_input(key="tier3_build_months").disabled
+
+    app.selectbox(key="resolution").set_value("monthly").run()
+    assert not app.selectbox(key="recognition_shape").disabled
+    assert not app.number_input(key="tier3_build_months").disabled
+    assert not app.exception
+
+
+def _plotly_chart(fig):
+    import streamlit as st
+
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def test_cached_charts_send_what_plotly_chart_would(app):
+    from charts import revenue_mix_figure
+
+    app.radio(key="chart_tab").set_value("Revenue Mix & Operating Margin")
+    app.checkbox(key="compare_presets").set_value(False)
+    app.selectbox(key="resolution").set_value("annual")
+    app.run()
+    state = app.session_state
+    result = ScenarioResult(state["years"], [state[k] for k in INPUT_KEYS], state["benchmark_op_margin"])
+    fig = revenue_mix_figure(result.scenario, result.below_benchmark, state["benchmark_op_margin"])
+    reference = testing.AppTest.from_function(_plotly_chart, args=(fig,))
+    reference.run()
+
+    sent = app.get("plotly_chart")[0].proto
+    expected = reference.get("plotly_chart")[0].proto
+    assert sent.spec == expected.spec
+    assert (sent.config, sent.theme, sent.use_container_width) == (expected.config, expected.theme, expected.use_container_width)
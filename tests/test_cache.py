@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from charts import heatmap_figure
+from projection.cache import LRUCache, nbytes_of
+
+
+def test_evicts_least_recent_once_maxbytes_is_exceeded():
+    cache = LRUCache(maxsize=10, maxbytes=3000)
+    for key in "abc":
+        cache.put(key, np.zeros(100))  # 800 bytes each
+    cache.get("a")
+    cache.put("d", np.zeros(100))
+
+    assert cache.nbytes == 2400
+    assert "b" not in cache
+    assert set(cache._data) == {"c", "a", "d"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_value_larger_than_budget_is_returned_but_not_kept():
+    cache = LRUCache(maxsize=10, maxbytes=1000)
+    cache.put("small", np.zeros(10))
+
+    value = cache.get_or_compute("big", lambda: np.zeros(1000))
+
+    assert value.shape == (1000,)
+    assert "big" not in cache
+    assert "small" in cache
+    assert cache.nbytes == 80
+
+
+def test_replacing_a_key_updates_its_size():
+    cache = LRUCache(maxsize=10, maxbytes=10_000)
+    cache.put("a", np.zeros(100))
+    cache.put("a", np.zeros(10))
+
+    assert len(cache) == 1
+    assert cache.nbytes == 80
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_figures_are_sized_by_their_trace_data():
+    n = 201
+    grid = np.zeros((n, n))
+    sweep = {"x": np.linspace(0, 60, n), "y": np.linspace(0, 40, n), "metrics": {"FinalOperatingMargin": grid}, "pass": 3, "passes": 4}
+    fig = heatmap_figure(sweep, "FinalOperatingMargin", "tier1_growth", "tier2_growth", {"tier1_growth": 18, "tier2_growth": 10})
+
+    assert nbytes_of(fig) >= grid.nbytes
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, PORTFOLIO_COLUMNS
+from projection.capacity import per_period_decay, project_portfolio_capacity, run_backlog
+from projection.periods import project_portfolio_periods
+from projection.presets import PRESETS
+
+INPUTS = [PRESETS["Balanced Growth"][k] for k in INPUT_KEYS]
+
+
+@pytest.mark.parametrize("resolution", ["annual", "quarterly", "monthly"])
+def test_unlimited_capacity_is_the_uncapped_period_model(resolution):
+    capped = project_portfolio_capacity(10, *INPUTS, capacity={"tier1": np.inf, "tier2": None}, resolution=resolution)
+    free = project_portfolio_periods(10, *INPUTS, resolution=resolution)
+
+    for col in PORTFOLIO_COLUMNS:
+        np.testing.assert_array_equal(capped[col], free[col], err_msg=col)
+    for tier in ("T3", "T2", "T1"):
+        assert not capped[f"{tier}_Backlog"].any()
+        assert np.isnan(capped[f"{tier}_Utilization"]).all()
+
+
+def test_a_binding_cap_queues_work_into_later_periods():
+    demand = np.array([[5.0, 5.0, 0.0, 0.0, 0.0]])
+    started, backlog, cancelled = run_backlog(demand, 3.0)
+
+    np.testing.assert_array_equal(started, [[3, 3, 3, 1, 0]])
+    np.testing.assert_array_equal(backlog, [[2, 4, 1, 0, 0]])
+    assert not cancelled.any()
+
+
+def test_started_plus_queued_is_demand():
+    rng = np.random.default_rng(0)
+    demand = rng.uniform(0, 10, (50, 120))
+    capacity = rng.uniform(2, 8, (50, 1))
+    started, backlog, cancelled = run_backlog(demand, capacity)
+
+    assert (backlog >= 0).all()
+    assert (started <= capacity + 1e-12).all()
+    np.testing.assert_allclose(np.cumsum(started, axis=1) + backlog, np.cumsum(demand, axis=1), rtol=1e-12)
+    assert not cancelled.any()
+
+
+def test_cancelled_work_leaves_the_queue():
+    rng = np.random.default_rng(1)
+    demand = rng.uniform(0, 10, (20, 48))
+    decay = per_period_decay(np.linspace(0, 0.9, 20)[:, None], 12)
+    started, backlog, cancelled = run_backlog(demand, 4.0, decay)
+
+    assert (backlog >= 0).all() and (cancelled >= 0).all()
+    np.testing.assert_allclose(
+        np.cumsum(started + cancelled, axis=1) + backlog, np.cumsum(demand, axis=1), rtol=1e-12
+    )
+
+
+def test_capped_tier_never_starts_more_than_its_capacity():
+    out = project_portfolio_capacity(10, *INPUTS, capacity={"tier1": 30}, resolution="quarterly")
+
+    assert (out["T1_Projects"] <= 30 / 4 + 1e-12).all()
+    assert out["T1_Backlog"][0, -1] > 0
+    np.testing.assert_allclose(out["T1_Projects"].sum() + out["T1_Backlog"][0, -1], out["T1_Demand"].sum())
+    assert (out["T1_Utilization"] <= 100 + 1e-9).all()
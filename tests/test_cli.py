@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from projection import INPUT_KEYS, portfolio_with_cumulative
+from projection.cli import main
+from projection.presets import PRESETS, SCENARIO_KEYS
+
+
+@pytest.fixture
+def scenario_file(tmp_path):
+    """Presets at every horizon from 5 to 15 years, shuffled, with labels."""
+    rng = np.random.default_rng(3)
+    rows = [
+        dict(params, years=int(years), scenario=f"{name} / {years}y")
+        for name, params in PRESETS.items()
+        for years in range(5, 16)
+    ]
+    rows = [rows[i] for i in rng.permutation(len(rows))]
+    path = tmp_path / "scenarios.csv"
+    pd.DataFrame(rows)[["scenario", *SCENARIO_KEYS]].to_csv(path, index=False)
+    return path
+
+
+def run(scenario_file, tmp_path, workers, tag):
+    summary, series = tmp_path / f"summary_{tag}.csv", tmp_path / f"series_{tag}.csv"
+    argv = [str(scenario_file), "--summary", str(summary), "--series", str(series), "--columns", "all"]
+    assert main(argv + ["--chunk-size", "7", "--workers", str(workers)]) == 0
+    return pd.read_csv(summary), pd.read_csv(series)
+
+
+def test_round_trip_with_workers_and_mixed_horizons(scenario_file, tmp_path):
+    scenarios = pd.read_csv(scenario_file)
+    summary, series = run(scenario_file, tmp_path, workers=3, tag="pool")
+
+    assert summary["scenario_id"].tolist() == list(range(len(scenarios)))
+    assert summary["scenario"].tolist() == scenarios["scenario"].tolist()
+    assert len(series) == scenarios["years"].sum()
+
+    for i, row in scenarios.iterrows():
+        expected = portfolio_with_cumulative(int(row["years"]), [row[k] for k in INPUT_KEYS])
+        got = series[series["scenario_id"] == i]
+        assert got["Year"].tolist() == list(range(1, int(row["years"]) + 1))
+        np.testing.assert_allclose(got["OperatingMargin"], expected["OperatingMargin"], rtol=1e-9)
+        np.testing.assert_allclose(got["CumulativeOperatingProfit"], expected["CumulativeOperatingProfit"], rtol=1e-9)
+        assert summary.loc[i, "CumulativeOperatingProfit"] == pytest.approx(expected["CumulativeOperatingProfit"].iloc[-1])
+        assert summary.loc[i, "FinalOperatingMargin"] == pytest.approx(expected["OperatingMargin"].iloc[-1])
+
+
+def test_worker_pool_output_matches_a_single_process(scenario_file, tmp_path):
+    pool_summary, pool_series = run(scenario_file, tmp_path, workers=3, tag="pool")
+    serial_summary, serial_series = run(scenario_file, tmp_path, workers=1, tag="serial")
+
+    pd.testing.assert_frame_equal(pool_summary, serial_summary)
+    pd.testing.assert_frame_equal(pool_series, serial_series)
+
+
+def test_missing_column_is_an_error_without_defaults(tmp_path):
+    path = tmp_path / "partial.csv"
+    pd.DataFrame([{"years": 10, "tier1_growth": 20}]).to_csv(path, index=False)
+
+    with pytest.raises(SystemExit, match="no 'benchmark_op_margin' column"):
+        main([str(path), "--summary", str(tmp_path / "out.csv")])
+
+
+def test_defaults_fill_missing_columns(tmp_path):
+    path = tmp_path / "partial.csv"
+    pd.DataFrame([{"years": 8, "tier1_growth": 30}]).to_csv(path, index=False)
+    out = tmp_path / "out.csv"
+
+    assert main([str(path), "--summary", str(out), "--defaults", "Balanced Growth"]) == 0
+
+    params = dict(PRESETS["Balanced Growth"], years=8, tier1_growth=30)
+    expected = portfolio_with_cumulative(8, [params[k] for k in INPUT_KEYS])
+    assert pd.read_csv(out).loc[0, "CumulativeOperatingProfit"] == pytest.approx(expected["CumulativeOperatingProfit"].iloc[-1])
+
+
+@pytest.mark.parametrize("key", ["years", "tier3_projects", "tier2_projects0", "tier1_projects0"])
+def test_fractional_whole_number_columns_are_rejected(tmp_path, key):
+    rows = [dict(PRESETS["Balanced Growth"]), dict(PRESETS["Balanced Growth"], **{key: 10.7})]
+    path = tmp_path / "fractional.csv"
+    pd.DataFrame(rows)[list(SCENARIO_KEYS)].to_csv(path, index=False)
+    out = tmp_path / "out.csv"
+
+    with pytest.raises(SystemExit, match=f"error: scenario 1: '{key}' must be a whole number, got 10.7"):
+        main([str(path), "--summary", str(out)])
@@ -0,0 +1,94 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, PORTFOLIO_COLUMNS, CompactResult, project_portfolio_batch, project_portfolio_compact
+from projection.presets import PRESETS
+
+from test_engine import random_scenarios
+
+MONEY = (
+    "T3_Revenue", "T2_Revenue", "T1_Revenue", "TotalRevenue",
+    "T3_GrossProfit", "T2_GrossProfit", "T1_GrossProfit", "GrossProfit",
+    "FixedOverhead", "VarOverhead", "TotalOverhead", "OverheadPerProject_k",
+)
+SHARES = ("T3_Share", "T2_Share", "T1_Share")
+COUNTS = ("T3_Projects", "T2_Projects", "T1_Projects", "TotalProjects")
+
+
+def batch_inputs(n=2000):
+    columns = random_scenarios(n, seed=1)
+    return [columns[k] for k in INPUT_KEYS]
+
+
+def test_float64_matches_the_batch_engine_exactly():
+    inputs = batch_inputs()
+    expected = project_portfolio_batch(15, *inputs)
+    compact = project_portfolio_compact(15, *inputs)
+
+    for col in PORTFOLIO_COLUMNS:
+        np.testing.assert_array_equal(compact[col], expected[col], err_msg=col)
+
+
+def test_float32_stays_within_the_documented_bounds():
+    inputs = batch_inputs()
+    exact = project_portfolio_batch(15, *inputs)
+    approx = project_portfolio_compact(15, *inputs, dtype=np.float32)
+
+    for col in MONEY:
+        np.testing.assert_allclose(approx[col], exact[col], rtol=1e-6, err_msg=col)
+    for col in SHARES:
+        np.testing.assert_allclose(approx[col], exact[col], rtol=0, atol=1e-4, err_msg=col)
+    for col in COUNTS:
+        np.testing.assert_array_equal(approx[col], exact[col], err_msg=col)
+
+    # OperatingMargin: within 1e-6 * (GrossProfit + TotalOverhead) / TotalRevenue points.
+    bound = 1e-6 * (exact["GrossProfit"] + exact["TotalOverhead"]) / exact["TotalRevenue"] * 100
+    assert (np.abs(approx["OperatingMargin"] - exact["OperatingMargin"]) <= bound).all()
+    assert np.abs(approx["OperatingMargin"] - exact["OperatingMargin"]).max() < 2e-3
+
+
+def test_float32_margins_on_the_presets():
+    for params in PRESETS.values():
+        inputs = [params[k] for k in INPUT_KEYS]
+        exact = project_portfolio_batch(params["years"], *inputs)["OperatingMargin"]
+        approx = project_portfolio_compact(params["years"], *inputs, dtype=np.float32)["OperatingMargin"]
+        np.testing.assert_allclose(approx, exact, rtol=0, atol=1e-5)
+
+
+def test_counts_are_stored_as_int32_unless_they_overflow():
+    params = dict(PRESETS["Balanced Growth"])
+    small = project_portfolio_compact(15, *(params[k] for k in INPUT_KEYS))
+    assert small._t1.dtype == small._t2.dtype == np.int32
+
+    params.update(tier1_projects0=2_000_000_000, tier1_growth=50)
+    inputs = [params[k] for k in INPUT_KEYS]
+    big = project_portfolio_compact(15, *inputs)
+    expected = project_portfolio_batch(15, *inputs)["T1_Projects"]
+    assert expected.max() > np.iinfo(np.int32).max
+    assert big._t1.dtype == np.int64
+    np.testing.assert_array_equal(big["T1_Projects"], expected)
+
+
+def test_nbytes_is_counts_plus_inputs():
+    compact = project_portfolio_compact(15, *batch_inputs(100))
+
+    # Two int32 counts per scenario-year, one Tier 3 count and ten inputs per scenario.
+    assert compact.nbytes == 100 * (15 * 2 * 4 + 4 + 10 * 8)
+
+
+def test_mapping_interface():
+    compact = project_portfolio_compact(7, *(PRESETS["Balanced Growth"][k] for k in INPUT_KEYS))
+
+    assert isinstance(compact, Mapping) and isinstance(compact, CompactResult)
+    assert len(compact) == len(PORTFOLIO_COLUMNS)
+    assert list(compact) == list(compact.keys()) == list(PORTFOLIO_COLUMNS)
+    assert "OperatingMargin" in compact and "CumulativeOperatingProfit" not in compact
+    with pytest.raises(KeyError):
+        compact["CumulativeOperatingProfit"]
+    assert compact["FixedOverhead"].shape == (1, 7)
+    assert not compact["FixedOverhead"].flags.writeable
+    assert set(compact.to_dict(("TotalRevenue",))) == {"TotalRevenue"}
+    frame = compact.to_frame()
+    assert list(frame.index) == list(range(1, 8)) and list(frame.columns) == list(PORTFOLIO_COLUMNS)
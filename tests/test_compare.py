@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from projection import GROWTH_KEYS, INPUT_KEYS, portfolio_with_cumulative, required_scale_to_hit_benchmark
+from projection.compare import COMPARE_SERIES, compare_scenarios, preset_comparison
+from projection.presets import PRESETS
+
+
+@pytest.mark.parametrize("name", list(PRESETS))
+def test_preset_overlay_matches_each_preset_run_alone(name):
+    params = PRESETS[name]
+    years_ = params["years"]
+    inputs = [params[k] for k in INPUT_KEYS]
+    scenario = portfolio_with_cumulative(years_, inputs)
+    baseline = portfolio_with_cumulative(years_, [0 if k in GROWTH_KEYS else params[k] for k in INPUT_KEYS])
+    required = required_scale_to_hit_benchmark(
+        scenario, params["benchmark_op_margin"], params["voh_t3"], params["voh_t2"], params["voh_t1"]
+    )
+    expected = {
+        "OperatingMargin": scenario["OperatingMargin"],
+        "CumulativeOperatingProfit": scenario["CumulativeOperatingProfit"],
+        "CumulativeAdvantage": scenario["CumulativeOperatingProfit"] - baseline["CumulativeOperatingProfit"],
+        "RequiredProductRevenueAtBenchmark": required["RequiredProductRevenueAtBenchmark"],
+    }
+
+    entry = preset_comparison()[name]
+
+    assert entry["years"] == years_
+    assert entry["benchmark"] == params["benchmark_op_margin"]
+    for col in COMPARE_SERIES:
+        np.testing.assert_allclose(entry["series"][col], np.asarray(expected[col]), rtol=1e-12, err_msg=col)
+    summary = entry["summary"]
+    assert summary["FinalOperatingMargin"] == pytest.approx(scenario["OperatingMargin"].iloc[-1], rel=1e-12)
+    assert summary["CumulativeOperatingProfit"] == pytest.approx(scenario["CumulativeOperatingProfit"].iloc[-1], rel=1e-12)
+    assert summary["MinOperatingMargin"] == pytest.approx(scenario["OperatingMargin"].min(), rel=1e-12)
+    assert summary["YearsBelowBenchmark"] == (scenario["OperatingMargin"] < params["benchmark_op_margin"]).sum()
+
+
+def test_mixed_horizons_are_trimmed_to_each_scenario():
+    short = dict(PRESETS["Balanced Growth"], years=4)
+    long = dict(PRESETS["Balanced Growth"], years=12)
+    both = compare_scenarios({"short": short, "long": long})
+
+    assert list(both) == ["short", "long"]
+    assert len(both["short"]["series"]["OperatingMargin"]) == 4
+    np.testing.assert_array_equal(
+        both["short"]["series"]["CumulativeOperatingProfit"], both["long"]["series"]["CumulativeOperatingProfit"][:4]
+    )
+    assert compare_scenarios({}) == {}
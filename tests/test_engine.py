@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from projection import INPUT_BOUNDS, INPUT_KEYS, INTEGER_KEYS, PORTFOLIO_COLUMNS, project_portfolio, project_portfolio_batch
+from projection.presets import PRESETS
+
+
+def reference_portfolio(
+    years_,
+    t3_rev_m,
+    t3_gm_pct,
+    t3_projects_fixed,
+    t2_price_m,
+    t2_gm_pct,
+    t2_projects_start,
+    t2_growth_pct,
+    t1_price_m,
+    t1_gm_pct,
+    t1_projects_start,
+    t1_growth_pct,
+    fixed_oh_m,
+    voh_t3_k,
+    voh_t2_k,
+    voh_t1_k,
+):
+    """The original row-per-year pandas model the engine replaced, kept as the reference."""
+    df = pd.DataFrame(index=range(1, years_ + 1))
+    df["T3_Projects"] = int(t3_projects_fixed)
+    df["T2_Projects"] = np.round(t2_projects_start * ((1 + t2_growth_pct / 100) ** (df.index - 1))).astype(int)
+    df["T1_Projects"] = np.round(t1_projects_start * ((1 + t1_growth_pct / 100) ** (df.index - 1))).astype(int)
+    df["TotalProjects"] = df["T1_Projects"] + df["T2_Projects"] + df["T3_Projects"]
+    df["T3_Revenue"] = float(t3_rev_m)
+    df["T2_Revenue"] = df["T2_Projects"] * float(t2_price_m)
+    df["T1_Revenue"] = df["T1_Projects"] * float(t1_price_m)
+    df["TotalRevenue"] = df["T1_Revenue"] + df["T2_Revenue"] + df["T3_Revenue"]
+    df["T3_Share"] = (df["T3_Revenue"] / df["TotalRevenue"]) * 100
+    df["T2_Share"] = (df["T2_Revenue"] / df["TotalRevenue"]) * 100
+    df["T1_Share"] = (df["T1_Revenue"] / df["TotalRevenue"]) * 100
+    df["T3_GrossProfit"] = df["T3_Revenue"] * (t3_gm_pct / 100)
+    df["T2_GrossProfit"] = df["T2_Revenue"] * (t2_gm_pct / 100)
+    df["T1_GrossProfit"] = df["T1_Revenue"] * (t1_gm_pct / 100)
+    df["GrossProfit"] = df["T1_GrossProfit"] + df["T2_GrossProfit"] + df["T3_GrossProfit"]
+    df["FixedOverhead"] = float(fixed_oh_m)
+    df["VarOverhead"] = (
+        df["T3_Projects"] * (voh_t3_k / 1000.0)
+        + df["T2_Projects"] * (voh_t2_k / 1000.0)
+        + df["T1_Projects"] * (voh_t1_k / 1000.0)
+    )
+    df["TotalOverhead"] = df["FixedOverhead"] + df["VarOverhead"]
+    df["OperatingProfit"] = df["GrossProfit"] - df["TotalOverhead"]
+    df["OperatingMargin"] = np.where(df["TotalRevenue"] > 0, (df["OperatingProfit"] / df["TotalRevenue"]) * 100, np.nan)
+    df["ProfitPerProject_k"] = np.where(df["TotalProjects"] > 0, (df["OperatingProfit"] / df["TotalProjects"]) * 1000, np.nan)
+    df["OverheadPerProject_k"] = np.where(df["TotalProjects"] > 0, (df["TotalOverhead"] / df["TotalProjects"]) * 1000, np.nan)
+    return df
+
+
+def random_scenarios(n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for k in INPUT_KEYS:
+        values = rng.uniform(*INPUT_BOUNDS[k], n)
+        columns[k] = np.round(values) if k in INTEGER_KEYS else values
+    return columns
+
+
+def test_batch_matches_the_reference_model_row_by_row():
+    columns = random_scenarios(64)
+    batch = project_portfolio_batch(12, *(columns[k] for k in INPUT_KEYS))
+
+    for i in range(64):
+        expected = reference_portfolio(12, *(columns[k][i] for k in INPUT_KEYS))
+        for col in PORTFOLIO_COLUMNS:
+            np.testing.assert_allclose(batch[col][i], expected[col].to_numpy(), rtol=1e-12, err_msg=col)
+
+
+def test_scalars_are_shared_across_the_batch():
+    params = PRESETS["Balanced Growth"]
+    growth = np.array([0.0, 10.0, 25.0])
+    inputs = [growth if k == "tier1_growth" else params[k] for k in INPUT_KEYS]
+    batch = project_portfolio_batch(params["years"], *inputs)
+
+    assert batch["T1_Projects"].shape == (3, params["years"])
+    assert batch["T1_Projects"].dtype == np.int64
+    for i, g in enumerate(growth):
+        expected = reference_portfolio(params["years"], *(g if k == "tier1_growth" else params[k] for k in INPUT_KEYS))
+        np.testing.assert_allclose(batch["OperatingMargin"][i], expected["OperatingMargin"].to_numpy())
+
+
+@pytest.mark.parametrize("preset", list(PRESETS))
+def test_single_scenario_frame_matches_the_reference_model(preset):
+    params = PRESETS[preset]
+    args = [params[k] for k in INPUT_KEYS]
+
+    pd.testing.assert_frame_equal(
+        project_portfolio(params["years"], *args),
+        reference_portfolio(params["years"], *args),
+        check_dtype=False,
+    )
+
+
+def test_zero_revenue_gives_nan_margin_not_an_error():
+    inputs = dict(PRESETS["Balanced Growth"], tier3_revenue=0.0, tier2_projects0=0, tier1_projects0=0)
+    batch = project_portfolio_batch(5, *(inputs[k] for k in INPUT_KEYS))
+
+    assert np.isnan(batch["OperatingMargin"]).all()
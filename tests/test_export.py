@@ -0,0 +1,63 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from projection.export import export_bytes, frame_chunks, sweep_chunks, write_chunks
+
+
+def test_sweep_chunks_flatten_the_grid_row_major():
+    sweep = {
+        "x": np.array([1.0, 2.0, 3.0]),
+        "y": np.array([10.0, 20.0]),
+        "metrics": {"m": np.arange(6, dtype=float).reshape(2, 3)},
+    }
+    df = pd.concat(sweep_chunks(sweep, "a", "b", chunk_rows=4), ignore_index=True)
+
+    assert list(df.columns) == ["a", "b", "m"]
+    assert df["a"].tolist() == [1, 2, 3, 1, 2, 3]
+    assert df["b"].tolist() == [10, 10, 10, 20, 20, 20]
+    assert df["m"].tolist() == list(range(6))
+
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl", "parquet"])
+def test_export_bytes_round_trip(fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"v": np.arange(7, dtype=float)}, index=pd.Index(range(1, 8), name="Year"))
+    data = export_bytes({"one": frame_chunks(df, "Year", chunk_rows=3), "two": frame_chunks(df * 2, "Year")}, fmt)
+
+    if fmt == "csv":
+        back = pd.read_csv(io.BytesIO(data))
+    elif fmt == "jsonl":
+        back = pd.read_json(io.BytesIO(data), lines=True)
+    else:
+        back = pd.read_parquet(io.BytesIO(data))
+    assert list(back.columns) == ["table", "Year", "v"]
+    assert back["table"].tolist() == ["one"] * 7 + ["two"] * 7
+    np.testing.assert_allclose(back["v"], np.concatenate([df["v"], df["v"] * 2]))
+
+
+def test_write_chunks_counts_rows(tmp_path):
+    df = pd.DataFrame({"x": range(5)})
+    target = tmp_path / "out.csv"
+
+    assert write_chunks(frame_chunks(df, chunk_rows=2), str(target)) == 5
+    assert pd.read_csv(target)["x"].tolist() == list(range(5))
+
+
+def test_xlsx_round_trip_with_one_sheet_per_table(tmp_path):
+    pytest.importorskip("openpyxl")
+    df = pd.DataFrame({"Year": range(1, 8), "v": np.arange(7, dtype=float), "label": list("abcdefg")})
+    df.loc[3, "v"] = np.nan
+    data = export_bytes({"Scenario": frame_chunks(df, chunk_rows=3), "Baseline": frame_chunks(df.iloc[:2])}, "xlsx")
+
+    sheets = pd.read_excel(io.BytesIO(data), sheet_name=None)
+    assert list(sheets) == ["Scenario", "Baseline"]
+    pd.testing.assert_frame_equal(sheets["Scenario"], df)
+    pd.testing.assert_frame_equal(sheets["Baseline"], df.iloc[:2], check_dtype=False)  # 0.0, 1.0 read back as ints
+
+    target = tmp_path / "summary.xlsx"
+    assert write_chunks(frame_chunks(df, chunk_rows=2), str(target)) == 7
+    pd.testing.assert_frame_equal(pd.read_excel(target), df)
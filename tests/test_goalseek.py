@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, project_portfolio_batch
+from projection.goalseek import goal_seek
+from projection.presets import PRESETS
+
+INPUTS = {k: PRESETS["Balanced Growth"][k] for k in INPUT_KEYS}
+
+
+def margin(**changes):
+    params = dict(INPUTS, **changes)
+    return project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))["OperatingMargin"][0]
+
+
+def test_closed_form_edge_puts_the_margin_on_the_target():
+    gs = goal_seek(10, INPUTS, "tier1_gm", "OperatingMargin", 4.0, ">=")
+
+    assert gs["method"] == "closed_form"
+    lower = gs["lower"][0]
+    for year, value in enumerate(lower):
+        if not np.isnan(value) and value > 1:  # strictly inside the bounds
+            assert margin(tier1_gm=value)[year] == pytest.approx(4.0)
+    edge = gs["all_years_lower"][0]
+    assert (margin(tier1_gm=edge) >= 4.0 - 1e-9).all()
+
+
+def test_overhead_ceiling_is_an_upper_bound():
+    gs = goal_seek(10, INPUTS, "fixed_overhead", "OperatingMargin", 2.0, ">=")
+
+    ceiling = gs["all_years_upper"][0]
+    assert gs["all_years_lower"][0] == 0.0
+    assert (margin(fixed_overhead=ceiling) >= 2.0 - 1e-9).all()
+    assert (margin(fixed_overhead=ceiling + 0.01) < 2.0).any()
+
+
+def test_bisection_on_growth_meets_the_goal_at_its_edge():
+    gs = goal_seek(10, INPUTS, "tier1_growth", "T3_Share", 30.0, "<=")
+
+    assert gs["method"] == "bisection"
+    lower = gs["lower"][0]
+    assert np.isnan(lower[:2]).all()  # too early for any growth rate in bounds
+    for year in range(2, 9):
+        params = dict(INPUTS, tier1_growth=lower[year])
+        share = project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))["T3_Share"][0, year]
+        assert share <= 30.0
+        params["tier1_growth"] = lower[year] - 0.01
+        share = project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))["T3_Share"][0, year]
+        assert share > 30.0
+
+
+def test_unreachable_goal_is_nan():
+    gs = goal_seek(10, INPUTS, "tier1_gm", "OperatingMargin", 90.0, ">=")
+
+    assert np.isnan(gs["lower"]).all()
+    assert np.isnan(gs["all_years_lower"]).all()
+
+
+def test_unknown_metric_is_rejected():
+    with pytest.raises(ValueError, match="unknown metric"):
+        goal_seek(10, INPUTS, "tier1_gm", "Revenue", 1.0)
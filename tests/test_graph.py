@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, PORTFOLIO_COLUMNS, ModelGraph, project_portfolio_batch
+from projection.presets import PRESETS
+
+INPUTS = {k: PRESETS["Balanced Growth"][k] for k in INPUT_KEYS}
+
+
+def evaluated(years_=10, **inputs):
+    graph = ModelGraph(years_, dict(INPUTS, **inputs))
+    graph.values()
+    return graph
+
+
+def assert_matches_batch(graph, years_, inputs):
+    expected = project_portfolio_batch(years_, *(inputs[k] for k in INPUT_KEYS))
+    for col, values in graph.values().items():
+        np.testing.assert_array_equal(values, expected[col], err_msg=col)
+
+
+def test_variable_overhead_change_recomputes_only_its_downstream():
+    graph = evaluated()
+    stale = graph.update(inputs={"voh_t1": 35.0})
+    graph.values()
+
+    expected = {"VarOverhead", "TotalOverhead", "OperatingProfit", "OperatingMargin", "ProfitPerProject_k", "OverheadPerProject_k"}
+    assert set(graph.recomputed) == expected
+    assert stale == expected | {"CumulativeOperatingProfit"}
+    assert_matches_batch(graph, 10, dict(INPUTS, voh_t1=35.0))
+
+
+def test_growth_change_leaves_other_tiers_alone():
+    graph = evaluated()
+    graph.update(inputs={"tier1_growth": 30})
+    graph.values()
+
+    assert "T1_Projects" in graph.recomputed
+    assert not {"T2_Projects", "T3_Projects", "T2_Revenue", "T3_Revenue", "FixedOverhead"} & set(graph.recomputed)
+    assert_matches_batch(graph, 10, dict(INPUTS, tier1_growth=30))
+
+
+def test_unchanged_values_invalidate_nothing():
+    graph = evaluated()
+    assert graph.update(10, {"voh_t1": INPUTS["voh_t1"]}) == set()
+    graph.values()
+    assert graph.recomputed == []
+
+
+def test_new_horizon_recomputes_every_series():
+    graph = evaluated()
+    graph.update(years_=12)
+    graph.values()
+
+    assert set(PORTFOLIO_COLUMNS) <= set(graph.recomputed)
+    assert graph["OperatingMargin"].shape == (1, 12)
+    assert_matches_batch(graph, 12, INPUTS)
+
+
+def test_resizing_the_batch_recomputes_and_broadcasts():
+    graph = evaluated()
+    growth = np.array([0.0, 10.0, 20.0])
+    graph.update(inputs={"tier2_growth": growth})
+
+    assert graph["OperatingMargin"].shape == (3, 10)
+    assert_matches_batch(graph, 10, dict(INPUTS, tier2_growth=growth))
+
+
+def test_unknown_input_is_rejected():
+    graph = evaluated()
+    with pytest.raises(ValueError, match="unknown inputs"):
+        graph.update(inputs={"tier4_growth": 5})
@@ -0,0 +1,97 @@
+import threading
+
+import pytest
+
+from projection.cache import LRUCache
+from projection.jobs import JobCancelled, JobRunner
+
+
+@pytest.fixture
+def runner():
+    runner = JobRunner(max_workers=2)
+    yield runner
+    runner.shutdown()
+
+
+def gated(gate, started=None):
+    """Job generator that reports once, then blocks until ``gate`` is set."""
+    if started is not None:
+        started.set()
+    yield 0.5, "half"
+    gate.wait(5)
+    yield 1.0, "done"
+
+
+def test_same_key_is_computed_once_and_shared(runner):
+    gate, calls = threading.Event(), []
+
+    def job_fn():
+        calls.append(1)
+        yield from gated(gate)
+
+    first = runner.submit("k", job_fn, owner=("a", "slot"))
+    second = runner.submit("k", job_fn, owner=("b", "slot"))
+    gate.set()
+
+    assert first is second
+    assert first.wait(5) == "done"
+    assert calls == [1]
+    assert runner.running() == []
+
+
+def test_finished_results_are_served_from_the_cache(runner):
+    cache = LRUCache(maxsize=4)
+    assert runner.submit("k", lambda: 42, cache=cache).wait(5) == 42
+
+    hit = runner.submit("k", lambda: pytest.fail("recomputed"), cache=cache)
+    assert hit.done and hit.wait() == 42
+
+
+def test_new_key_for_an_owner_cancels_its_orphaned_job(runner):
+    gate, started = threading.Event(), threading.Event()
+    old = runner.submit("old", gated, gate, started, owner=("a", "slot"))
+    started.wait(5)
+
+    new = runner.submit("new", lambda: "fresh", owner=("a", "slot"))
+    gate.set()
+
+    with pytest.raises(JobCancelled):
+        old.wait(5)
+    assert old.status == "cancelled"
+    assert new.wait(5) == "fresh"
+
+
+def test_job_another_owner_still_wants_keeps_running(runner):
+    gate, started = threading.Event(), threading.Event()
+    shared = runner.submit("k", gated, gate, started, owner=("a", "slot"))
+    runner.submit("k", gated, gate, owner=("b", "slot"))
+    started.wait(5)
+
+    runner.release(("a", "slot"))
+    gate.set()
+
+    assert shared.wait(5) == "done"
+
+
+def test_cancelled_key_is_recomputed_on_the_next_submit(runner):
+    gate, started = threading.Event(), threading.Event()
+    old = runner.submit("k", gated, gate, started, owner=("a", "slot"))
+    started.wait(5)
+    runner.release(("a", "slot"))
+    gate.set()
+    with pytest.raises(JobCancelled):
+        old.wait(5)
+
+    again = runner.submit("k", lambda: "again", owner=("a", "slot"))
+    assert again is not old
+    assert again.wait(5) == "again"
+
+
+def test_errors_are_raised_from_wait(runner):
+    def fail():
+        raise ValueError("boom")
+
+    job = runner.submit("k", fail)
+    with pytest.raises(ValueError, match="boom"):
+        job.wait(5)
+    assert job.status == "failed"
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, project_portfolio_batch
+from projection.montecarlo import Distribution, band_distribution, iter_simulate_paths, simulate_paths
+from projection.presets import PRESETS
+
+INPUTS = {k: PRESETS["Balanced Growth"][k] for k in INPUT_KEYS}
+
+
+def test_zero_spread_reproduces_the_point_forecast():
+    point = project_portfolio_batch(10, *(INPUTS[k] for k in INPUT_KEYS))["OperatingMargin"][0]
+    dists = {"tier1_gm": Distribution("normal", INPUTS["tier1_gm"], 0.0)}
+
+    mc = simulate_paths(10, INPUTS, dists, 5.0, n_paths=50, chunk_size=16)
+
+    for band in mc["OperatingMargin"].values():
+        np.testing.assert_allclose(band, point, rtol=1e-5, atol=1e-5)
+    np.testing.assert_array_equal(mc["ProbBelowBenchmark"], (point < 5.0).astype(float))
+    assert mc["n_paths"] == 50
+
+
+def test_seeded_runs_match_across_the_iterator():
+    dists = {
+        "tier2_growth": band_distribution("triangular", INPUTS["tier2_growth"], 5.0),
+        "voh_t1": band_distribution("lognormal", INPUTS["voh_t1"], 1.0, low=0.0),
+    }
+    full = simulate_paths(10, INPUTS, dists, 5.0, n_paths=3000, chunk_size=1000, seed=7)
+    steps = list(iter_simulate_paths(10, INPUTS, dists, 5.0, n_paths=3000, chunk_size=1000, seed=7))
+
+    assert [f for f, _ in steps] == pytest.approx([1 / 3, 2 / 3, 1.0])
+    last = steps[-1][1]
+    for p in full["OperatingMargin"]:
+        np.testing.assert_array_equal(last["OperatingMargin"][p], full["OperatingMargin"][p])
+    low, mid, high = (full["OperatingMargin"][p] for p in (5, 50, 95))
+    assert (low <= mid).all() and (mid <= high).all()
+    assert (low < high).any()
+
+
+def test_unknown_keys_are_rejected():
+    with pytest.raises(ValueError, match="fixed_overhead"):
+        simulate_paths(5, INPUTS, {"fixed_overhead": Distribution("normal", 1.0, 0.1)}, 5.0, n_paths=10)
+    with pytest.raises(ValueError):
+        Distribution("uniform", 1.0, 0.1)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from projection import INPUT_BOUNDS, INPUT_KEYS, project_portfolio_batch
+from projection.optimize import PLAN_KEYS, iter_optimize_growth_plan, optimize_growth_plan
+from projection.presets import PRESETS
+
+INPUTS = {k: PRESETS["Balanced Growth"][k] for k in INPUT_KEYS}
+
+
+def run(plan):
+    params = dict(INPUTS, **plan)
+    return project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))
+
+
+def test_best_plan_is_feasible_in_bounds_and_no_worse_than_current():
+    current = run({})
+    bm = float(np.nanmin(current["OperatingMargin"][0])) - 1.0
+    opt = optimize_growth_plan(10, INPUTS, bm, population=256, generations=8)
+
+    assert opt["feasible"]
+    for k in PLAN_KEYS:
+        lo, hi = INPUT_BOUNDS[k]
+        assert lo <= opt["plan"][k] <= hi
+    batch = run(opt["plan"])
+    assert (batch["OperatingMargin"][0] >= bm).all()
+    assert opt["cumulative_profit"] >= current["OperatingProfit"][0].sum() - 1e-6
+    np.testing.assert_allclose(batch["OperatingProfit"][0].sum(), opt["cumulative_profit"])
+    assert opt["evaluations"] == 256 * 8
+
+
+def test_iterator_ends_on_the_same_plan():
+    kwargs = dict(population=128, generations=6, seed=3)
+    opt = optimize_growth_plan(10, INPUTS, 0.0, **kwargs)
+    steps = list(iter_optimize_growth_plan(10, INPUTS, 0.0, partial_every=2, **kwargs))
+
+    assert len(steps) == 6
+    assert [s is not None for _, s in steps] == [False, True, False, True, False, True]
+    assert steps[-1][1]["plan"] == opt["plan"]
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, project_portfolio_batch
+from projection.periods import (
+    DEFAULT_CURVES,
+    RECOGNITION_SHAPES,
+    RESOLUTIONS,
+    TIERS,
+    project_portfolio_periods,
+    recognition_curve,
+    spread_starts,
+)
+from projection.presets import PRESETS
+from projection.result import ScenarioResult
+
+INPUTS = [PRESETS["Balanced Growth"][k] for k in INPUT_KEYS]
+
+# Columns that add up across a year's periods.
+ADDITIVE = (
+    "T3_Projects", "T2_Projects", "T1_Projects", "TotalProjects",
+    "T3_Revenue", "T2_Revenue", "T1_Revenue", "TotalRevenue",
+    "T3_GrossProfit", "T2_GrossProfit", "T1_GrossProfit", "GrossProfit",
+    "FixedOverhead", "VarOverhead", "TotalOverhead", "OperatingProfit",
+)
+
+INSTANT = dict.fromkeys(TIERS, ("uniform", 0))
+
+
+@pytest.mark.parametrize("shape", RECOGNITION_SHAPES)
+@pytest.mark.parametrize("months", [0, 1, 3, 5, 12, 18, 36])
+@pytest.mark.parametrize("periods_per_year", RESOLUTIONS.values())
+def test_recognition_curves_sum_to_one(shape, months, periods_per_year):
+    curve = recognition_curve(shape, months, periods_per_year)
+
+    assert curve.sum() == pytest.approx(1.0, abs=1e-14)
+    assert (curve >= 0).all()
+
+
+def test_s_curve_is_slow_at_both_ends():
+    curve = recognition_curve("s_curve", 12, 12)
+
+    assert len(curve) == 12
+    assert curve[0] < curve[5] and curve[-1] < curve[6]
+    np.testing.assert_allclose(curve, curve[::-1], atol=1e-15)
+
+
+@pytest.mark.parametrize("resolution", ["quarterly", "monthly"])
+def test_instant_recognition_adds_up_to_the_annual_model(resolution):
+    per_year = RESOLUTIONS[resolution]
+    periods = project_portfolio_periods(10, *INPUTS, resolution=resolution, curves=INSTANT)
+    annual = project_portfolio_batch(10, *INPUTS)
+
+    for col in ADDITIVE:
+        totals = periods[col].reshape(1, 10, per_year).sum(axis=-1)
+        np.testing.assert_allclose(totals, annual[col], rtol=1e-12, err_msg=col)
+
+
+def test_page_frame_adds_up_to_the_annual_frame():
+    result = ScenarioResult(10, INPUTS, 15)
+    frame = result.periods("monthly", INSTANT)
+
+    assert len(frame) == 120 and frame.index[0] == "Y1 M01"
+    yearly = frame[list(ADDITIVE)].groupby(np.repeat(np.arange(1, 11), 12)).sum()
+    np.testing.assert_allclose(yearly.to_numpy(), result.scenario[list(ADDITIVE)].to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("taps", [1, 4, 13, 40, 200])
+def test_fft_and_direct_spreading_agree(taps):
+    rng = np.random.default_rng(taps)
+    starts = rng.uniform(0, 20, (8, 120))
+    curve = recognition_curve("s_curve", taps, 12)
+
+    direct = spread_starts(starts, curve, "direct")
+    fft = spread_starts(starts, curve, "fft")
+
+    np.testing.assert_allclose(fft, direct, rtol=0, atol=1e-11)
+
+
+@pytest.mark.parametrize("method", ["direct", "fft"])
+@pytest.mark.parametrize("tier", TIERS)
+def test_a_flat_plan_stays_flat(method, tier):
+    starts = np.full((3, 60), 2.5)
+    curve = recognition_curve(*DEFAULT_CURVES[tier], 12)
+
+    np.testing.assert_allclose(spread_starts(starts, curve, method), starts, atol=1e-12)
+
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        spread_starts(np.ones((1, 4)), np.ones(1), "slow")
@@ -0,0 +1,102 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from projection.profiling import RerunProfiler, profiler_from_env
+
+APP = str(Path(__file__).resolve().parent.parent / "app.py")
+
+
+def test_a_phase_is_recorded_with_its_duration():
+    profiler = RerunProfiler(enabled=True)
+    with profiler.phase("model"):
+        pass
+    with profiler.phase("model"):
+        sum(range(1000))
+    with profiler.phase("figure"):
+        pass
+
+    records = profiler.records()
+    assert [r["phase"] for r in records] == ["model", "figure"]
+    assert records[0]["calls"] == 2
+    assert all(r["seconds"] >= 0 for r in records)
+    assert profiler.total_seconds() >= sum(r["seconds"] for r in records)
+
+
+def test_phases_may_not_nest():
+    profiler = RerunProfiler(enabled=True)
+    with profiler.phase("outer"):
+        with pytest.raises(RuntimeError):
+            profiler.start("inner")
+
+
+@pytest.mark.parametrize("value", [None, "", "0", "off", "False"])
+def test_profiling_is_a_no_op_unless_enabled(value, tmp_path):
+    log = tmp_path / "profile.jsonl"
+    environ = {"FORECAST_PROFILE_LOG": str(log)}
+    if value is not None:
+        environ["FORECAST_PROFILE"] = value
+    profiler = profiler_from_env(environ)
+
+    assert not profiler.enabled
+    with profiler.phase("model"):
+        pass
+    profiler.start("figure")
+    profiler.stop()
+    profiler.write_log(scope="page")
+    assert profiler.records() == []
+    assert not log.exists()
+
+
+def test_env_enables_timing_and_allocations():
+    assert profiler_from_env({"FORECAST_PROFILE": "1"}).enabled
+    assert not profiler_from_env({"FORECAST_PROFILE": "1"}).allocations
+    assert profiler_from_env({"FORECAST_PROFILE": "alloc"}).allocations
+    assert profiler_from_env({"FORECAST_PROFILE": "1"}).log_path is None
+
+
+def test_log_gets_one_line_per_write(tmp_path):
+    log = tmp_path / "profile.jsonl"
+    for run in range(3):
+        profiler = profiler_from_env({"FORECAST_PROFILE": "1", "FORECAST_PROFILE_LOG": str(log)})
+        with profiler.phase("model"):
+            pass
+        profiler.write_log(scope="page", run=run)
+
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [e["run"] for e in entries] == [0, 1, 2]
+    assert all(e["phases"][0]["phase"] == "model" and e["total_seconds"] >= 0 for e in entries)
+
+
+def test_page_logs_each_rerun(tmp_path, monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    log = tmp_path / "profile.jsonl"
+    monkeypatch.setenv("FORECAST_PROFILE", "1")
+    monkeypatch.setenv("FORECAST_PROFILE_LOG", str(log))
+
+    at = testing.AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    at.run()
+    assert not at.exception
+
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    page = [e for e in entries if e["scope"] == "page"]
+    charts = [e for e in entries if e["scope"] == "chart_area"]
+    assert len(page) == 2 and len(charts) == 2
+    assert {"sidebar", "chart_area"} <= {p["phase"] for p in page[0]["phases"]}
+    assert all(p["seconds"] >= 0 for e in entries for p in e["phases"])
+    assert sum(" profile — " in e.label for e in at.expander) == 2
+
+
+def test_page_writes_no_log_when_profiling_is_off(tmp_path, monkeypatch):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    log = tmp_path / "profile.jsonl"
+    monkeypatch.delenv("FORECAST_PROFILE", raising=False)
+    monkeypatch.setenv("FORECAST_PROFILE_LOG", str(log))
+
+    at = testing.AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    assert not at.exception
+    assert not log.exists()
+    assert not any(" profile — " in e.label for e in at.expander)
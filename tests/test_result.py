@@ -0,0 +1,84 @@
+import pytest
+
+from projection import INPUT_KEYS
+from projection import result as result_module
+from projection.cache import BASELINE_CACHE, GRAPH_CACHE, REQUIRED_CACHE, SCENARIO_CACHE
+from projection.presets import PRESETS
+from projection.result import LAZY_FIELDS, ScenarioResult
+
+PARAMS = PRESETS["Balanced Growth"]
+INPUTS = [PARAMS[k] for k in INPUT_KEYS]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Count model and solver runs made through projection.result, on empty caches."""
+    for cache in (SCENARIO_CACHE, BASELINE_CACHE, REQUIRED_CACHE):
+        cache.clear()
+    counts = {"model": 0, "solver": 0}
+    model, solver = result_module.portfolio_with_cumulative, result_module.required_scale_to_hit_benchmark
+
+    def counted_model(*args, **kwargs):
+        counts["model"] += 1
+        return model(*args, **kwargs)
+
+    def counted_solver(*args, **kwargs):
+        counts["solver"] += 1
+        return solver(*args, **kwargs)
+
+    monkeypatch.setattr(result_module, "portfolio_with_cumulative", counted_model)
+    monkeypatch.setattr(result_module, "required_scale_to_hit_benchmark", counted_solver)
+    return counts
+
+
+def test_nothing_is_computed_until_read(calls):
+    result = ScenarioResult(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"])
+
+    assert result.computed() == []
+    assert not any(name in result.__dict__ for name in LAZY_FIELDS)
+    assert calls == {"model": 0, "solver": 0}
+
+    result.below_benchmark
+    assert result.computed() == ["scenario", "below_benchmark"]
+    assert "baseline" not in result.__dict__ and "with_required" not in result.__dict__
+    assert calls == {"model": 1, "solver": 0}
+
+
+def test_each_field_is_computed_once(calls):
+    result = ScenarioResult(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"])
+
+    for _ in range(3):
+        scenario = result.scenario
+        result.below_benchmark, result.crossover_year
+        required = result.with_required
+    assert result.computed() == list(LAZY_FIELDS)
+    assert calls == {"model": 2, "solver": 1}  # scenario and baseline, then the solver
+    assert result.scenario is scenario and result.with_required is required
+
+
+def test_a_new_result_reuses_the_shared_caches(calls):
+    ScenarioResult(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"]).with_required
+    again = ScenarioResult(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"])
+    again.with_required
+
+    assert again.computed() == ["scenario", "with_required"]
+    assert calls == {"model": 1, "solver": 1}
+
+
+def test_session_graphs_live_in_the_bounded_shared_cache(calls):
+    GRAPH_CACHE.clear()
+    ScenarioResult(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"], session="a").scenario
+    graph = GRAPH_CACHE.get(("a", "scenario"))
+    assert graph is not None and GRAPH_CACHE.nbytes == graph.nbytes > 0
+
+    changed = list(INPUTS)
+    changed[INPUT_KEYS.index("voh_t1")] += 5
+    frame = ScenarioResult(PARAMS["years"], changed, PARAMS["benchmark_op_margin"], session="a").scenario
+    assert GRAPH_CACHE.get(("a", "scenario")) is graph
+    assert "T1_Revenue" not in graph.recomputed and "VarOverhead" in graph.recomputed
+    assert frame.equals(result_module.portfolio_with_cumulative(PARAMS["years"], changed))
+    assert GRAPH_CACHE.nbytes == graph.nbytes and len(GRAPH_CACHE) == 1
+
+    ScenarioResult(PARAMS["years"], changed, PARAMS["benchmark_op_margin"], session="b").baseline
+    assert ("b", "baseline") in GRAPH_CACHE and len(GRAPH_CACHE) == 2
+    assert GRAPH_CACHE.maxbytes is not None
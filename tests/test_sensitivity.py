@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, portfolio_with_cumulative
+from projection.presets import PRESETS
+from projection.result import ScenarioResult
+from projection.sensitivity import SENSITIVITY_KEYS, rank_by_impact, tornado
+
+PARAMS = PRESETS["Balanced Growth"]
+INPUTS = {k: PARAMS[k] for k in INPUT_KEYS}
+
+
+def engine_metrics(years_, inputs):
+    frame = portfolio_with_cumulative(years_, [inputs[k] for k in INPUT_KEYS])
+    crossover = ScenarioResult(years_, [inputs[k] for k in INPUT_KEYS], PARAMS["benchmark_op_margin"]).crossover_year
+    return {
+        "FinalOperatingMargin": frame["OperatingMargin"].iloc[-1],
+        "CumulativeOperatingProfit": frame["CumulativeOperatingProfit"].iloc[-1],
+        "CrossoverYear": years_ + 1 if crossover is None else crossover,
+    }
+
+
+def test_each_bar_is_the_engine_with_one_input_moved():
+    result = tornado(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"], pct=20)
+
+    assert result["base"] == pytest.approx(engine_metrics(PARAMS["years"], INPUTS))
+    for j, key in enumerate(SENSITIVITY_KEYS):
+        for side in ("low", "high"):
+            value = result[f"{side}_value"][j]
+            if key == "years":
+                expected = engine_metrics(int(value), INPUTS)
+            else:
+                expected = engine_metrics(PARAMS["years"], dict(INPUTS, **{key: value}))
+            for metric, want in expected.items():
+                assert result[side][metric][j] == pytest.approx(want, rel=1e-12, nan_ok=True), (key, side, metric)
+
+
+def test_perturbed_values_are_scaled_and_rounded():
+    result = tornado(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"], pct=10)
+
+    j = SENSITIVITY_KEYS.index("tier1_gm")
+    assert result["low_value"][j] == pytest.approx(PARAMS["tier1_gm"] * 0.9)
+    assert result["high_value"][j] == pytest.approx(PARAMS["tier1_gm"] * 1.1)
+    j = SENSITIVITY_KEYS.index("tier1_projects0")
+    assert result["low_value"][j] == round(PARAMS["tier1_projects0"] * 0.9)
+
+
+def test_ranking_follows_absolute_swing():
+    result = {
+        "low": {"m": np.array([1.0, -5.0, 3.0, 0.0])},
+        "high": {"m": np.array([2.0, 5.0, -4.0, 0.0])},
+    }
+    assert rank_by_impact(result, "m").tolist() == [1, 2, 0, 3]
+
+    real = tornado(PARAMS["years"], INPUTS, PARAMS["benchmark_op_margin"])
+    order = rank_by_impact(real, "CumulativeOperatingProfit")
+    swing = np.abs(real["high"]["CumulativeOperatingProfit"] - real["low"]["CumulativeOperatingProfit"])
+    assert (np.diff(swing[order]) <= 0).all()
@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, portfolio_with_cumulative, project_portfolio_batch, required_scale_to_hit_benchmark
+from projection.presets import PRESETS
+
+# One year by hand: Tier 3 $20M at 25% GM with 20 projects at $40k, $7.5M
+# fixed overhead; Tier 1 10 x $0.55M at 14% ($20k OH), Tier 2 10 x $0.95M at
+# 20% ($25k OH). A = 20, B = 5 - 7.5 - 0.8 = -3.3, R = 15, GP = 2.67,
+# VOH = 0.45, so at a 10% benchmark k = (2 + 3.3) / (2.22 - 1.5) = 5.3 / 0.72.
+HAND_YEAR = {
+    "T3_Revenue": [20.0],
+    "T3_GrossProfit": [5.0],
+    "T3_Projects": [20],
+    "FixedOverhead": [7.5],
+    "T1_Projects": [10],
+    "T1_Revenue": [5.5],
+    "T1_GrossProfit": [0.77],
+    "T2_Projects": [10],
+    "T2_Revenue": [9.5],
+    "T2_GrossProfit": [1.9],
+}
+VOH = (40.0, 25.0, 20.0)
+
+
+def test_hand_computed_scale():
+    required = required_scale_to_hit_benchmark(HAND_YEAR, 10, *VOH)
+    k = 5.3 / 0.72
+
+    np.testing.assert_allclose(required["RequiredScaleK"], [k])
+    np.testing.assert_allclose(required["RequiredProductRevenueAtBenchmark"], [15 * k])
+    np.testing.assert_allclose(required["AdditionalProductRevenueNeeded"], [15 * k - 15])
+    np.testing.assert_allclose(required["RequiredT1Projects"], [10 * k])
+    np.testing.assert_allclose(required["RequiredT2Projects"], [10 * k])
+    # Scaling Tier 1+2 by k lands exactly on the benchmark.
+    margin = (-3.3 + k * (2.67 - 0.45)) / (20 + k * 15)
+    assert margin == pytest.approx(0.10)
+
+
+def test_benchmark_already_met_clips_to_zero():
+    # At 0% the Tier 3 side alone needs a negative scale.
+    required = required_scale_to_hit_benchmark(dict(HAND_YEAR, FixedOverhead=[0.0]), 0, *VOH)
+
+    assert required["RequiredScaleK"].tolist() == [0.0]
+    assert required["AdditionalProductRevenueNeeded"].tolist() == [0.0]
+
+
+def test_flat_denominator_gives_nan():
+    # (GP - VOH) - bm * R == 0: scaling Tier 1+2 never moves the margin.
+    required = required_scale_to_hit_benchmark(HAND_YEAR, 2.22 / 15 * 100, *VOH)
+
+    assert np.isnan(required["RequiredScaleK"]).all()
+    assert np.isnan(required["RequiredProductRevenueAtBenchmark"]).all()
+
+
+def reference_scale(row, bm_pct, voh_t3, voh_t2, voh_t1):
+    """The original per-row apply the closed form replaced."""
+    bm = bm_pct / 100.0
+    A = float(row["T3_Revenue"])
+    B = float(row["T3_GrossProfit"] - row["FixedOverhead"] - (row["T3_Projects"] * (voh_t3 / 1000.0)))
+    R = float(row["T1_Revenue"] + row["T2_Revenue"])
+    GP = float(row["T1_GrossProfit"] + row["T2_GrossProfit"])
+    VOH = float((row["T1_Projects"] * (voh_t1 / 1000.0)) + (row["T2_Projects"] * (voh_t2 / 1000.0)))
+    denom = (GP - VOH) - bm * R
+    numer = bm * A - B
+    if abs(denom) < 1e-9:
+        return np.nan
+    return max(0.0, numer / denom)
+
+
+@pytest.mark.parametrize("preset", list(PRESETS))
+@pytest.mark.parametrize("bm_pct", [5, 15, 25])
+def test_frame_matches_the_row_wise_apply(preset, bm_pct):
+    params = PRESETS[preset]
+    voh = (params["voh_t3"], params["voh_t2"], params["voh_t1"])
+    frame = portfolio_with_cumulative(params["years"], [params[k] for k in INPUT_KEYS])
+
+    expected = frame.apply(lambda r: reference_scale(r, bm_pct, *voh), axis=1).to_numpy()
+    required = required_scale_to_hit_benchmark(frame, bm_pct, *voh)
+
+    np.testing.assert_allclose(required["RequiredScaleK"], expected, equal_nan=True)
+
+
+def test_batch_takes_a_benchmark_per_scenario():
+    params = PRESETS["Balanced Growth"]
+    batch = project_portfolio_batch(params["years"], *(np.full(3, params[k]) for k in INPUT_KEYS))
+    bm = np.array([5.0, 15.0, 25.0])
+    required = required_scale_to_hit_benchmark(batch, bm, params["voh_t3"], params["voh_t2"], params["voh_t1"])
+
+    for i, b in enumerate(bm):
+        single = required_scale_to_hit_benchmark(
+            {col: v[i] for col, v in batch.items()}, b, params["voh_t3"], params["voh_t2"], params["voh_t1"]
+        )
+        np.testing.assert_allclose(required["RequiredScaleK"][i], single["RequiredScaleK"], equal_nan=True)
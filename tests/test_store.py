@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from projection import portfolio_with_cumulative
+from projection.engine import INPUT_KEYS
+from projection.presets import PRESETS
+from projection.store import ScenarioStore, param_hash
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ScenarioStore(str(tmp_path / "scenarios.db"))
+    yield store
+    store.close()
+
+
+def preset(name, **changes):
+    return {**PRESETS[name], **changes}
+
+
+def test_save_then_load_round_trips_params_and_series(store):
+    params = preset("Balanced Growth")
+    assert store.save({"Plan": params}) == 1
+
+    loaded = store.load(["Plan", "missing"])
+
+    assert list(loaded) == ["Plan"]
+    assert loaded["Plan"]["params"] == {k: float(v) for k, v in params.items()}
+    frame = portfolio_with_cumulative(params["years"], [params[k] for k in INPUT_KEYS])
+    np.testing.assert_allclose(loaded["Plan"]["series"]["OperatingMargin"], frame["OperatingMargin"].to_numpy())
+    np.testing.assert_allclose(
+        loaded["Plan"]["series"]["CumulativeOperatingProfit"], frame["CumulativeOperatingProfit"].to_numpy()
+    )
+
+
+def test_identical_params_are_evaluated_once(store):
+    params = preset("Balanced Growth")
+    assert store.save({"A": params}) == 1
+    assert store.save({"B": dict(params)}) == 0
+    assert sorted(store.names()) == ["A", "B"]
+
+
+def test_saving_a_name_again_replaces_its_params_and_results(store):
+    store.save({"Plan": preset("Balanced Growth")})
+    before = store.load(["Plan"])["Plan"]
+
+    changed = preset("Balanced Growth", tier1_growth=40, years=12)
+    assert store.save({"Plan": changed}) == 1
+    after = store.load(["Plan"])["Plan"]
+
+    assert store.names() == ["Plan"]
+    assert after["params"]["tier1_growth"] == 40
+    assert len(after["series"]["OperatingMargin"]) == 12
+    assert param_hash(after["params"]) == param_hash(changed) != param_hash(before["params"])
+
+
+def test_delete_drops_unreferenced_results(store):
+    store.save({"A": preset("Balanced Growth"), "B": preset("Tier 1 Blitz (Volume Risk)")})
+    store.delete(["A"])
+
+    assert store.names() == ["B"]
+    assert store.load(["A"]) == {}
+    assert store.save({"A": preset("Balanced Growth")}) == 1
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from projection.engine import INPUT_KEYS
+from projection.metrics import SUMMARY_METRICS
+from projection.presets import PRESETS
+from projection.sweep import axis_values, evaluate_cells, progressive_sweep
+
+INPUTS = {k: PRESETS["Balanced Growth"][k] for k in INPUT_KEYS}
+
+
+def test_whole_number_axes_have_no_repeated_values():
+    years = axis_values("years", 201)
+    assert years.tolist() == list(range(5, 16))
+
+    projects = axis_values("tier3_projects", 201)
+    assert np.unique(projects).size == projects.size == 200
+
+    assert axis_values("tier1_growth", 201).size == 201
+
+
+@pytest.mark.parametrize(
+    "x_key, y_key",
+    [("tier1_growth", "tier2_growth"), ("years", "tier3_projects"), ("tier1_projects0", "years")],
+)
+def test_progressive_passes_match_a_direct_evaluation(x_key, y_key):
+    passes = list(progressive_sweep(10, INPUTS, 15, x_key, y_key, coarse=6, passes=4))
+    last = passes[-1]
+
+    xx, yy = np.meshgrid(last["x"], last["y"])
+    direct = evaluate_cells(10, INPUTS, 15, x_key, xx.ravel(), y_key, yy.ravel())
+
+    assert [p["pass"] for p in passes] == [0, 1, 2, 3]
+    assert last["progress"] == 1.0
+    assert np.unique(last["x"]).size == last["x"].size
+    assert np.unique(last["y"]).size == last["y"].size
+    for m in SUMMARY_METRICS:
+        assert last["metrics"][m].shape == (last["y"].size, last["x"].size)
+        np.testing.assert_allclose(last["metrics"][m].ravel(), direct[m], equal_nan=True)
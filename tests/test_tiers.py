@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from projection import INPUT_KEYS, PORTFOLIO_COLUMNS, TierTable, project_portfolio_batch, project_tiers
+from projection.presets import PRESETS
+from projection.tiers import LEGACY_TIERS, tier_columns
+
+
+def test_three_page_tiers_match_the_engine():
+    rng = np.random.default_rng(1)
+    params = {k: np.full(8, float(PRESETS["Balanced Growth"][k])) for k in INPUT_KEYS}
+    params["tier1_growth"] = rng.uniform(0, 60, 8)
+    params["voh_t2"] = rng.uniform(0, 100, 8)
+
+    result = project_tiers(10, TierTable.from_inputs(params), params["fixed_overhead"])
+    columns = tier_columns(result, [prefix for _, prefix in LEGACY_TIERS])
+    expected = project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))
+
+    for col in PORTFOLIO_COLUMNS:
+        if col in columns:
+            np.testing.assert_allclose(columns[col], expected[col], rtol=1e-12, err_msg=col)
+
+
+def test_two_tier_totals_by_hand():
+    table = TierTable.from_records([
+        {"name": "Custom", "gm_pct": 25, "projects0": 20, "growth_pct": 0, "price_m": 0, "voh_k": 40,
+         "hold_constant": True, "revenue_m": 20.0},
+        {"name": "Kit", "gm_pct": 10, "projects0": 10, "growth_pct": 0, "price_m": 0.2, "voh_k": 5},
+    ])
+    result = project_tiers(3, table, fixed_oh_m=1.0)
+
+    assert result["tiers"]["Projects"].shape == (1, 2, 3)
+    np.testing.assert_allclose(result["TotalRevenue"], [[22.0, 22.0, 22.0]])
+    # 20 * 25% + 2 * 10% - 1 - (20 * 40k + 10 * 5k)
+    np.testing.assert_allclose(result["OperatingProfit"], [[5.2 - 1.0 - 0.85] * 3])
+    np.testing.assert_allclose(result["tiers"]["Share"][0, :, 0], [20 / 22 * 100, 2 / 22 * 100])
+
+
+@pytest.mark.parametrize("preset", list(PRESETS))
+def test_three_tiers_match_the_engine_on_every_preset(preset):
+    params = PRESETS[preset]
+    result = project_tiers(params["years"], TierTable.from_inputs(params), params["fixed_overhead"])
+    columns = tier_columns(result, [prefix for _, prefix in LEGACY_TIERS])
+    expected = project_portfolio_batch(params["years"], *(params[k] for k in INPUT_KEYS))
+
+    assert set(PORTFOLIO_COLUMNS) <= set(columns)
+    for col in PORTFOLIO_COLUMNS:
+        np.testing.assert_allclose(columns[col], expected[col], rtol=1e-12, atol=1e-12, err_msg=col)
+
+
+def test_a_fourth_tier_adds_to_the_totals():
+    params = PRESETS["Balanced Growth"]
+    page = TierTable.from_inputs(params)
+    kit = {"name": "Kit", "gm_pct": 10, "projects0": 10, "growth_pct": 5, "price_m": 0.2, "voh_k": 5}
+    records = [
+        {f: getattr(page, f)[0, i] for f in ("price_m", "gm_pct", "projects0", "growth_pct", "voh_k", "revenue_m")}
+        | {"name": name, "hold_constant": page.hold_constant[i]}
+        for i, name in enumerate(page.names)
+    ]
+    result = project_tiers(10, TierTable.from_records(records + [kit]), params["fixed_overhead"])
+    three = project_portfolio_batch(10, *(params[k] for k in INPUT_KEYS))
+
+    kit_projects = np.round(10 * 1.05 ** np.arange(10))
+    kit_revenue = kit_projects * 0.2
+    assert result["tiers"]["Projects"].shape == (1, 4, 10)
+    np.testing.assert_array_equal(result["tiers"]["Projects"][0, 3], kit_projects)
+    np.testing.assert_array_equal(result["TotalProjects"], three["TotalProjects"] + kit_projects)
+    np.testing.assert_allclose(result["TotalRevenue"], three["TotalRevenue"] + kit_revenue, rtol=1e-12)
+    np.testing.assert_allclose(result["GrossProfit"], three["GrossProfit"] + kit_revenue * 0.10, rtol=1e-12)
+    np.testing.assert_allclose(result["VarOverhead"], three["VarOverhead"] + kit_projects * 0.005, rtol=1e-12)
+    np.testing.assert_allclose(
+        result["OperatingProfit"],
+        three["OperatingProfit"] + kit_revenue * 0.10 - kit_projects * 0.005,
+        rtol=1e-12,
+    )
+    np.testing.assert_allclose(result["tiers"]["Share"].sum(axis=1), 100.0)
+
+
+def test_fields_need_one_value_per_tier():
+    with pytest.raises(ValueError, match="one value per tier"):
+        TierTable(
+            names=["A", "B"], price_m=[1.0], gm_pct=[10, 10], projects0=[1, 1], growth_pct=[0, 0],
+            voh_k=[0, 0], hold_constant=[False, False], revenue_m=[0, 0],
+        )